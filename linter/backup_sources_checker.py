@@ -0,0 +1,208 @@
+"""
+Verify a mirror of the backup sources against the checksums of every conandata.yml, without network access
+besides the mirror itself. The mirror is either a folder, such as the `core.sources:download_cache` of a
+Conan client (files are looked up in its `s` subfolder), or the base URL of a server that stores the files
+by their sha256, such as a local HTTP stand-in of the backup sources repository:
+
+    python3 linter/backup_sources_checker.py ~/.conan2/backup_sources_cache
+    python3 linter/backup_sources_checker.py http://localhost:8000/ --recipes recipes/zlib recipes/fmt
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+import yaml
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHUNK_SIZE = 1024 * 1024
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def find_conandata_files(paths):
+    """conandata.yml of the recipe folders below the given paths (i.e. recipes, recipes/zlib or recipes/zlib/all)"""
+    files = []
+    for path in paths:
+        if os.path.isfile(os.path.join(path, "conandata.yml")):
+            files.append(os.path.join(path, "conandata.yml"))
+            continue
+        for root, folders, filenames in os.walk(path):
+            if "conandata.yml" in filenames:
+                files.append(os.path.join(root, "conandata.yml"))
+                folders.clear()  # Folders below a recipe folder are test packages or patches
+            folders.sort()
+    return files
+
+
+def _iter_sources(node, key_path):
+    """Yield (key path, urls, sha256) for the entries with a sha256, at any depth (i.e. per os and arch)"""
+    if isinstance(node, dict):
+        if isinstance(node.get("sha256"), str):
+            url = node.get("url")
+            urls = [url] if isinstance(url, str) else [u for u in url or [] if isinstance(u, str)]
+            yield "/".join(key_path), urls, node["sha256"].strip().lower()
+            return
+        for key, value in node.items():
+            yield from _iter_sources(value, key_path + [str(key)])
+    elif isinstance(node, list):
+        for i, value in enumerate(node):
+            yield from _iter_sources(value, key_path + [str(i)])
+
+
+def read_sources(conandata_path):
+    """Source entries of a conandata.yml as (conandata path, key path, urls, sha256) tuples"""
+    with open(conandata_path, encoding="utf-8") as f:
+        try:
+            conandata = yaml.load(f, Loader=_Loader)
+        except yaml.YAMLError:
+            return []  # Reported by the conandata.yml linter
+    if not isinstance(conandata, dict):
+        return []
+    return [(conandata_path, key_path, urls, sha256)
+            for key_path, urls, sha256 in _iter_sources(conandata.get("sources"), [])]
+
+
+def source_location(mirror, sha256):
+    """Path or URL of the file the mirror stores for a checksum"""
+    if mirror.startswith(("http://", "https://", "file://")):
+        return mirror.rstrip("/") + "/" + sha256
+    backup_folder = os.path.join(mirror, "s")
+    return os.path.join(backup_folder if os.path.isdir(backup_folder) else mirror, sha256)
+
+
+def open_source(location):
+    """Binary stream of a mirror file, None if it does not exist"""
+    if "://" in location:
+        try:
+            return urllib.request.urlopen(location)
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                return None
+            raise
+        except urllib.error.URLError as error:
+            if isinstance(error.reason, FileNotFoundError):
+                return None
+            raise
+    try:
+        return open(location, "rb")
+    except FileNotFoundError:
+        return None
+
+
+def hash_source(mirror, sha256):
+    """sha256 of the content the mirror stores for an expected checksum, None if it is missing"""
+    stream = open_source(source_location(mirror, sha256))
+    if stream is None:
+        return None
+    digest = hashlib.sha256()
+    with stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_sources(mirror, checksums):
+    return [(sha256, hash_source(mirror, sha256)) for sha256 in checksums]
+
+
+def _chunks(items, jobs):
+    size = max(1, len(items) // (jobs * 4))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _run(function, tasks, jobs):
+    """Results of function(*task) for each task, in order, using a process pool for several tasks"""
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(function, *zip(*tasks)))
+    return [function(*task) for task in tasks]
+
+
+def check(mirror, conandata_files, jobs):
+    """Missing, mismatched and duplicate-content entries.
+
+    `missing` and `mismatched` map a checksum to its entries (and to the content checksum for mismatches),
+    `duplicates` maps a checksum to the entries of several recipe versions that share it.
+    """
+    entries = {}
+    for chunk in _run(_read_sources_chunk, [(c,) for c in _chunks(conandata_files, jobs)], jobs):
+        for entry in chunk:
+            entries.setdefault(entry[3], []).append(entry)
+
+    checksums = sorted(entries)
+    missing, mismatched = {}, {}
+    for chunk in _run(_hash_sources, [(mirror, c) for c in _chunks(checksums, jobs)], jobs):
+        for sha256, actual in chunk:
+            if actual is None:
+                missing[sha256] = entries[sha256]
+            elif actual != sha256:
+                mismatched[sha256] = (actual, entries[sha256])
+
+    duplicates = {sha256: found for sha256, found in entries.items()
+                  if len({(path, key_path.split("/")[0]) for path, key_path, _, _ in found}) > 1}
+    return {"entries": entries, "missing": missing, "mismatched": mismatched, "duplicates": duplicates}
+
+
+def _read_sources_chunk(conandata_files):
+    return [entry for path in conandata_files for entry in read_sources(path)]
+
+
+def _describe(entry):
+    path, key_path, urls, _ = entry
+    relative_path = os.path.relpath(path, ROOT)
+    return f"{path if relative_path.startswith('..') else relative_path}: {key_path} ({urls[0] if urls else 'no url'})"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify a backup sources mirror against the sha256 of every 'sources' entry of the conandata.yml files."
+    )
+    parser.add_argument(
+        "mirror",
+        help="download cache folder, folder with files named by their sha256, or base URL of a backup sources server.",
+    )
+    parser.add_argument(
+        "--recipes",
+        nargs="+",
+        default=[os.path.join(ROOT, "recipes")],
+        help="recipe folders to check, or folders containing them (default: all recipes).",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes.",
+    )
+    parser.add_argument(
+        "--no-duplicates",
+        action="store_true",
+        help="do not report checksums shared by several recipe versions.",
+    )
+    args = parser.parse_args()
+
+    result = check(args.mirror, find_conandata_files(args.recipes), args.jobs)
+    for sha256, found in sorted(result["missing"].items()):
+        for entry in found:
+            print(f"::error file={entry[0]},title=missing backup source::{sha256} not found, {_describe(entry)}")
+    for sha256, (actual, found) in sorted(result["mismatched"].items()):
+        for entry in found:
+            print(f"::error file={entry[0]},title=checksum mismatch::{sha256} has content {actual}, {_describe(entry)}")
+    if not args.no_duplicates:
+        for sha256, found in sorted(result["duplicates"].items()):
+            print(f"::warning title=duplicated source::{sha256} is used by {len(found)} entries:")
+            for entry in found:
+                print(f"    {_describe(entry)}")
+
+    count = sum(len(found) for found in result["entries"].values())
+    print(f"{count} entries, {len(result['entries'])} distinct checksums: {len(result['missing'])} missing,"
+          f" {len(result['mismatched'])} mismatched, {len(result['duplicates'])} duplicated")
+    sys.exit(1 if result["missing"] or result["mismatched"] else 0)
+
+
+if __name__ == "__main__":
+    main()
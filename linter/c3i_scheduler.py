@@ -0,0 +1,335 @@
+"""
+Offline model of the C3I build jobs of a batch of references, to predict and shorten their wall-clock time.
+
+References are expanded into one job per configuration and C++ standard of `.c3i/config_v2.yml`. Jobs depend on
+the jobs of their requirements in the batch for the same configuration. They are scheduled by critical path, the
+longest chain of estimated durations they start, on a pool of executors per node label and pod size, and a
+simulated timeline is printed:
+
+    python3 linter/c3i_scheduler.py zlib/1.3.1 openssl/3.3.2 --history durations.json --pool pool.yml
+    python3 linter/impact_analysis.py origin/master...HEAD | python3 linter/c3i_scheduler.py -
+
+`--history` is a JSON object with durations in minutes, by `name/version@configuration`, `name/version` or `name`.
+`--pool` is a YAML mapping of node labels (`*` for any label) to the number of executors of each pod size, i.e.
+`{"*": {"regular": 8, "xlarge": 1}}`. Jobs run on executors of their pod size or a bigger one.
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import yaml
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_POD_SIZE = "regular"
+DEFAULT_POOL = {"*": {DEFAULT_POD_SIZE: 4}}
+
+
+def load_yaml(path):
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _expand_settings(settings):
+    """Expand a mapping of setting: values, values can be mappings of value: nested settings"""
+    combinations = [{}]
+    for setting, values in settings.items():
+        expanded = []
+        for value in values:
+            if isinstance(value, dict):  # i.e. build_type: [{"Release": {compiler.runtime: [...]}}]
+                for name, nested in value.items():
+                    expanded.extend({setting: str(name), **n} for n in _expand_settings(nested or {}))
+            else:
+                expanded.append({setting: str(value)})
+        combinations = [{**c, **e} for c in combinations for e in expanded]
+    return combinations
+
+
+def expand_profiles(config):
+    """Settings of every configuration, with the C++ standards of the cppstd matrix.
+
+    Returns dicts with the configuration `id`, its `settings`, `cppstd` (None if the compiler has no matrix) and
+    a `variant` name, made of the configuration id and the settings that differ between its profiles.
+    """
+    profiles = []
+    for configuration in config.get("configurations", []):
+        for content in configuration.get("content", []):
+            for compiler_entry in content.get("compiler", []):
+                for compiler, compiler_settings in compiler_entry.items():
+                    base = {"os": content.get("os", []), "arch": content.get("arch", []),
+                            "compiler": [compiler], **(compiler_settings or {})}
+                    for settings in _expand_settings(base):
+                        matrix = (config.get("cppstd") or {}).get(compiler, {})
+                        standards = matrix.get(settings.get("compiler.version")) or [None]
+                        for cppstd in standards:
+                            profiles.append({"id": configuration["id"], "settings": settings, "cppstd": cppstd})
+
+    for configuration_id, group in itertools.groupby(profiles, key=lambda p: p["id"]):
+        group = list(group)
+        varying = [k for k in group[0]["settings"] if len({p["settings"].get(k) for p in group}) > 1]
+        for profile in group:
+            values = [f"{k}={profile['settings'][k]}" for k in varying]
+            values += [f"cppstd={profile['cppstd']}"] if profile["cppstd"] else []
+            profile["variant"] = "/".join([configuration_id] + values)
+    return profiles
+
+
+def node_label(config, settings):
+    labels = ((config.get("node_labels") or {}).get(settings.get("os"), {})
+              .get(settings.get("arch"), {}).get(settings.get("compiler"), {}))
+    label = labels.get("default", "default")
+    return re.sub(r"\$\{([^}]+)\}", lambda m: settings.get(m.group(1), m.group(0)), label)
+
+
+def pod_size(config, reference):
+    """Pod size of a reference, name/version entries take preference over name ones"""
+    name = reference.split("/")[0]
+    by_name = None
+    for size, references in (config.get("pod_size") or {}).items():
+        if reference in references:
+            return size
+        if name in references:
+            by_name = size
+    return by_name or DEFAULT_POD_SIZE
+
+
+def timeout_minutes(config, reference):
+    build = config.get("tasks", {}).get("build_single_reference", {})
+    large = reference.split("/")[0] in (build.get("large_timeout_references") or [])
+    return build.get("large_timeout_minutes" if large else "timeout_minutes", 600)
+
+
+def estimate_duration(history, reference, configuration_id, default):
+    for key in (f"{reference}@{configuration_id}", reference, reference.split("/")[0]):
+        if key in history:
+            return float(history[key])
+    return default
+
+
+def make_jobs(config, references, history, default_duration):
+    """Jobs of the batch, one per reference and profile"""
+    jobs = []
+    for reference, profile in itertools.product(references, expand_profiles(config)):
+        jobs.append({
+            "id": f"{reference}@{profile['variant']}",
+            "reference": reference,
+            "variant": profile["variant"],
+            "label": node_label(config, profile["settings"]),
+            "pod_size": pod_size(config, reference),
+            "duration": estimate_duration(history, reference, profile["id"], default_duration),
+            "timeout": timeout_minutes(config, reference),
+        })
+    return jobs
+
+
+def link_jobs(jobs, requirements):
+    """Set the `requires` of each job, the jobs of its requirements in the batch with the same variant"""
+    by_key = {(job["reference"], job["variant"]): job["id"] for job in jobs}
+    for job in jobs:
+        job["requires"] = sorted(by_key[(r, job["variant"])] for r in requirements.get(job["reference"], ())
+                                 if (r, job["variant"]) in by_key)
+    return jobs
+
+
+def critical_paths(jobs):
+    """Longest chain of durations each job starts, itself included"""
+    by_id = {job["id"]: job for job in jobs}
+    dependents = {job["id"]: [] for job in jobs}
+    for job in jobs:
+        for required in job["requires"]:
+            dependents[required].append(job["id"])
+    result = {}
+    # Reverse topological order, so the dependents of a job are done before it
+    pending = {job_id: len(ids) for job_id, ids in dependents.items()}
+    stack = [job_id for job_id, count in pending.items() if count == 0]
+    while stack:
+        job_id = stack.pop()
+        result[job_id] = by_id[job_id]["duration"] + max((result[d] for d in dependents[job_id]), default=0)
+        for required in by_id[job_id]["requires"]:
+            pending[required] -= 1
+            if pending[required] == 0:
+                stack.append(required)
+    if len(result) != len(jobs):
+        raise ValueError("the requirements of the jobs have a cycle")
+    return result
+
+
+def _executors(pool, label, sizes):
+    """Executor slots of a label, (size rank, slot name), falling back to the `*` entry of the pool"""
+    counts = pool.get(label, pool.get("*", {}))
+    return [(sizes.index(size), f"{label}/{size}#{i}")
+            for size, count in counts.items() if size in sizes for i in range(int(count))]
+
+
+def simulate(jobs, pool, pod_sizes, parallel_strategy="unlimited"):
+    """Timeline of the jobs, as dicts with the job id, executor, start and end, in minutes, and the jobs skipped.
+
+    Ready jobs are started by decreasing critical path on the smallest free executor of their label with a pod size
+    big enough. `parallel_strategy` is "unlimited" or the maximum number of jobs of a reference running at once.
+    A job longer than its timeout fails when it times out, and the jobs requiring it, directly or not, are skipped:
+    they are returned by id with the failed job that blocked them.
+    """
+    sizes = list(pod_sizes)
+    priority = critical_paths(jobs)
+    by_id = {job["id"]: job for job in jobs}
+    dependents = {job["id"]: [] for job in jobs}
+    waiting = {}
+    free = {}
+    for job in jobs:
+        waiting[job["id"]] = len(job["requires"])
+        for required in job["requires"]:
+            dependents[required].append(job["id"])
+        if job["label"] not in free:
+            free[job["label"]] = sorted(_executors(pool, job["label"], sizes))
+        rank = sizes.index(job["pod_size"]) if job["pod_size"] in sizes else len(sizes)
+        if not any(slot[0] >= rank for slot in free[job["label"]]):
+            raise ValueError(f"no executor for {job['id']} (label {job['label']}, pod size {job['pod_size']})")
+
+    max_per_reference = None if parallel_strategy == "unlimited" else int(parallel_strategy)
+    running_per_reference = {}
+    ready = [(-priority[j], j) for j, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    running = []
+    timeline = []
+    skipped = {}
+    now = 0.0
+    while ready or running:
+        deferred = []
+        while ready:
+            item = heapq.heappop(ready)
+            job = by_id[item[1]]
+            rank = sizes.index(job["pod_size"]) if job["pod_size"] in sizes else len(sizes)
+            slots = free[job["label"]]
+            slot = next((s for s in slots if s[0] >= rank), None)
+            if slot is None or (max_per_reference and running_per_reference.get(job["reference"], 0) >= max_per_reference):
+                deferred.append(item)
+                continue
+            slots.remove(slot)
+            running_per_reference[job["reference"]] = running_per_reference.get(job["reference"], 0) + 1
+            end = now + min(job["duration"], job["timeout"])
+            heapq.heappush(running, (end, job["id"], slot))
+            timeline.append({"job": job["id"], "executor": slot[1], "start": now, "end": end,
+                             "timeout": job["duration"] > job["timeout"]})
+        for item in deferred:
+            heapq.heappush(ready, item)
+        if not running:
+            break
+        now, job_id, slot = heapq.heappop(running)
+        finished = [(job_id, slot)]
+        while running and running[0][0] == now:
+            _, other_id, other_slot = heapq.heappop(running)
+            finished.append((other_id, other_slot))
+        for job_id, slot in finished:
+            job = by_id[job_id]
+            free[job["label"]].append(slot)
+            free[job["label"]].sort()
+            running_per_reference[job["reference"]] -= 1
+            if job["duration"] > job["timeout"]:
+                _skip_dependents(job_id, dependents, skipped)
+                continue
+            for dependent in dependents[job_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0 and dependent not in skipped:
+                    heapq.heappush(ready, (-priority[dependent], dependent))
+    return timeline, skipped
+
+
+def _skip_dependents(failed_id, dependents, skipped):
+    """Mark the jobs requiring a failed one, directly or not, as skipped because of it"""
+    stack = list(dependents[failed_id])
+    while stack:
+        job_id = stack.pop()
+        if job_id not in skipped:
+            skipped[job_id] = failed_id
+            stack.extend(dependents[job_id])
+
+
+def summary(jobs, timeline, skipped):
+    makespan = max((entry["end"] for entry in timeline), default=0)
+    work = sum(entry["end"] - entry["start"] for entry in timeline)
+    executors = {entry["executor"] for entry in timeline}
+    return {
+        "jobs": len(jobs),
+        "makespan": makespan,
+        "critical_path": max(critical_paths(jobs).values(), default=0),
+        "work": work,
+        "executors": len(executors),
+        "utilization": work / (makespan * len(executors)) if makespan and executors else 0,
+        "timeouts": sum(1 for entry in timeline if entry["timeout"]),
+        "skipped": len(skipped),
+    }
+
+
+def _batch_requirements(references):
+    """Requirements of each reference within the batch, from the requirement graph of impact_analysis.py"""
+    import impact_analysis
+    import recipe_index
+
+    connection = recipe_index.connect(recipe_index.default_db_path())
+    recipe_index.update(connection, os.path.join(ROOT, "recipes"), os.cpu_count())
+    graph = impact_analysis.load_graph(connection, os.path.splitext(recipe_index.default_db_path())[0] + "_graph.json")
+    folder_of = {f"{recipe}/{version}": folder for recipe, versions in graph["versions"].items()
+                 for version, folder in versions}
+    references_by_folder = {}
+    for reference in references:
+        references_by_folder.setdefault(folder_of.get(reference), []).append(reference)
+    return {reference: {r for dependency in graph["dependencies"].get(folder_of.get(reference), [])
+                        for r in references_by_folder.get(dependency, [])}
+            for reference in references}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expand, schedule and simulate the C3I jobs of a batch of references.")
+    parser.add_argument("references", nargs="+", help="references to build (name/version), '-' reads them from stdin.")
+    parser.add_argument("--config", default=os.path.join(ROOT, ".c3i", "config_v2.yml"), help="C3I configuration.")
+    parser.add_argument("--history", help="JSON file with the durations of previous builds, in minutes.")
+    parser.add_argument("--default-duration", type=float, default=30.0, help="minutes of jobs without history.")
+    parser.add_argument("--pool", help="YAML file with the number of executors per node label and pod size.")
+    parser.add_argument("--requirements", help="JSON file with the requirements of each reference, instead of "
+                                               "the ones of the recipe index.")
+    parser.add_argument("--json", action="store_true", help="print the jobs and the timeline as JSON.")
+    args = parser.parse_args()
+
+    references = [r for r in args.references if r != "-"]
+    if "-" in args.references:
+        references.extend(line.strip() for line in sys.stdin if line.strip())
+    config = load_yaml(args.config)
+    history = {}
+    if args.history:
+        with open(args.history, encoding="utf-8") as f:
+            history = json.load(f)
+    pool = DEFAULT_POOL
+    if args.pool:
+        pool = load_yaml(args.pool)
+    if args.requirements:
+        with open(args.requirements, encoding="utf-8") as f:
+            requirements = json.load(f)
+    else:
+        requirements = _batch_requirements(references)
+
+    jobs = link_jobs(make_jobs(config, references, history, args.default_duration), requirements)
+    pod_sizes = [DEFAULT_POD_SIZE] + [s for s in (config.get("pod_size") or {}) if s != DEFAULT_POD_SIZE]
+    parallel_strategy = config.get("tasks", {}).get("build_single_reference", {}).get("parallel_strategy", "unlimited")
+    timeline, skipped = simulate(jobs, pool, pod_sizes, parallel_strategy)
+
+    if args.json:
+        print(json.dumps({"jobs": jobs, "timeline": timeline, "skipped": skipped,
+                          "summary": summary(jobs, timeline, skipped)}, indent=2))
+        return
+    for entry in sorted(timeline, key=lambda e: (e["start"], e["executor"])):
+        flag = "  (timeout)" if entry["timeout"] else ""
+        print(f"{entry['start']:8.1f} {entry['end']:8.1f}  {entry['executor']:<45} {entry['job']}{flag}")
+    for job_id, failed_id in sorted(skipped.items()):
+        print(f"{'skipped':>17}  {'':<45} {job_id}  (blocked by {failed_id})")
+    result = summary(jobs, timeline, skipped)
+    print(f"{result['jobs']} jobs on {result['executors']} executors: {result['makespan']:.1f} minutes "
+          f"(critical path {result['critical_path']:.1f}, utilization {result['utilization']:.0%}, "
+          f"{result['timeouts']} timeouts, {result['skipped']} skipped)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
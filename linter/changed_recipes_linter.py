@@ -0,0 +1,135 @@
+"""
+Run the linters only over the recipes touched by a git revision range, i.e. as a pre-push hook:
+
+    python3 linter/changed_recipes_linter.py origin/master...HEAD
+"""
+
+import argparse
+import functools
+import os
+import shutil
+import subprocess
+import sys
+import time
+import yaml
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_PACKAGE_FOLDERS = ("test_package", "test_v1_package")
+
+
+def changed_files(revision_range):
+    output = subprocess.check_output(["git", "diff", "--name-only", revision_range, "--", "recipes"],
+                                     cwd=ROOT, text=True)
+    return [line for line in output.splitlines() if line]
+
+
+@functools.lru_cache(maxsize=None)
+def recipe_folders(recipe):
+    """Folders listed in the config.yml of a recipe"""
+    config_path = os.path.join(ROOT, recipe, "config.yml")
+    if not os.path.isfile(config_path):
+        return frozenset()
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    return frozenset(f"{recipe}/{v['folder']}" for v in (config.get("versions") or {}).values()
+                     if isinstance(v, dict) and "folder" in v)
+
+
+def affected(paths):
+    """Map changed paths to the files each linter has to check, only folders used by config.yml are considered"""
+    result = {"recipes": set(), "conanfiles": set(), "test_conanfiles": set(), "yaml": set()}
+    for path in paths:
+        parts = path.split("/")
+        if len(parts) < 3:
+            continue
+        recipe = "/".join(parts[:2])
+        result["recipes"].add(recipe)
+        if path.endswith(".yml"):
+            result["yaml"].add(path)
+        folder = "/".join(parts[:3])
+        if len(parts) < 4 or not path.endswith(".py") or folder not in recipe_folders(recipe):
+            continue
+        if len(parts) > 4 and parts[3] in TEST_PACKAGE_FOLDERS:
+            result["test_conanfiles"].add(f"{folder}/{parts[3]}/conanfile.py")
+        else:
+            # Recipe changes can break the way its test packages consume it
+            result["conanfiles"].add(f"{folder}/conanfile.py")
+            result["test_conanfiles"].update(f"{folder}/{t}/conanfile.py" for t in TEST_PACKAGE_FOLDERS)
+
+    for key in ("conanfiles", "test_conanfiles", "yaml"):
+        result[key] = {p for p in result[key] if os.path.isfile(os.path.join(ROOT, p))}
+    result["recipes"] = {r for r in result["recipes"] if os.path.isfile(os.path.join(ROOT, r, "config.yml"))}
+    return result
+
+
+def linter_commands(targets):
+    """Name, command and number of inputs of the linters that have something to check"""
+    python = sys.executable
+    commands = []
+    if targets["conanfiles"]:
+        commands.append(("pylint (recipes)",
+                         [python, "-m", "pylint", "--rcfile=linter/pylintrc_recipe"] + sorted(targets["conanfiles"]),
+                         len(targets["conanfiles"])))
+    if targets["test_conanfiles"]:
+        commands.append(("pylint (test packages)",
+                         [python, "-m", "pylint", "--rcfile=linter/pylintrc_testpackage"] + sorted(targets["test_conanfiles"]),
+                         len(targets["test_conanfiles"])))
+    if targets["yaml"]:
+        commands.append(("yamllint",
+                         ["yamllint", "--config-file", "linter/yamllint_rules.yml", "-f", "standard"] + sorted(targets["yaml"]),
+                         len(targets["yaml"])))
+    if targets["recipes"]:
+        commands.append(("yaml schema (config.yml, conandata.yml, patches)",
+                         [python, "linter/recipe_yaml_linter.py"] + sorted(targets["recipes"]),
+                         len(targets["recipes"])))
+    return commands
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lint the ConanCenterIndex recipes affected by the changes in a git revision range."
+    )
+    parser.add_argument(
+        "revision_range",
+        nargs="?",
+        default="origin/master...HEAD",
+        help="git revision range to compare (default: origin/master...HEAD).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only print the linters that would run and their inputs.",
+    )
+    args = parser.parse_args()
+
+    targets = affected(changed_files(args.revision_range))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.getenv("PYTHONPATH")])))
+    report = []
+    failed = False
+    for name, command, count in linter_commands(targets):
+        if args.dry_run:
+            print(" ".join(command))
+            continue
+        if shutil.which(command[0]) is None:
+            report.append((name, count, None, "not installed"))
+            continue
+        start = time.perf_counter()
+        returncode = subprocess.call(command, cwd=ROOT, env=env)
+        elapsed = time.perf_counter() - start
+        failed = failed or returncode != 0
+        report.append((name, count, elapsed, "ok" if returncode == 0 else f"exit code {returncode}"))
+
+    if report:
+        print("\nLinter timing summary:")
+        for name, count, elapsed, status in report:
+            duration = "-" if elapsed is None else f"{elapsed:.2f}s"
+            print(f"  {name:<50} {count:>5} input(s) {duration:>9}  {status}")
+        print(f"  {'total':<50} {'':>16} {sum(r[2] or 0 for r in report):>8.2f}s")
+    elif not args.dry_run:
+        print("No recipe changes to lint.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
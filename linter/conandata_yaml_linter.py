@@ -1,4 +1,8 @@
 import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from strictyaml import (
     dirty_load,
     MapCombined,
@@ -10,11 +14,13 @@ from strictyaml import (
     Enum,
     Any,
 )
-from yaml_linting import file_path
+from yaml_linting import file_or_dir_path, collect_files
 
 
 CONANDATA_YAML_URL = "https://github.com/conan-io/conan-center-index/blob/master/docs/adding_packages/conandata_yml_format.md"
 
+_schemas = None
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -22,53 +28,130 @@ def main():
     )
     parser.add_argument(
         "path",
-        nargs="?",
-        type=file_path,
-        help="file to validate.",
+        nargs="+",
+        type=file_or_dir_path,
+        help="files to validate, directories are searched for 'conandata.yml' files.",
     )
-    args = parser.parse_args()
-
-    patch_fields = MapCombined(
-        {
-            "patch_file": Str(),
-            Optional("patch_description"): Str(),
-            Optional("patch_type"): Enum(
-                ["official", "conan", "portability", "bugfix", "vulnerability"]
-            ),
-            Optional("patch_source"): Str(),
-            # No longer required for v2 recipes with layouts
-            Optional("base_path"): Str(),
-        },
-        Str(),
-        Any()
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes used when validating several files.",
     )
-    schema = MapCombined(
-        {
-            "sources": MapPattern(Str(), Any(), minimum_keys=1),
-            Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
-        },
-        Str(),
-        Any(),
+    parser.add_argument(
+        "--cache",
+        help="JSON file where results are stored by content hash, unchanged files are not validated again.",
     )
+    args = parser.parse_args()
+
+    paths = collect_files(args.path, "conandata.yml")
+    cache = _load_cache(args.cache)
+    results = {}
+    pending = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        cached = cache["files"].get(path)
+        if cached and cached["sha256"] == digest:
+            results[path] = cached["messages"]
+        else:
+            pending.append((path, content, digest))
+
+    if len(pending) > 1 and args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            chunksize = max(1, len(pending) // (args.jobs * 4))
+            linted = executor.map(lint, [p[0] for p in pending], [p[1] for p in pending], chunksize=chunksize)
+            for (path, _, digest), messages in zip(pending, linted):
+                results[path] = messages
+                cache["files"][path] = {"sha256": digest, "messages": messages}
+    else:
+        for path, content, digest in pending:
+            results[path] = lint(path, content)
+            cache["files"][path] = {"sha256": digest, "messages": results[path]}
+
+    for path in paths:
+        for message in results[path]:
+            print(message)
+
+    if args.cache:
+        with open(args.cache, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+
+
+def _linter_hash():
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
 
-    with open(args.path, encoding="utf-8") as f:
-        content = f.read()
+
+def _load_cache(cache_path):
+    """Load the results cache, it is discarded if it was written by a different version of this linter"""
+    linter = _linter_hash()
+    if cache_path and os.path.isfile(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("linter") == linter:
+                return cache
+        except ValueError:
+            pass
+    return {"linter": linter, "files": {}}
+
+
+def _get_schemas():
+    """Build the schemas only once per process, they are reused for every file"""
+    global _schemas
+    if _schemas is None:
+        patch_fields = MapCombined(
+            {
+                "patch_file": Str(),
+                Optional("patch_description"): Str(),
+                Optional("patch_type"): Enum(
+                    ["official", "conan", "portability", "bugfix", "vulnerability"]
+                ),
+                Optional("patch_source"): Str(),
+                # No longer required for v2 recipes with layouts
+                Optional("base_path"): Str(),
+            },
+            Str(),
+            Any()
+        )
+        schema = MapCombined(
+            {
+                "sources": MapPattern(Str(), Any(), minimum_keys=1),
+                Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
+            },
+            Str(),
+            Any(),
+        )
+        _schemas = schema, patch_fields
+    return _schemas
+
+
+def lint(path, content):
+    """Validate the content of a conandata.yml and return the list of GitHub annotations"""
+    _, messages = validate(path, content)
+    return messages
+
+
+def validate(path, content):
+    """Validate the content of a conandata.yml, return the parsed document (None on error) and the GitHub annotations"""
+    schema, patch_fields = _get_schemas()
+    messages = []
 
     try:
         parsed = dirty_load(content, schema, allow_flow_style=True)
     except YAMLValidationError as error:
-        pretty_print_yaml_validate_error(args, error) # Error when "source" is missing or when "patches" has no versions
-        return
-    except BaseException as error:
-        pretty_print_yaml_validate_error(args, error) # YAML could not be parsed
-        return
+        return None, [yaml_validate_error(path, error)] # Error when "source" is missing or when "patches" has no versions
+    except Exception as error:
+        return None, [yaml_parse_error(path, error)] # YAML could not be parsed
 
     if "patches" in parsed:
         for version in parsed["patches"]:
             patches = parsed["patches"][version]
             if version not in parsed["sources"]:
-                print(
-                    f"::warning file={args.path},line={patches.start_line},endline={patches.end_line},"
+                messages.append(
+                    f"::warning file={path},line={patches.start_line},endline={patches.end_line},"
                     f"title=conandata.yml inconsistency"
                     f"::Patch(es) are listed for version `{version}`, but there is source for this version."
                     f" You should either remove `{version}` from the `patches` section, or add it to the"
@@ -79,23 +162,35 @@ def main():
                 try:
                     parsed["patches"][version][i].revalidate(patch_fields)
                 except YAMLValidationError as error:
-                    pretty_print_yaml_validate_warning(args, error) # Warning when patch fields are not followed
+                    messages.append(yaml_validate_warning(path, error)) # Warning when patch fields are not followed
                     continue
+    return parsed, messages
 
 
-
-def pretty_print_yaml_validate_error(args, error):
+def yaml_validate_error(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema error"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
-    
-def pretty_print_yaml_validate_warning(args, error):
+
+def yaml_parse_error(path, error):
+    """Annotation for a file that could not be parsed, the error may not carry any position"""
+    problem_mark = getattr(error, "problem_mark", None)
+    line = problem_mark.line + 1 if problem_mark else 1
+    problem = getattr(error, "problem", None) or str(error) or type(error).__name__
+    return (
+        f"::error file={path},line={line},endline={line},"
+        f"title=conandata.yml parse error"
+        f"::{problem.replace(chr(10), '%0A')}"
+    )
+
+
+def yaml_validate_warning(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::warning file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::warning file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema warning"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
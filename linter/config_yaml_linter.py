@@ -1,5 +1,5 @@
 import argparse
-from strictyaml import load, Map, Str, YAMLValidationError, MapPattern
+from strictyaml import load, Map, Str, YAMLError, YAMLValidationError, MapPattern
 from yaml_linting import file_path
 
 
@@ -15,22 +15,38 @@ def main():
     )
     args = parser.parse_args()
 
+    with open(args.path) as f:
+        content = f.read()
+
+    _, messages = lint(args.path, content)
+    for message in messages:
+        print(message)
+
+
+def lint(path, content):
+    """Validate the content of a config.yml, return the parsed document (None on error) and the GitHub annotations"""
     schema = Map(
         {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
     )
 
-    with open(args.path) as f:
-        content = f.read()
-
     try:
-        load(content, schema)
+        return load(content, schema), []
     except YAMLValidationError as error:
         e = error.__str__().replace("\n", "%0A")
-        print(
-            f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line},"
+        return None, [
+            f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line},"
             f"title=config.yml schema error"
             f"::{e}\n"
-        )
+        ]
+    except YAMLError as error:  # Not parsable, i.e. a syntax error or a flow style mapping
+        problem_mark = getattr(error, "problem_mark", None)
+        line = problem_mark.line + 1 if problem_mark else 1
+        e = (getattr(error, "problem", None) or str(error)).replace("\n", "%0A")
+        return None, [
+            f"::error file={path},line={line},endline={line},"
+            f"title=config.yml parse error"
+            f"::{e}\n"
+        ]
 
 
 if __name__ == "__main__":
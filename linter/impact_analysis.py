@@ -0,0 +1,192 @@
+"""
+Recipe folders and versions affected by a change, in build order. The requirement graph of the whole index is built
+from the recipe index (see recipe_index.py): each requirement is resolved to the recipe folder serving the version
+Conan would pick, the latest one in config.yml matching its version or version range. The graph is cached next to
+the index, so answering for a diff only takes a traversal:
+
+    python3 linter/impact_analysis.py origin/master...HEAD
+    python3 linter/impact_analysis.py --paths recipes/zlib/all/conanfile.py --folders
+
+Requirements that can not be resolved statically (i.e. f-strings) depend on every folder of the required recipe, and
+every version of a folder is considered affected, as requirements may depend on the version.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import changed_recipes_linter
+import recipe_index
+
+
+_GRAPH_FORMAT = 1
+
+
+def _split_reference(reference):
+    """(name, version or range expression) of a requirement, the version is None if it is not a literal"""
+    name, _, version = reference.split("@")[0].split("#")[0].partition("/")
+    return name, version or None
+
+
+def _resolve(version_spec, versions):
+    """Folder of the latest version matching a version or version range, None if there is no match"""
+    from conans.model.version import Version
+    from conans.model.version_range import VersionRange
+
+    if version_spec is None:
+        return None
+    if version_spec.startswith("[") and version_spec.endswith("]"):
+        try:
+            version_range = VersionRange(version_spec[1:-1])
+        except Exception:  # Conan raises ConanException for invalid expressions
+            return None
+        matching = [(Version(v), folder) for v, folder in versions.items()
+                    if version_range.contains(Version(v), None)]
+        return max(matching)[1] if matching else None
+    return versions.get(version_spec)
+
+
+def build_graph(connection):
+    """Dependencies of every recipe folder, as recipe folders"""
+    from conans.model.version import Version
+
+    versions = {}
+    for recipe, version, folder in connection.execute("SELECT recipe, version, folder FROM versions"):
+        versions.setdefault(recipe, {})[version] = f"{recipe}/{folder}"
+    folders = [row[0] for row in connection.execute("SELECT folder FROM recipes ORDER BY folder")]
+    folders_by_recipe = {}
+    for folder in folders:
+        folders_by_recipe.setdefault(folder.split("/")[0], []).append(folder)
+
+    dependencies = {folder: set() for folder in folders}
+    for folder, reference, name in connection.execute("SELECT folder, reference, name FROM requires"):
+        if not name or name not in folders_by_recipe:
+            continue  # Not in this index
+        spec = _split_reference(reference)[1] if reference.startswith(f"{name}/") and "{" not in reference else None
+        resolved = _resolve(spec, versions.get(name, {}))
+        targets = [resolved] if resolved else folders_by_recipe[name]
+        dependencies[folder].update(t for t in targets if t != folder)
+    return {"dependencies": {folder: sorted(deps) for folder, deps in dependencies.items()},
+            "versions": {recipe: sorted(([v, f] for v, f in recipe_versions.items()), key=lambda item: Version(item[0]))
+                         for recipe, recipe_versions in versions.items()}}
+
+
+def _index_digest(connection):
+    digest = hashlib.sha256()
+    for key, sha256 in connection.execute("SELECT key, sha256 FROM files ORDER BY key"):
+        digest.update(f"{key}\0{sha256}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_graph(connection, cache_path):
+    """Requirement graph, rebuilt only if the index changed since it was cached"""
+    digest = _index_digest(connection)
+    if os.path.isfile(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("format") == _GRAPH_FORMAT and cached.get("index") == digest:
+                return cached["graph"]
+        except ValueError:
+            pass
+    graph = build_graph(connection)
+    tmp_path = f"{cache_path}.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format": _GRAPH_FORMAT, "index": digest, "graph": graph}, f)
+    os.replace(tmp_path, cache_path)
+    return graph
+
+
+def changed_folders(graph, paths):
+    """Recipe folders changed by the given paths, a config.yml changes every folder of its recipe"""
+    folders = set()
+    for path in paths:
+        parts = path.replace("\\", "/").split("/")
+        if len(parts) < 3 or parts[0] != "recipes":
+            continue
+        if len(parts) == 3:  # i.e. recipes/zlib/config.yml
+            folders.update(f for f in graph["dependencies"] if f.split("/")[0] == parts[1])
+        elif f"{parts[1]}/{parts[2]}" in graph["dependencies"]:
+            folders.add(f"{parts[1]}/{parts[2]}")
+    return folders
+
+
+def _dependents(graph):
+    dependents = {folder: [] for folder in graph["dependencies"]}
+    for folder, dependencies in graph["dependencies"].items():
+        for dependency in dependencies:
+            dependents[dependency].append(folder)
+    return dependents
+
+
+def affected(graph, changed, dependents=None):
+    """Changed folders and the folders transitively depending on them"""
+    dependents = dependents or _dependents(graph)
+    result = set(changed)
+    pending = list(changed)
+    while pending:
+        for dependent in dependents.get(pending.pop(), []):
+            if dependent not in result:
+                result.add(dependent)
+                pending.append(dependent)
+    return result
+
+
+def build_order(graph, folders):
+    """Folders sorted so dependencies come first, and among the ready ones, the most depended upon first"""
+    dependents = _dependents(graph)
+    weight = {folder: len(affected(graph, [folder], dependents)) for folder in folders}
+    remaining = {folder: {d for d in graph["dependencies"][folder] if d in folders} for folder in folders}
+    order = []
+    ready = sorted((f for f, deps in remaining.items() if not deps), key=lambda f: (-weight[f], f))
+    while ready:
+        folder = ready.pop(0)
+        order.append(folder)
+        for dependent in dependents[folder]:
+            if dependent in remaining and folder in remaining[dependent]:
+                remaining[dependent].discard(folder)
+                if not remaining[dependent]:
+                    ready.append(dependent)
+        ready.sort(key=lambda f: (-weight[f], f))
+    # Cycles, i.e. tool requirements of a recipe on an older version of itself through another recipe
+    order.extend(sorted(set(folders) - set(order)))
+    return order
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the recipe folders and versions affected by a change, dependencies first."
+    )
+    parser.add_argument(
+        "revision_range",
+        nargs="?",
+        default="origin/master...HEAD",
+        help="git revision range to compare (default: origin/master...HEAD).",
+    )
+    parser.add_argument("--paths", nargs="+", help="changed paths, instead of a git revision range.")
+    parser.add_argument("--folders", action="store_true", help="print recipe folders instead of references.")
+    parser.add_argument("--db", default=recipe_index.default_db_path(),
+                        help="recipe index database (default: in the linter cache folder).")
+    parser.add_argument("--no-update", action="store_true", help="use the recipe index without updating it first.")
+    args = parser.parse_args()
+
+    connection = recipe_index.connect(args.db)
+    if not args.no_update:
+        recipe_index.update(connection, os.path.join(recipe_index.ROOT, "recipes"), os.cpu_count())
+    graph = load_graph(connection, os.path.splitext(args.db)[0] + "_graph.json")
+
+    paths = args.paths if args.paths else changed_recipes_linter.changed_files(args.revision_range)
+    order = build_order(graph, affected(graph, changed_folders(graph, paths)))
+    for folder in order:
+        if args.folders:
+            print(folder)
+            continue
+        recipe = folder.split("/")[0]
+        for version, version_folder in graph["versions"].get(recipe, []):
+            if version_folder == folder:
+                print(f"{recipe}/{version}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
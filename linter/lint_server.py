@@ -0,0 +1,169 @@
+"""
+Persistent pylint process for linting many recipes. The server keeps astroid's manager, with Conan
+modules and the ConanFile transform already built, alive between requests so each conanfile only
+pays for its own analysis. Clients send the files to lint, and which of the linter rcfiles to use,
+over a unix socket only the user running the server can connect to, and get back the same output
+and exit code a regular pylint invocation would produce.
+
+    python linter/lint_server.py serve &
+    python linter/lint_server.py lint recipes/fmt/all/conanfile.py
+    python linter/lint_server.py lint --rcfile testpackage recipes/fmt/all/test_package/conanfile.py
+"""
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import sysconfig
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RCFILES = {
+    "recipe": os.path.join(ROOT, "linter", "pylintrc_recipe"),
+    "testpackage": os.path.join(ROOT, "linter", "pylintrc_testpackage"),
+}
+
+
+def default_socket_path():
+    """Next to the ConanFile stubs cached by the transform_conanfile plugin"""
+    if os.getenv("CCI_LINTER_CACHE"):
+        folder = os.getenv("CCI_LINTER_CACHE")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        folder = os.path.join(base, "conan-center-index-linter")
+    return os.path.join(folder, "lint_server.sock")
+
+
+class _LintHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        request = json.loads(self.rfile.readline().decode("utf-8"))
+        output, exit_code = self.server.lint(request.get("rcfile"), request.get("files"))
+        self.wfile.write(json.dumps({"output": output, "exit_code": exit_code}).encode("utf-8") + b"\n")
+
+
+class LintServer(socketserver.UnixStreamServer):
+
+    def __init__(self, path, plugins):
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            if _is_listening(path):
+                raise RuntimeError(f"A lint server is already listening on {path}")
+            os.remove(path)
+        previous_umask = os.umask(0o177)  # The socket is created with 0600 permissions
+        try:
+            super().__init__(path, _LintHandler)
+        finally:
+            os.umask(previous_umask)
+        self._library_paths = {os.path.normcase(os.path.abspath(p)) for p in sysconfig.get_paths().values()}
+        try:
+            self._warm_up(plugins)
+        except BaseException:
+            self.server_close()
+            raise
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    @staticmethod
+    def _warm_up(plugins):
+        """Build the Conan modules once, running the ConanFile transform of the plugins"""
+        import importlib
+        import astroid
+
+        for plugin in plugins:
+            importlib.import_module(plugin)
+        astroid.MANAGER.ast_from_module_name("conans.model.conan_file").lookup("ConanFile")
+        astroid.MANAGER.ast_from_module_name("conan")
+
+    def _is_library(self, module):
+        if not module.file:
+            return True
+        path = os.path.normcase(os.path.abspath(module.file))
+        return any(path.startswith(library_path + os.sep) for library_path in self._library_paths)
+
+    @staticmethod
+    def _check_request(rcfile, files):
+        """Only the linter rcfiles and existing Python files are accepted, never other pylint arguments"""
+        if rcfile not in RCFILES:
+            return f"Unknown rcfile {rcfile!r}, expected one of: {', '.join(RCFILES)}\n"
+        if not isinstance(files, list) or not files:
+            return "No files to lint\n"
+        for path in files:
+            if not isinstance(path, str) or not os.path.isabs(path) or not path.endswith(".py") \
+                    or not os.path.isfile(path):
+                return f"Not an absolute path to a Python file: {path!r}\n"
+        return None
+
+    def lint(self, rcfile, files):
+        import astroid
+        from pylint.lint import Run
+        from pylint.reporters.text import TextReporter
+
+        error = self._check_request(rcfile, files)
+        if error:
+            return error, 32
+
+        output = io.StringIO()
+        try:
+            run = Run([f"--rcfile={RCFILES[rcfile]}"] + files, reporter=TextReporter(output), exit=False)
+            exit_code = run.linter.msg_status
+        except SystemExit as error:
+            exit_code = error.code if isinstance(error.code, int) else 32
+        finally:
+            # Drop the recipes and their local modules, so edited files are parsed again next time
+            for name, module in list(astroid.MANAGER.astroid_cache.items()):
+                if not self._is_library(module):
+                    del astroid.MANAGER.astroid_cache[name]
+        return output.getvalue(), exit_code
+
+
+def _is_listening(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def lint(path, rcfile, files):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        request = json.dumps({"rcfile": rcfile, "files": [os.path.abspath(f) for f in files]}) + "\n"
+        connection.sendall(request.encode("utf-8"))
+        response = json.loads(connection.makefile("rb").readline().decode("utf-8"))
+    sys.stdout.write(response["output"])
+    return response["exit_code"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep pylint warmed up to lint many ConanCenterIndex recipes.")
+    parser.add_argument("--socket", default=default_socket_path(),
+                        help="unix socket the server listens on (default: %(default)s).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="start the lint server.")
+    serve_parser.add_argument("--plugins", nargs="*",
+                              default=["linter.transform_conanfile", "linter.transform_imports"],
+                              help="pylint plugins imported before the first request.")
+    lint_parser = subparsers.add_parser("lint", help="lint files using a running server.")
+    lint_parser.add_argument("--rcfile", choices=sorted(RCFILES), default="recipe",
+                             help="linter rcfile used, pylintrc_recipe or pylintrc_testpackage (default: %(default)s).")
+    lint_parser.add_argument("files", nargs="+", help="Python files to lint.")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        with LintServer(args.socket, args.plugins) as server:
+            print(f"Lint server listening on {args.socket}")
+            server.serve_forever()
+    else:
+        sys.exit(lint(args.socket, args.rcfile, args.files))
+
+
+if __name__ == "__main__":
+    main()
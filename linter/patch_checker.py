@@ -0,0 +1,387 @@
+"""
+Check that the patches listed in the conandata.yml files still apply to their sources, without building anything.
+The source archive of each version is read once from a backup sources mirror (see backup_sources_checker.py), and
+its patches are applied in memory, in order, the way `apply_conandata_patches` does with patch_ng:
+
+    python3 linter/patch_checker.py ~/.conan2/backup_sources_cache --recipes recipes/zlib --cache .patch_check_cache.json
+
+patch_ng only applies hunks at the line numbers of the patch, so hunks found at an offset or only matching with fuzz
+are reported as errors, as `conan create` would fail with them. Fuzz is accepted for entries with `fuzz: true`.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import patch_ng
+import yaml
+import backup_sources_checker
+
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Patch status: it makes `conan create` fail
+_STATUS_ERRORS = {
+    "applied": False,
+    "already applied": False,
+    "fuzz": True,
+    "offset": True,
+    "failed": True,
+}
+# Worst status first
+_STATUS_ORDER = ["failed", "offset", "fuzz", "already applied", "applied"]
+
+
+def _strip_components(path, strip):
+    tokens = path.split("/")
+    return "/".join(tokens[strip:]) if strip and len(tokens) > 1 else path
+
+
+def _join(base_path, path):
+    return f"{base_path.strip('/')}/{path}" if base_path else path
+
+
+def _item_paths(item, base_path, strip):
+    """Source and target paths of a patched file, relative to the source folder"""
+    source = item.source.decode("utf-8").replace("\\", "/")
+    target = item.target.decode("utf-8").replace("\\", "/")
+    if source.startswith("a/") and target.startswith("b/"):
+        source, target = source[2:], target[2:]
+    if "dev/null" not in source:
+        source = _join(base_path, _strip_components(source, strip))
+    if "dev/null" not in target:
+        target = _join(base_path, _strip_components(target, strip))
+    return source, target
+
+
+def wanted_files(patches):
+    """Paths of the source folder the patches of a version read"""
+    wanted = set()
+    for patch in patches:
+        patchset = patch_ng.fromstring(patch["content"])
+        for item in patchset.items if patchset else []:
+            for path in _item_paths(item, patch["base_path"], patch["strip"]):
+                if "dev/null" not in path:
+                    wanted.add(path)
+    return wanted
+
+
+def read_archive_files(archive_path, wanted):
+    """Lines of the wanted files of an archive, in a single pass.
+
+    Paths are relative to the single root folder of the archive, as `get(..., strip_root=True)` extracts them,
+    falling back to the paths in the archive.
+    """
+    full, stripped, roots = {}, {}, set()
+
+    def add(name, read):
+        name = name[2:] if name.startswith("./") else name
+        root, _, rest = name.partition("/")
+        roots.add(root)
+        if name in wanted:
+            full[name] = read()
+        if rest in wanted:
+            stripped[rest] = full.get(name) or read()
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    add(info.filename, lambda info=info: archive.read(info))
+    else:
+        with tarfile.open(archive_path, "r|*") as archive:
+            for member in archive:
+                if member.isfile():
+                    add(member.name, lambda member=member: archive.extractfile(member).read())
+
+    found = {**stripped, **full} if len(roots) > 1 else {**full, **stripped}
+    return {path: content.splitlines(keepends=True) for path, content in found.items()}
+
+
+class _File:
+    """Lines of a file being patched, with an index of their positions to search hunks at an offset"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.keys = [line.rstrip(b"\r\n") for line in lines]
+        self._positions = None
+
+    def positions(self, key):
+        if self._positions is None:
+            self._positions = {}
+            for i, line in enumerate(self.keys):
+                self._positions.setdefault(line, []).append(i)
+        return self._positions.get(key, [])
+
+    def matches(self, lines, index):
+        return 0 <= index and self.keys[index:index + len(lines)] == lines
+
+
+def _locate_hunk(file, hunk, min_index):
+    """(status, index, detail) of a hunk, index is None if it does not apply"""
+    find = [line[1:].rstrip(b"\r\n") for line in hunk.text if line[:1] in b" -"]
+    start = max(hunk.startsrc - 1, 0)
+    if not find or file.matches(find, start):
+        return "applied", start, None
+    candidates = [i for i in file.positions(find[0]) if i >= min_index and file.matches(find, i)]
+    if candidates:
+        index = min(candidates, key=lambda i: abs(i - start))
+        return "offset", index, f"offset {index - start:+d} lines"
+    if start + len(find) <= len(file.keys):
+        context = [line[:1] == b" " for line in hunk.text if line[:1] in b" -"]
+        mismatches = [i for i, line in enumerate(find) if file.keys[start + i] != line]
+        if all(context[i] for i in mismatches):
+            return "fuzz", start, f"fuzz {len(mismatches)} context line(s)"
+    return "failed", None, None
+
+
+def _apply_hunks(file, hunks, placements):
+    lines = []
+    position = 0
+    for hunk, index in zip(hunks, placements):
+        lines.extend(file.lines[position:index])
+        position = index
+        for line in hunk.text:
+            if line[:1] == b"+":
+                lines.append(line[1:])
+            elif line[:1] in b" -":
+                if line[:1] == b" ":
+                    lines.append(file.lines[position])
+                position += 1
+    lines.extend(file.lines[position:])
+    return lines
+
+
+def _is_applied(file, hunks):
+    for hunk in hunks:
+        expected = [line[1:].rstrip(b"\r\n") for line in hunk.text if line[:1] in b" +"]
+        if not file.matches(expected, max(hunk.starttgt - 1, 0)):
+            return False
+    return True
+
+
+def _check_item(files, item, base_path, strip):
+    """(status, messages) of a patched file, `files` is updated with the patched lines"""
+    source, target = _item_paths(item, base_path, strip)
+    if "dev/null" in source:
+        files[target] = [line[1:] for line in item.hunks[0].text if line[:1] in b" +"] if item.hunks else []
+        return "applied", []
+    if "dev/null" in target:
+        files.pop(source, None)
+        return "applied", []
+    path = source if files.get(source) is not None else target
+    if files.get(path) is None:
+        return "failed", [f"{source}: file not found"]
+
+    file = _File(files[path])
+    status, placements, messages = "applied", [], []
+    min_index = 0
+    for number, hunk in enumerate(item.hunks, start=1):
+        hunk_status, index, detail = _locate_hunk(file, hunk, min_index)
+        if hunk_status != "applied":
+            messages.append(f"{path}: hunk {number} (line {hunk.startsrc}) {detail or 'does not apply'}")
+            status = min(status, hunk_status, key=_STATUS_ORDER.index)
+        if index is not None:
+            placements.append(index)
+            min_index = index + sum(1 for line in hunk.text if line[:1] in b" -")
+
+    if status != "applied" and _is_applied(file, item.hunks):
+        return "already applied", [f"{path}: already applied"]
+    if status != "failed":
+        files[path] = _apply_hunks(file, item.hunks, placements)
+    return status, messages
+
+
+def check_patch(files, patch):
+    """Result of applying a patch to the files of the source folder, which are updated"""
+    patchset = patch_ng.fromstring(patch["content"])
+    if not patchset or not patchset.items:
+        return {"status": "failed", "messages": ["cannot parse the patch"]}
+    status, messages = "applied", []
+    for item in patchset.items:
+        item_status, item_messages = _check_item(files, item, patch["base_path"], patch["strip"])
+        status = min(status, item_status, key=_STATUS_ORDER.index)
+        messages.extend(item_messages)
+    return {"status": status, "messages": messages}
+
+
+def check_version(mirror, version):
+    """Results of the patches of a recipe version, None if its source archive is not available"""
+    location = backup_sources_checker.source_location(mirror, version["sha256"])
+    stream = backup_sources_checker.open_source(location)
+    if stream is None:
+        return None
+    with stream, tempfile.TemporaryDirectory() as tmp:
+        archive_path = location
+        if "://" in location:  # Archives are read from a seekable file
+            archive_path = os.path.join(tmp, version["sha256"])
+            with open(archive_path, "wb") as f:
+                shutil.copyfileobj(stream, f, backup_sources_checker.CHUNK_SIZE)
+        try:
+            files = read_archive_files(archive_path, wanted_files(version["patches"]))
+        except (tarfile.TarError, zipfile.BadZipFile, EOFError, OSError) as error:
+            return [{"status": "skipped", "messages": [f"cannot read the source archive: {error}"]}
+                    for _ in version["patches"]]
+    return [check_patch(files, patch) for patch in version["patches"]]
+
+
+def check_versions(mirror, versions):
+    return [check_version(mirror, version) for version in versions]
+
+
+def collect_versions(conandata_path):
+    """Versions with patches of a conandata.yml, with a single source archive, and the content of their patches"""
+    recipe_folder = os.path.dirname(conandata_path)
+    with open(conandata_path, encoding="utf-8") as f:
+        try:
+            conandata = yaml.load(f, Loader=_Loader) or {}
+        except yaml.YAMLError:
+            return []  # Reported by the conandata.yml linter
+    sources = {str(k): v for k, v in (conandata.get("sources") or {}).items()}
+    versions = []
+    for version, entries in (conandata.get("patches") or {}).items():
+        source = sources.get(str(version))
+        if not isinstance(source, dict) or not isinstance(source.get("sha256"), str) or not entries:
+            continue  # No source archive, or one per os or arch
+        patches = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            if "patch_file" in entry:
+                name = entry["patch_file"]
+                try:
+                    with open(os.path.join(recipe_folder, name), "rb") as f:
+                        content = f.read()
+                except OSError:
+                    continue  # Reported by the recipe yaml linter
+            elif "patch_string" in entry:
+                name, content = "patch_string", str(entry["patch_string"]).encode("utf-8")
+            else:
+                continue
+            patches.append({"name": name, "content": content, "base_path": entry.get("base_path") or "",
+                            "strip": int(entry.get("strip") or 0), "fuzz": bool(entry.get("fuzz"))})
+        if patches:
+            versions.append({"conandata": conandata_path, "version": str(version),
+                             "sha256": source["sha256"].strip().lower(), "patches": patches})
+    return versions
+
+
+def _patch_keys(version):
+    """Cache key of each patch: the source archive and the patches applied so far"""
+    keys = []
+    digest = hashlib.sha256(version["sha256"].encode("utf-8"))
+    for patch in version["patches"]:
+        digest.update(f"{patch['base_path']}\0{patch['strip']}\0".encode("utf-8"))
+        digest.update(hashlib.sha256(patch["content"]).digest())
+        keys.append(f"{version['sha256']}/{digest.hexdigest()}")
+    return keys
+
+
+def _checker_hash():
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_cache(cache_path):
+    """Load the results cache, it is discarded if it was written by a different version of this checker"""
+    checker = _checker_hash()
+    if cache_path and os.path.isfile(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("checker") == checker:
+                return cache
+        except ValueError:
+            pass
+    return {"checker": checker, "patches": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the patches of the conandata.yml files apply to the source archives of a backup sources mirror."
+    )
+    parser.add_argument(
+        "mirror",
+        help="download cache folder, folder with files named by their sha256, or base URL of a backup sources server.",
+    )
+    parser.add_argument(
+        "--recipes",
+        nargs="+",
+        default=[os.path.join(backup_sources_checker.ROOT, "recipes")],
+        help="recipe folders to check, or folders containing them (default: all recipes).",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes, each one checks whole recipes.",
+    )
+    parser.add_argument(
+        "--cache",
+        help="JSON file where results are stored by source archive and patch hashes, they are not checked again.",
+    )
+    args = parser.parse_args()
+
+    cache = _load_cache(args.cache)
+    versions = []
+    recipes = []
+    for conandata_path in backup_sources_checker.find_conandata_files(args.recipes):
+        pending = []
+        for version in collect_versions(conandata_path):
+            keys = _patch_keys(version)
+            versions.append((version, keys))
+            if not all(key in cache["patches"] for key in keys):
+                pending.append(version)
+        if pending:
+            recipes.append(pending)
+
+    if len(recipes) > 1 and args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            checked = executor.map(check_versions, [args.mirror] * len(recipes), recipes,
+                                   chunksize=max(1, len(recipes) // (args.jobs * 4)))
+            checked = list(checked)
+    else:
+        checked = [check_versions(args.mirror, versions) for versions in recipes]
+
+    results = dict(cache["patches"])
+    for pending, version_results in zip(recipes, checked):
+        for version, patch_results in zip(pending, version_results):
+            for key, result in zip(_patch_keys(version), patch_results or []):
+                results[key] = result
+                if result["status"] != "skipped":
+                    cache["patches"][key] = result
+
+    counts = dict.fromkeys(_STATUS_ORDER + ["skipped", "unavailable"], 0)
+    failed = False
+    for version, keys in versions:
+        if any(key not in results for key in keys):
+            counts["unavailable"] += len(keys)  # Missing source archive, reported by backup_sources_checker.py
+            continue
+        for patch, key in zip(version["patches"], keys):
+            result = results[key]
+            status = result["status"]
+            counts[status] += 1
+            if status == "fuzz" and patch["fuzz"]:
+                continue
+            if _STATUS_ERRORS.get(status) or status == "skipped":
+                level = "error" if _STATUS_ERRORS.get(status) else "warning"
+                failed = failed or level == "error"
+                print(f"::{level} file={version['conandata']},title=patch {status}::{version['version']} {patch['name']}: "
+                      + "; ".join(result["messages"]))
+
+    print(", ".join(f"{count} {status}" for status, count in counts.items()) + " patches")
+
+    if args.cache:
+        with open(args.cache, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
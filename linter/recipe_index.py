@@ -0,0 +1,406 @@
+"""
+Index metadata of every recipe in a SQLite database, parsing the conanfiles with `ast` so no recipe is executed.
+The index is updated incrementally by file hash before each query, and it can be queried with SQL:
+
+    python3 linter/recipe_index.py requires zlib
+    python3 linter/recipe_index.py cppstd 17
+    python3 linter/recipe_index.py option with_ssl
+    python3 linter/recipe_index.py sql "SELECT folder FROM recipes WHERE package_type = 'header-library'"
+
+Tables, `folder` is a recipe folder relative to `recipes` (i.e. zlib/all):
+
+    recipes(folder, recipe, name, class_name, package_type)
+    options(folder, option, "values", default_value)     values and defaults as JSON, or source code if not literal
+    requires(folder, kind, reference, name)              kind is requires, tool_requires, test_requires...
+    cppstd(folder, value)                                literal arguments of check_min_cppstd/valid_min_cppstd
+    compilers(folder, cppstd, compiler, version)         from _compilers_minimum_version and similar
+    versions(recipe, version, folder)                    from config.yml
+    sources(folder, version)                             versions with sources in conandata.yml
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import yaml
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (key TEXT PRIMARY KEY, sha256 TEXT NOT NULL);
+CREATE TABLE recipes (folder TEXT PRIMARY KEY, recipe TEXT NOT NULL, name TEXT, class_name TEXT, package_type TEXT);
+CREATE TABLE options (folder TEXT NOT NULL, option TEXT NOT NULL, "values" TEXT, default_value TEXT);
+CREATE TABLE requires (folder TEXT NOT NULL, kind TEXT NOT NULL, reference TEXT NOT NULL, name TEXT);
+CREATE TABLE cppstd (folder TEXT NOT NULL, value TEXT NOT NULL);
+CREATE TABLE compilers (folder TEXT NOT NULL, cppstd TEXT, compiler TEXT NOT NULL, version TEXT);
+CREATE TABLE versions (recipe TEXT NOT NULL, version TEXT NOT NULL, folder TEXT);
+CREATE TABLE sources (folder TEXT NOT NULL, version TEXT NOT NULL);
+CREATE INDEX options_option ON options (option);
+CREATE INDEX requires_name ON requires (name);
+CREATE INDEX cppstd_value ON cppstd (value);
+"""
+_FOLDER_TABLES = ("recipes", "options", "requires", "cppstd", "compilers", "sources")
+
+_REQUIRE_KINDS = ("requires", "tool_requires", "build_requires", "test_requires")
+_CPPSTD_CHECKS = ("check_min_cppstd", "valid_min_cppstd")
+_COMPILERS_VERSION = re.compile(r"^_(compilers?_min(imum)?_versions?|min(imum)?_compilers?_versions?)$")
+
+
+def _cache_folder():
+    if os.getenv("CCI_LINTER_CACHE"):
+        return os.getenv("CCI_LINTER_CACHE")
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "conan-center-index-linter")
+
+
+def default_db_path():
+    return os.path.join(_cache_folder(), "recipe_index.sqlite")
+
+
+def _literal(node):
+    """Value of a literal node, None if it is not a literal"""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def _literal_json(node, source):
+    """JSON of a literal node, or its source code"""
+    try:
+        return json.dumps(ast.literal_eval(node), default=str)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return ast.get_source_segment(source, node)
+
+
+def _dict_items(node):
+    """Nodes of the values of a dict literal, by key"""
+    if not isinstance(node, ast.Dict):
+        return {}
+    return {key.value: value for key, value in zip(node.keys, node.values)
+            if isinstance(key, ast.Constant) and isinstance(key.value, str)}
+
+
+def _reference(node, source):
+    """(reference, name) of a requirement, f-strings keep their source code and the name of their literal prefix"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value, node.value.split("/")[0]
+    if isinstance(node, ast.JoinedStr):
+        prefix = node.values[0].value if node.values and isinstance(node.values[0], ast.Constant) else ""
+        return ast.get_source_segment(source, node), prefix.split("/")[0] if "/" in prefix else None
+    return None
+
+
+def _is_self_attribute(node, names=None):
+    return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self" \
+        and (names is None or node.attr in names)
+
+
+class _RecipeVisitor:
+    """Metadata of the ConanFile class of a conanfile.py"""
+
+    def __init__(self, classdef, source, lines):
+        self.classdef = classdef
+        self.source = source
+        self.attributes = {}
+        self.functions = {}
+        self.calls = []
+        for node in classdef.body:
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.attributes[target.id] = node.value
+            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value:
+                self.attributes[node.target.id] = node.value
+            elif isinstance(node, ast.FunctionDef):
+                self.functions[node.name] = node
+                # Walking the syntax tree dominates indexing time, only functions with interesting calls are walked
+                source = "".join(lines[node.lineno - 1:node.end_lineno])
+                if any(name in source for name in _REQUIRE_KINDS + _CPPSTD_CHECKS):
+                    self.calls.extend((node, n) for n in ast.walk(node) if isinstance(n, ast.Call))
+
+    def string_attribute(self, name):
+        node = self.attributes.get(name)
+        return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+    def _returned(self, name):
+        """Literal values of a class attribute, or returned by a method or property"""
+        if name in self.attributes:
+            return self._values(self.attributes[name], None)
+        function = self.functions.get(name)
+        if function is None:
+            return []
+        return [v for node in ast.walk(function) if isinstance(node, ast.Return) and node.value
+                for v in self._values(node.value, function)]
+
+    def _values(self, node, function, depth=0):
+        """Possible literal values of an expression"""
+        if depth > 4:
+            return []
+        if isinstance(node, ast.Constant):
+            return [node.value]
+        if isinstance(node, ast.IfExp):
+            return self._values(node.body, function, depth + 1) + self._values(node.orelse, function, depth + 1)
+        if _is_self_attribute(node):
+            return self._returned(node.attr) if depth < 2 else []
+        if isinstance(node, ast.Name) and function is not None:
+            return [v for n in ast.walk(function) if isinstance(n, ast.Assign)
+                    and any(isinstance(t, ast.Name) and t.id == node.id for t in n.targets)
+                    for v in self._values(n.value, function, depth + 1)]
+        return []
+
+    def requires(self):
+        rows = []
+        for kind in _REQUIRE_KINDS:
+            node = self.attributes.get(kind)
+            for element in (node.elts if isinstance(node, (ast.Tuple, ast.List)) else [node] if node else []):
+                reference = _reference(element, self.source)
+                if reference:
+                    rows.append((kind, *reference))
+        for _, node in self.calls:
+            if _is_self_attribute(node.func, _REQUIRE_KINDS) and node.args:
+                reference = _reference(node.args[0], self.source)
+                if reference:
+                    rows.append((node.func.attr, *reference))
+        return sorted(set(rows), key=lambda row: (row[0], row[1]))
+
+    def cppstd(self):
+        values = set()
+        for function, node in self.calls:
+            if len(node.args) < 2:
+                continue
+            name = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, "id", None)
+            if name in _CPPSTD_CHECKS:
+                values.update(str(v) for v in self._values(node.args[1], function) if isinstance(v, (str, int)))
+        return sorted(values)
+
+    def compilers(self):
+        rows = set()
+        for name in list(self.attributes) + list(self.functions):
+            if not _COMPILERS_VERSION.match(name):
+                continue
+            nodes = [self.attributes[name]] if name in self.attributes else \
+                [n.value for n in ast.walk(self.functions[name]) if isinstance(n, ast.Return) and n.value]
+            for node in nodes:
+                table = _literal(node) if isinstance(node, ast.Dict) else None
+                if not isinstance(table, dict):
+                    continue
+                for key, value in table.items():
+                    if isinstance(value, dict):  # Per C++ standard
+                        rows.update((str(key), str(c), str(v)) for c, v in value.items())
+                    else:
+                        rows.add((None, str(key), str(value)))
+        return sorted(rows, key=lambda row: tuple(v or "" for v in row))
+
+
+def _conan_file_class(tree):
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and any(
+                (isinstance(b, ast.Name) and b.id == "ConanFile") or (isinstance(b, ast.Attribute) and b.attr == "ConanFile")
+                for b in node.bases):
+            return node
+    return None
+
+
+def index_folder(folder, conanfile, conandata):
+    """Rows of the folder tables for a recipe folder, given the content of its conanfile.py and conandata.yml"""
+    rows = {table: [] for table in _FOLDER_TABLES}
+    recipe = folder.split("/")[0]
+    source = conanfile.decode("utf-8", errors="replace")
+    lines = source.splitlines(keepends=True)
+    try:
+        classdef = _conan_file_class(ast.parse(source))
+    except (SyntaxError, ValueError):
+        classdef = None
+    if classdef is not None:
+        visitor = _RecipeVisitor(classdef, source, lines)
+        rows["recipes"].append((folder, recipe, visitor.string_attribute("name"), classdef.name,
+                                visitor.string_attribute("package_type")))
+        options = _dict_items(visitor.attributes.get("options"))
+        defaults = _dict_items(visitor.attributes.get("default_options"))
+        for option in sorted(set(options) | set(defaults)):
+            rows["options"].append((folder, option, _literal_json(options[option], source) if option in options else None,
+                                    _literal_json(defaults[option], source) if option in defaults else None))
+        rows["requires"] = [(folder, *row) for row in visitor.requires()]
+        rows["cppstd"] = [(folder, value) for value in visitor.cppstd()]
+        rows["compilers"] = [(folder, *row) for row in visitor.compilers()]
+    else:
+        rows["recipes"].append((folder, recipe, None, None, None))
+
+    if conandata:
+        try:
+            data = yaml.load(conandata, Loader=_Loader)
+        except yaml.YAMLError:
+            data = None
+        sources = data.get("sources") if isinstance(data, dict) else None
+        if isinstance(sources, dict):
+            rows["sources"] = [(folder, str(version)) for version in sources]
+    return rows
+
+
+def index_recipe(recipe, config):
+    """Rows of the versions table for a config.yml"""
+    try:
+        data = yaml.load(config, Loader=_Loader)
+    except yaml.YAMLError:
+        return []
+    versions = data.get("versions") if isinstance(data, dict) else None
+    if not isinstance(versions, dict):
+        return []
+    return [(recipe, str(version), entry.get("folder") if isinstance(entry, dict) else None)
+            for version, entry in versions.items()]
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:  # i.e. missing, or the parent is not a folder
+        return b""
+
+
+def _index_folders(tasks):
+    return [index_folder(folder, conanfile, conandata.decode("utf-8")) for folder, conanfile, conandata in tasks]
+
+
+def _index_recipes(tasks):
+    return [index_recipe(recipe, config.decode("utf-8")) for recipe, config in tasks]
+
+
+def _run(function, tasks, jobs):
+    """function over chunks of the tasks, using a process pool if there are many of them"""
+    if jobs <= 1 or len(tasks) < 50:
+        return function(tasks)
+    size = max(1, len(tasks) // (jobs * 4))
+    chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return [result for chunk in executor.map(function, chunks) for result in chunk]
+
+
+def _indexer_hash():
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def connect(db_path):
+    """Open the index, it is recreated if it was written by a different version of this indexer"""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    indexer = _indexer_hash()
+    try:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'indexer'").fetchone()
+    except sqlite3.DatabaseError:
+        row = None
+    if row is None or row[0] != indexer:
+        connection.close()
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        connection = sqlite3.connect(db_path)
+        connection.executescript(_SCHEMA)
+        connection.execute("INSERT INTO meta VALUES ('indexer', ?)", (indexer,))
+        connection.commit()
+    return connection
+
+
+def update(connection, recipes_folder, jobs):
+    """Index the recipe folders and config.yml files whose content changed, returns the number of them"""
+    current = {}
+    folder_files = {}
+    config_files = {}
+    for recipe in sorted(os.listdir(recipes_folder)):
+        recipe_path = os.path.join(recipes_folder, recipe)
+        config = _read(os.path.join(recipe_path, "config.yml"))
+        if config:
+            current[recipe] = hashlib.sha256(config).hexdigest()
+            config_files[recipe] = config
+        for name in sorted(os.listdir(recipe_path)) if os.path.isdir(recipe_path) else []:
+            conanfile = _read(os.path.join(recipe_path, name, "conanfile.py"))
+            if not conanfile:
+                continue
+            conandata = _read(os.path.join(recipe_path, name, "conandata.yml"))
+            folder = f"{recipe}/{name}"
+            digest = hashlib.sha256(conanfile)
+            digest.update(b"\0")
+            digest.update(conandata)
+            current[folder] = digest.hexdigest()
+            folder_files[folder] = (conanfile, conandata)
+
+    indexed = dict(connection.execute("SELECT key, sha256 FROM files"))
+    changed = [key for key, digest in current.items() if indexed.get(key) != digest]
+    removed = [key for key in indexed if key not in current]
+    if not changed and not removed:
+        return 0
+
+    folders = [(key, *folder_files[key]) for key in changed if key in folder_files]
+    recipes = [(key, config_files[key]) for key in changed if key in config_files]
+    folder_rows = _run(_index_folders, folders, jobs)
+    recipe_rows = _run(_index_recipes, recipes, jobs)
+
+    with connection:
+        for key in changed + removed:
+            if "/" in key:
+                for table in _FOLDER_TABLES:
+                    connection.execute(f"DELETE FROM {table} WHERE folder = ?", (key,))
+            else:
+                connection.execute("DELETE FROM versions WHERE recipe = ?", (key,))
+            connection.execute("DELETE FROM files WHERE key = ?", (key,))
+        for rows in folder_rows:
+            for table, table_rows in rows.items():
+                if table_rows:
+                    placeholders = ", ".join("?" * len(table_rows[0]))
+                    connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", table_rows)
+        for rows in recipe_rows:
+            connection.executemany("INSERT INTO versions VALUES (?, ?, ?)", rows)
+        connection.executemany("INSERT INTO files VALUES (?, ?)", [(key, current[key]) for key in changed])
+    return len(changed) + len(removed)
+
+
+_QUERIES = {
+    "requires": ("SELECT DISTINCT folder, kind, reference FROM requires WHERE name = ? ORDER BY folder, kind", "name"),
+    "cppstd": ("SELECT DISTINCT folder FROM cppstd WHERE value = ? ORDER BY folder", "value"),
+    "option": ("SELECT folder, \"values\", default_value FROM options WHERE option = ? ORDER BY folder", "name"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index ConanCenterIndex recipes in a SQLite database and query it.")
+    parser.add_argument("--db", default=default_db_path(),
+                        help="SQLite database (default: in the linter cache folder).")
+    parser.add_argument("--recipes", default=os.path.join(ROOT, "recipes"), help="folder containing the recipes.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes.")
+    parser.add_argument("--no-update", action="store_true", help="query the index without updating it first.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("index", help="only update the index.")
+    subparsers.add_parser("requires", help="recipes requiring a package.").add_argument("name")
+    subparsers.add_parser("cppstd", help="recipes checking a minimum C++ standard.").add_argument("value")
+    subparsers.add_parser("option", help="recipes defining an option.").add_argument("name")
+    subparsers.add_parser("sql", help="run an SQL query.").add_argument("query")
+    args = parser.parse_args()
+
+    connection = connect(args.db)
+    if not args.no_update or args.command == "index":
+        updated = update(connection, args.recipes, args.jobs)
+        if args.command == "index":
+            print(f"{updated} recipe folders and config.yml files indexed in {args.db}")
+            return
+
+    if args.command == "sql":
+        cursor = connection.execute(args.query)
+    else:
+        query, argument = _QUERIES[args.command]
+        cursor = connection.execute(query, (getattr(args, argument),))
+    for row in cursor:
+        print("\t".join("" if value is None else str(value) for value in row))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from yaml_linting import file_or_dir_path
+import config_yaml_linter
+import conandata_yaml_linter
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate 'config.yml', 'conandata.yml' and the patch files of ConanCenterIndex's recipes in a single pass."
+    )
+    parser.add_argument(
+        "path",
+        nargs="+",
+        type=file_or_dir_path,
+        help="recipe folders to validate (i.e. recipes/zlib), or folders containing them (i.e. recipes).",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes.",
+    )
+    args = parser.parse_args()
+
+    recipes = collect_recipes(args.path)
+    if len(recipes) > 1 and args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            chunksize = max(1, len(recipes) // (args.jobs * 4))
+            results = executor.map(lint_recipe, recipes, chunksize=chunksize)
+            for messages in results:
+                for message in messages:
+                    print(message)
+    else:
+        for recipe in recipes:
+            for message in lint_recipe(recipe):
+                print(message)
+
+
+def collect_recipes(paths):
+    """Return the recipe folders, the ones with a config.yml or a conandata.yml in a subfolder, given or found right
+    below the given paths"""
+    recipes = []
+    for path in paths:
+        if os.path.isfile(path):
+            path = os.path.dirname(path) or "."
+        if _is_recipe(path):
+            recipes.append(path)
+            continue
+        for name in sorted(os.listdir(path)):
+            if _is_recipe(os.path.join(path, name)):
+                recipes.append(os.path.join(path, name))
+    return recipes
+
+
+def _is_recipe(path):
+    return os.path.isfile(os.path.join(path, "config.yml")) or bool(_conandata_folders(path))
+
+
+def _conandata_folders(recipe):
+    if not os.path.isdir(recipe):
+        return []
+    return [name for name in sorted(os.listdir(recipe)) if os.path.isfile(os.path.join(recipe, name, "conandata.yml"))]
+
+
+def lint_recipe(recipe):
+    """Validate the config.yml of a recipe, the conandata.yml of every folder, whether config.yml references it or
+    not, and their patch files"""
+    messages = []
+    config_path = os.path.join(recipe, "config.yml")
+    if os.path.isfile(config_path):
+        with open(config_path, encoding="utf-8") as f:
+            parsed, messages = config_yaml_linter.lint(config_path, f.read())
+        if parsed is not None:
+            folders = {}
+            for version in parsed["versions"]:
+                folder = parsed["versions"][version]["folder"]
+                folders.setdefault(folder.data, folder)
+            for name, folder in folders.items():
+                if not os.path.isdir(os.path.join(recipe, name)):
+                    messages.append(
+                        f"::error file={config_path},line={folder.start_line},endline={folder.start_line},"
+                        f"title=config.yml inconsistency"
+                        f"::Folder `{name}` is listed in config.yml, but it does not exist in the recipe"
+                    )
+
+    for name in _conandata_folders(recipe):
+        folder_path = os.path.join(recipe, name)
+        conandata_path = os.path.join(folder_path, "conandata.yml")
+        with open(conandata_path, encoding="utf-8") as f:
+            conandata, conandata_messages = conandata_yaml_linter.validate(conandata_path, f.read())
+        messages.extend(conandata_messages)
+        if conandata is not None:
+            messages.extend(_check_patch_files(folder_path, conandata_path, conandata))
+    return messages
+
+
+def _check_patch_files(folder_path, conandata_path, conandata):
+    messages = []
+    if "patches" not in conandata:
+        return messages
+    for version in conandata["patches"]:
+        for patch in conandata["patches"][version]:
+            if not isinstance(patch.data, dict) or not isinstance(patch.data.get("patch_file"), str):
+                continue  # Already reported by the conandata.yml schema validation
+            patch_file = patch["patch_file"]
+            if not os.path.isfile(os.path.join(folder_path, patch_file.data)):
+                messages.append(
+                    f"::error file={conandata_path},line={patch_file.start_line},endline={patch_file.start_line},"
+                    f"title=conandata.yml inconsistency"
+                    f"::Patch file `{patch_file.data}` is listed for version `{version}`, but it does not exist"
+                    f" in the recipe folder"
+                )
+    return messages
+
+
+if __name__ == "__main__":
+    main()
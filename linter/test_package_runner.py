@@ -0,0 +1,305 @@
+"""
+Run the test_package of a batch of references from the Conan cache, grouped by profile, several at once, and report
+the time of each phase per reference:
+
+    python3 linter/test_package_runner.py zlib/1.3.1 fmt/10.2.1 -pr default -pr clang --jobs 4
+    python3 linter/impact_analysis.py origin/master...HEAD | python3 linter/test_package_runner.py - --compiler-launcher ccache
+
+Before the test_packages of a profile, an empty CMake project is configured with that profile. Its compiler
+identification and checks (`CMakeFiles/<cmake version>/`) are copied by a wrapper of cmake (`tools.cmake:cmake_program`)
+to the new build folders it configures, so CMake skips them. With `--compiler-launcher`, all the compilations go
+through the same compiler cache, in `--compiler-cache-dir` if given.
+
+`conan test` runs with `--no-remote`: the references and the requirements of their test_package must already be in
+the cache. Nothing is built nor downloaded, which is what makes running test_packages at once safe. The phases are
+taken from the output of `conan test`: install (dependency graph and generators), configure and build
+(`CMake.configure()` and `CMake.build()`, build() is accounted as build for other build systems) and run (test()).
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import yaml
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ("install", "configure", "build", "run")
+
+# Output line marking the start of a phase, the install phase starts with the command
+_PHASE_MARKERS = (
+    ("======== Testing the package: Building ========", "build"),
+    ("Running CMake.configure()", "configure"),
+    ("Running CMake.build()", "build"),
+    ("======== Testing the package: Executing test ========", "run"),
+)
+
+_COMPILER_CACHE_DIR_VARIABLES = {"ccache": "CCACHE_DIR", "sccache": "SCCACHE_DIR"}
+
+_WARM_UP_CONANFILE = """\
+from conan import ConanFile
+from conan.tools.cmake import CMake, cmake_layout
+
+
+class WarmUpConan(ConanFile):
+    settings = "os", "arch", "compiler", "build_type"
+    generators = "CMakeToolchain"
+
+    def layout(self):
+        cmake_layout(self)
+
+    def build(self):
+        CMake(self).configure()
+"""
+
+_WARM_UP_CMAKELISTS = """\
+cmake_minimum_required(VERSION 3.15)
+project(warm_up C CXX)
+"""
+
+_TOOLCHAIN_INCLUDE = """\
+get_filename_component(_SEEDED_TOOLCHAIN_FILE "${CMAKE_TOOLCHAIN_FILE}" ABSOLUTE BASE_DIR "${CMAKE_BINARY_DIR}")
+include("${_SEEDED_TOOLCHAIN_FILE}")"""
+
+_SEEDED_MARKER = "-- Seeded with the compiler checks of the warm up project"
+
+# Only configurations of new build folders with the toolchain and the cmake of the warm up project are seeded
+_CMAKE_WRAPPER = """\
+import os
+import shutil
+import subprocess
+import sys
+
+cmake = shutil.which("cmake") or "cmake"
+if (any(argument.startswith("-DCMAKE_TOOLCHAIN_FILE=") for argument in sys.argv[1:])
+        and os.path.realpath(cmake) == os.path.realpath({cmake!r}) and not os.path.exists("CMakeCache.txt")):
+    shutil.copytree({seed!r}, os.getcwd(), dirs_exist_ok=True)
+    print({marker!r}, flush=True)
+sys.exit(subprocess.call([cmake] + sys.argv[1:]))
+"""
+
+
+def recipe_folder(reference):
+    """Recipe folder of a name/version reference according to its config.yml, None if it is not listed"""
+    name, _, version = reference.split("@")[0].split("#")[0].partition("/")
+    config_path = os.path.join(ROOT, "recipes", name, "config.yml")
+    if not version or not os.path.isfile(config_path):
+        return None
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    folder = (config.get("versions") or {}).get(version, {}).get("folder")
+    return os.path.join(ROOT, "recipes", name, folder) if folder else None
+
+
+def _run(command, cwd, env, log_path):
+    """Run a command, writing its output to a log file, returns its return code and the (line, time) of its output"""
+    lines = []
+    with open(log_path, "w", encoding="utf-8") as log:
+        log.write(" ".join(command) + "\n")
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, errors="replace")
+        for line in process.stdout:
+            lines.append((line, time.monotonic()))
+            log.write(line)
+        return process.wait(), lines
+
+
+def phase_durations(start, lines, end):
+    """Seconds spent in each phase given the (line, time) output of `conan test`, None for the phases not reached"""
+    durations = dict.fromkeys(PHASES)
+    phase, since = "install", start
+    for line, timestamp in lines:
+        for marker, next_phase in _PHASE_MARKERS:
+            if marker in line:
+                durations[phase] = (durations[phase] or 0.0) + timestamp - since
+                phase, since = next_phase, timestamp
+                break
+    durations[phase] = (durations[phase] or 0.0) + end - since
+    return durations
+
+
+def warm_up(folder, profile, build_profile, env):
+    """Configure an empty CMake project with a profile.
+
+    Returns a folder with the files seeding a new build folder with the compiler identification and checks of the
+    project, None if it could not be configured.
+    """
+    project_folder = os.path.join(folder, "warm_up")
+    os.makedirs(project_folder, exist_ok=True)
+    with open(os.path.join(project_folder, "conanfile.py"), "w", encoding="utf-8") as f:
+        f.write(_WARM_UP_CONANFILE)
+    with open(os.path.join(project_folder, "CMakeLists.txt"), "w", encoding="utf-8") as f:
+        f.write(_WARM_UP_CMAKELISTS)
+    command = ["conan", "build", project_folder, "--no-remote", "-pr:h", profile, "-pr:b", build_profile]
+    returncode, _ = _run(command, project_folder, env, os.path.join(folder, "warm_up.log"))
+    build_folder = next((root for root, _, files in os.walk(project_folder) if "CMakeCache.txt" in files), None)
+    if returncode != 0 or build_folder is None:
+        return None
+    platform_folder = next((entry.path for entry in os.scandir(os.path.join(build_folder, "CMakeFiles"))
+                            if os.path.isfile(os.path.join(entry.path, "CMakeSystem.cmake"))), None)
+    if platform_folder is None:
+        return None
+    seed_folder = os.path.join(folder, "cmake_seed")
+    seed_platform_folder = os.path.join(seed_folder, "CMakeFiles", os.path.basename(platform_folder))
+    os.makedirs(seed_platform_folder, exist_ok=True)
+    for entry in os.scandir(platform_folder):
+        if entry.is_file() and entry.name.endswith((".cmake", ".bin")):
+            shutil.copy2(entry.path, seed_platform_folder)
+    # CMakeSystem.cmake includes the toolchain of the project it was created for, use the one of each project,
+    # relative to the build folder as CMake does
+    system_path = os.path.join(seed_platform_folder, "CMakeSystem.cmake")
+    with open(system_path, encoding="utf-8") as f:
+        system, count = re.subn(r'^include\(".*"\)$', lambda _: _TOOLCHAIN_INCLUDE, f.read(), flags=re.MULTILINE)
+    if count != 1:
+        return None
+    with open(system_path, "w", encoding="utf-8") as f:
+        f.write(system)
+    # Without this mark, CMake does not use the platform information of the build folder
+    with open(os.path.join(seed_folder, "CMakeCache.txt"), "w", encoding="utf-8") as f:
+        f.write("CMAKE_PLATFORM_INFO_INITIALIZED:INTERNAL=1\n")
+    return seed_folder
+
+
+def cmake_wrapper(folder, seed_folder, cmake):
+    """Write a cmake program seeding the build folders it configures, returns its path"""
+    script = os.path.join(folder, "cmake_wrapper.py")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(f"#!{sys.executable}\n" + _CMAKE_WRAPPER.format(seed=seed_folder, cmake=cmake, marker=_SEEDED_MARKER))
+    if os.name == "nt":
+        program = os.path.join(folder, "cmake_wrapper.cmd")
+        with open(program, "w", encoding="utf-8") as f:
+            f.write(f'@"{sys.executable}" "{script}" %*\n')
+        return program
+    os.chmod(script, 0o755)
+    return script
+
+
+def run_test_package(job, build_profile, env):
+    """Run `conan test` on a copy of the recipe folder of a job, returns the job with its status and phases"""
+    shutil.copytree(job["recipe_folder"], job["work_folder"], ignore=shutil.ignore_patterns("__pycache__"))
+    test_folder = os.path.join(job["work_folder"], job["test_folder"])
+    for local_output in ("build", "test_output"):  # i.e. from a previous `conan create` in the recipe folder
+        shutil.rmtree(os.path.join(test_folder, local_output), ignore_errors=True)
+    command = ["conan", "test", test_folder, job["reference"], "--no-remote", "-pr:h", job["profile"],
+               "-pr:b", build_profile, "-c", f"tools.build:jobs={job['build_jobs']}"]
+    if job["cmake_program"]:
+        command.extend(["-c", f"tools.cmake:cmake_program={job['cmake_program']}"])
+    start = time.monotonic()
+    returncode, lines = _run(command, test_folder, env, job["log"])
+    end = time.monotonic()
+    return {**job, "status": "passed" if returncode == 0 else "failed",
+            "seeded": any(line.startswith(_SEEDED_MARKER) for line, _ in lines),
+            "phases": phase_durations(start, lines, end), "total": end - start}
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the test_package of a batch of references, grouped by profile.")
+    parser.add_argument("references", nargs="+", help="references to test (name/version), '-' reads them from stdin.")
+    parser.add_argument("-pr", "--profile", action="append", dest="profiles",
+                        help="host profile, repeat it to test with several profiles (default: default).")
+    parser.add_argument("-pr:b", "--profile-build", default="default", help="build profile (default: default).")
+    parser.add_argument("--test-folder", default="test_package", help="test folder of the recipes (default: "
+                                                                       "test_package).")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="test_packages run at once, they share the CPUs (default: number of CPUs).")
+    parser.add_argument("--no-warm-up", action="store_true", help="do not seed the CMake build folders.")
+    parser.add_argument("--compiler-launcher", choices=sorted(_COMPILER_CACHE_DIR_VARIABLES),
+                        help="compiler cache used by CMake for every test_package.")
+    parser.add_argument("--compiler-cache-dir", help="cache directory of the compiler launcher.")
+    parser.add_argument("--work-dir", help="where test_packages are built (default: a temporary folder).")
+    parser.add_argument("--keep", action="store_true", help="keep the build folders of the passed test_packages.")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON.")
+    args = parser.parse_args()
+
+    references = [r for r in args.references if r != "-"]
+    if "-" in args.references:
+        references.extend(line.strip() for line in sys.stdin if line.strip())
+    # Each reference is tested once per profile, in its own work folder: name/version@ is name/version
+    references = list(dict.fromkeys(r[:-1] if r.endswith("@") else r for r in references))
+    # conan runs in the test folders, profiles given as paths must not be relative
+    profiles = [os.path.abspath(p) if os.path.isfile(p) else p for p in args.profiles or ["default"]]
+    build_profile = os.path.abspath(args.profile_build) if os.path.isfile(args.profile_build) else args.profile_build
+    work_dir = os.path.abspath(args.work_dir or tempfile.mkdtemp(prefix="test_package_runner_"))
+    jobs_at_once = max(1, args.jobs)
+
+    env = dict(os.environ)
+    if args.compiler_launcher:
+        env["CMAKE_C_COMPILER_LAUNCHER"] = env["CMAKE_CXX_COMPILER_LAUNCHER"] = args.compiler_launcher
+        if args.compiler_cache_dir:
+            env[_COMPILER_CACHE_DIR_VARIABLES[args.compiler_launcher]] = os.path.abspath(args.compiler_cache_dir)
+
+    results = []
+    for group, profile in enumerate(profiles):
+        profile_name = re.sub(r"[^\w.-]", "_", os.path.basename(profile))
+        group_dir = os.path.join(work_dir, f"{group}-{profile_name}")
+        os.makedirs(group_dir, exist_ok=True)
+        cmake_program = None
+        cmake = shutil.which("cmake", path=env.get("PATH"))
+        if not args.no_warm_up and cmake:
+            seed_folder = warm_up(group_dir, profile, build_profile, env)
+            if seed_folder:
+                cmake_program = cmake_wrapper(group_dir, seed_folder, cmake)
+            else:
+                print(f"{profile}: could not configure the warm up project, see {group_dir}/warm_up.log",
+                      file=sys.stderr)
+        jobs = []
+        for reference in references:
+            job = {"profile": profile, "reference": reference, "test_folder": args.test_folder,
+                   "recipe_folder": recipe_folder(reference), "status": "skipped", "seeded": False,
+                   "phases": dict.fromkeys(PHASES), "total": None}
+            if job["recipe_folder"] is None or not os.path.isfile(
+                    os.path.join(job["recipe_folder"], args.test_folder, "conanfile.py")):
+                results.append(job)
+                continue
+            job["work_folder"] = os.path.join(group_dir, reference.replace("/", "-"))
+            job["log"] = job["work_folder"] + ".log"
+            job["cmake_program"] = cmake_program
+            jobs.append(job)
+        # The CPUs are shared by the test_packages running at once
+        for job in jobs:
+            job["build_jobs"] = max(1, (os.cpu_count() or 1) // min(jobs_at_once, len(jobs)))
+
+        with concurrent.futures.ThreadPoolExecutor(jobs_at_once) as executor:
+            futures = [executor.submit(run_test_package, job, build_profile, env) for job in jobs]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if result["status"] == "passed" and not args.keep:
+                    shutil.rmtree(result["work_folder"], ignore_errors=True)
+                print(f"{result['profile']} {result['reference']}: {result['status']} "
+                      f"({_seconds(result['total'])}s)", file=sys.stderr)
+
+    order = {(profile, reference): i for i, (profile, reference) in
+             enumerate((p, r) for p in profiles for r in references)}
+    results.sort(key=lambda r: order[(r["profile"], r["reference"])])
+    if args.json:
+        print(json.dumps([{key: result.get(key) for key in ("profile", "reference", "status", "seeded", "phases",
+                                                            "total", "log")} for result in results], indent=2))
+    else:
+        print(f"{'profile':<20} {'reference':<40} {'status':<8}" + "".join(f"{p:>10}" for p in PHASES) + f"{'total':>10}")
+        for result in results:
+            print(f"{result['profile']:<20} {result['reference']:<40} {result['status']:<8}"
+                  + "".join(f"{_seconds(result['phases'][p]):>10}" for p in PHASES) + f"{_seconds(result['total']):>10}")
+        ran = [r for r in results if r["total"] is not None]
+        print(f"{'':<70}" + "".join(f"{_seconds(sum(r['phases'][p] or 0 for r in ran)):>10}" for p in PHASES)
+              + f"{_seconds(sum(r['total'] for r in ran)):>10}")
+    failed = [r for r in results if r["status"] == "failed"]
+    for result in failed:
+        print(f"{result['profile']} {result['reference']} failed, see {result['log']}", file=sys.stderr)
+    if not failed and not args.keep and not args.work_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,73 +1,185 @@
 
 # Class ConanFile doesn't declare all the valid members and functions,
 #   some are injected by Conan dynamically to the class.
+#
+# Building the classes of those members requires parsing several Conan modules, which dominates
+#   pylint start-up time. They are flattened into a stub module that is cached on disk per Conan
+#   version and version of this plugin, so next runs only need to parse that small module, and it
+#   is only built once per process.
 
+import functools
+import hashlib
+import os
 import textwrap
 import astroid
 from astroid.builder import AstroidBuilder
 from astroid.manager import AstroidManager
 
 
-def _settings_transform():
-    module = AstroidBuilder(AstroidManager()).string_build(
-        textwrap.dedent("""
-            class Settings(object):
-                os = None
-                arch = None
-                compiler = None
-                build_type = None
-            """)
-    )
-    return module['Settings']
-
-def _user_info_build_transform():
-    module = AstroidBuilder(AstroidManager()).string_build(
-        textwrap.dedent("""
-            class UserInfoBuild(defaultdict):
-                pass
-            """)
-    )
-    return module['UserInfoBuild']
+_STUB_HEADER = textwrap.dedent("""\
+    # Generated by linter/transform_conanfile.py for Conan {version}, do not edit
+    from collections import *
+
+
+    class Settings(object):
+        os = None
+        arch = None
+        compiler = None
+        build_type = None
+
+
+    class UserInfoBuild(defaultdict):
+        pass
+    """)
+
+# Stub class name: (module, class name) in Conan sources
+_STUB_CLASSES = {
+    "ConanInfo": ("conans.model.info", "ConanInfo"),
+    "RecipeBuildRequires": ("conans.client.graph.graph_manager", "_RecipeBuildRequires"),
+    "FileCopier": ("conans.client.file_copier", "FileCopier"),
+    "FileImporter": ("conans.client.importer", "_FileImporter"),
+    "PyRequires": ("conans.client.graph.python_requires", "PyRequires"),
+}
+
+
+# Field of ConanFile: types it can take, expressed with the stub classes
+_DYNAMIC_FIELDS = {
+    "conan_data": ["dict"],
+    "build_requires": ["RecipeBuildRequires"],
+    "test_requires": ["RecipeBuildRequires"],
+    "tool_requires": ["RecipeBuildRequires"],
+    "info_build": ["ConanInfo"],
+    "user_info_build": ["UserInfoBuild"],
+    "info": ["ConanInfo"],
+    "copy": ["FileCopier"],
+    "copy_deps": ["FileImporter"],
+    "python_requires": ["str", "PyRequires"],
+    "recipe_folder": ["str"],
+    "settings_build": ["Settings"],
+    "settings_target": ["Settings"],
+    "conf": ["dict"],
+}
 
 
 def register(_):
     pass
 
+
+def _cache_folder():
+    if os.getenv("CCI_LINTER_CACHE"):
+        return os.getenv("CCI_LINTER_CACHE")
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "conan-center-index-linter")
+
+
+def _plugin_hash():
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _stub_arguments(args):
+    """Signature of a function, default values are replaced by None so the stub does not need any import"""
+    if args.args is None:
+        return "*args, **kwargs"
+    parts = []
+    positional = (args.posonlyargs or []) + args.args
+    first_default = len(positional) - len(args.defaults)
+    for i, arg in enumerate(positional):
+        parts.append(arg.name + ("=None" if i >= first_default else ""))
+        if args.posonlyargs and i == len(args.posonlyargs) - 1:
+            parts.append("/")
+    if args.vararg:
+        parts.append(f"*{args.vararg}")
+    elif args.kwonlyargs:
+        parts.append("*")
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        parts.append(arg.name + ("" if default is None else "=None"))
+    if args.kwarg:
+        parts.append(f"**{args.kwarg}")
+    return ", ".join(parts)
+
+
+def _function_alias(node):
+    """Resolve class attributes like 'clear = header_only' to the function they alias"""
+    if isinstance(node, astroid.AssignName) and isinstance(node.parent, astroid.Assign) \
+            and isinstance(node.parent.value, astroid.Name):
+        try:
+            inferred = next(node.parent.value.infer())
+        except astroid.InferenceError:
+            return node
+        if isinstance(inferred, astroid.FunctionDef):
+            return inferred
+    return node
+
+
+def _stub_class(name, classdef):
+    """Flatten a class and its non standard library ancestors into a stub definition"""
+    bases = []
+    members = {}
+    for cls in [classdef] + list(classdef.ancestors()):
+        if cls.root().name in ("builtins", "collections"):
+            if not bases and cls.name != "object":
+                bases.append(cls.name)
+            continue
+        for member, nodes in list(cls.locals.items()) + list(cls.instance_attrs.items()):
+            if isinstance(nodes[0], astroid.FunctionDef) or not member.startswith("__"):
+                members.setdefault(member, nodes[0])
+
+    lines = [f"class {name}({bases[0] if bases else 'object'}):"]
+    for member, node in sorted(members.items()):
+        node = _function_alias(node)
+        if isinstance(node, astroid.FunctionDef):
+            if node.type in ("staticmethod", "classmethod"):
+                lines.append(f"    @{node.type}")
+            elif "builtins.property" in node.decoratornames():
+                lines.append("    @property")
+            lines.append(f"    def {member}({_stub_arguments(node.args)}):")
+            lines.append("        pass")
+        else:
+            lines.append(f"    {member} = None")
+    if len(lines) == 1:
+        lines.append("    pass")
+    return "\n".join(lines) + "\n"
+
+
+def _generate_stub(version):
+    sections = [_STUB_HEADER.format(version=version)]
+    for name, (module, class_name) in _STUB_CLASSES.items():
+        classdef = astroid.MANAGER.ast_from_module_name(module).lookup(class_name)[1][0]
+        sections.append(_stub_class(name, classdef))
+    sections.append("".join(f"{field} = {t}()\n" for field, types in _DYNAMIC_FIELDS.items() for t in types))
+    return "\n\n".join(sections)
+
+
+@functools.lru_cache(maxsize=None)
+def _conanfile_stub():
+    """Module with the classes of the dynamic fields, built from Conan sources only once per Conan version and
+    version of this plugin"""
+    from conans import __version__ as conan_version
+
+    cache_path = os.path.join(_cache_folder(), f"conanfile_stub_{_plugin_hash()[:16]}_{conan_version}.py")
+    if os.path.isfile(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            source = f.read()
+    else:
+        source = _generate_stub(conan_version)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(source)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # A read-only cache only costs regenerating the stub next time
+    return AstroidBuilder(AstroidManager()).string_build(source, modname="conanfile_stub")
+
+
 def transform_conanfile(node):
     """Transform definition of ConanFile class so dynamic fields are visible to pylint"""
 
-    str_class = astroid.builtin_lookup("str")
-    dict_class = astroid.builtin_lookup("dict")
-    info_class = astroid.MANAGER.ast_from_module_name("conans.model.info").lookup(
-        "ConanInfo")
-    build_requires_class = astroid.MANAGER.ast_from_module_name(
-        "conans.client.graph.graph_manager").lookup("_RecipeBuildRequires")
-    file_copier_class = astroid.MANAGER.ast_from_module_name(
-        "conans.client.file_copier").lookup("FileCopier")
-    file_importer_class = astroid.MANAGER.ast_from_module_name(
-        "conans.client.importer").lookup("_FileImporter")
-    python_requires_class = astroid.MANAGER.ast_from_module_name(
-        "conans.client.graph.python_requires").lookup("PyRequires")
-
-    dynamic_fields = {
-        "conan_data": str_class,
-        "build_requires": build_requires_class,
-        "test_requires" : build_requires_class,
-        "tool_requires": build_requires_class,
-        "info_build": info_class,
-        "user_info_build": [_user_info_build_transform()],
-        "info": info_class,
-        "copy": file_copier_class,
-        "copy_deps": file_importer_class,
-        "python_requires": [str_class, python_requires_class],
-        "recipe_folder": str_class,
-        "settings_build": [_settings_transform()],
-        "settings_target": [_settings_transform()],
-        "conf": dict_class,
-    }
-    
-    for f, t in dynamic_fields.items():
-        node.locals[f] = [i for i in t]
+    stub = _conanfile_stub()
+    for field in _DYNAMIC_FIELDS:
+        node.locals[field] = stub.locals[field]
 
 
 astroid.MANAGER.register_transform(
@@ -7,3 +7,27 @@ def file_path(a_string):
     if not isfile(a_string):
         raise argparse.ArgumentTypeError(f"{a_string} does not point to a file")
     return a_string
+
+
+def file_or_dir_path(a_string):
+    from os.path import isfile, isdir
+
+    if not isfile(a_string) and not isdir(a_string):
+        raise argparse.ArgumentTypeError(f"{a_string} does not point to a file or a directory")
+    return a_string
+
+
+def collect_files(paths, filename):
+    """Expand directories in paths to every file named filename found below them"""
+    import os
+
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            if filename in names:
+                files.append(os.path.join(root, filename))
+    return files
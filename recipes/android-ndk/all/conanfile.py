@@ -1,10 +1,12 @@
 from conan import ConanFile, conan_version
-from conan.errors import ConanInvalidConfiguration
-from conan.tools.files import get, download, unzip, load, copy, rm
+from conan.errors import ConanException, ConanInvalidConfiguration
+from conan.tools.files import get, download, copy, rm
 from conan.tools.layout import basic_layout
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
 import shutil
+import zipfile
 
 required_conan_version = ">=1.52.0"
 
@@ -80,7 +82,10 @@ class AndroidNDKConan(ConanFile):
         copy(self, "cmake-wrapper.cmd", src=os.path.join(self.source_folder, os.pardir), dst=os.path.join(self.package_folder, "bin"))
         copy(self, "cmake-wrapper", src=os.path.join(self.source_folder, os.pardir), dst=os.path.join(self.package_folder, "bin"))
         self._fix_broken_links()
-        self._fix_permissions()
+        if self._ndk_version_major < 23:
+            # Newer NDKs are extracted by _unzip_fix_symlinks(), which already sets the executable bits
+            self._fix_permissions()
+        self._chmod_plus_x(os.path.join(self.package_folder, "bin", "cmake-wrapper"))
         # Remove module and config CMake files, see https://github.com/conan-io/conan-center-index/blob/master/docs/error_knowledge_base.md#kb-h016-cmake-modules-config-files
         rm(self, "*Config.cmake", os.path.join(self.package_folder, "bin"), recursive=True)
         rm(self, "*-config.cmake", os.path.join(self.package_folder, "bin"), recursive=True)
@@ -143,34 +148,42 @@ class AndroidNDKConan(ConanFile):
     def _ndk_version_minor(self):
         return self._ndk_major_minor[1]
 
+    @staticmethod
+    def _executable_kind(sig):
+        """Kind of executable identified by the first 4 bytes of a file, None if it is not one"""
+        if len(sig) > 2 and sig[:2] == b"#!":
+            return "script"
+        if sig == b"\x7fELF":
+            return "ELF"
+        if sig in (
+            b"\xca\xfe\xba\xbe",
+            b"\xbe\xba\xfe\xca",
+            b"\xfe\xed\xfa\xcf",
+            b"\xcf\xfa\xed\xfe",
+            b"\xfe\xef\xfa\xce",
+            b"\xce\xfa\xed\xfe"
+        ):
+            return "Mach-O"
+        return None
+
     def _fix_permissions(self):
         if os.name != "posix":
             return
+
+        def executable_kind(filename):
+            with open(filename, "rb") as f:
+                return self._executable_kind(f.read(4))
+
+        filenames = []
         for root, _, files in os.walk(os.path.join(self.package_folder, "bin")):
-            for filename in files:
-                filename = os.path.join(root, filename)
-                with open(filename, "rb") as f:
-                    sig = f.read(4)
-                    if isinstance(sig, str):
-                        sig = [ord(s) for s in sig]
-                    else:
-                        sig = list(sig)
-                    if len(sig) > 2 and sig[0] == 0x23 and sig[1] == 0x21:
-                        self.output.info(f"chmod on script file: '{filename}'")
-                        self._chmod_plus_x(filename)
-                    elif sig == [0x7F, 0x45, 0x4C, 0x46]:
-                        self.output.info(f"chmod on ELF file: '{filename}'")
-                        self._chmod_plus_x(filename)
-                    elif sig in (
-                        [0xCA, 0xFE, 0xBA, 0xBE],
-                        [0xBE, 0xBA, 0xFE, 0xCA],
-                        [0xFE, 0xED, 0xFA, 0xCF],
-                        [0xCF, 0xFA, 0xED, 0xFE],
-                        [0xFE, 0xEF, 0xFA, 0xCE],
-                        [0xCE, 0xFA, 0xED, 0xFE]
-                    ):
-                        self.output.info(f"chmod on Mach-O file: '{filename}'")
-                        self._chmod_plus_x(filename)
+            filenames.extend(os.path.join(root, filename) for filename in files
+                             if not os.path.islink(os.path.join(root, filename)))
+        # Reading the signatures is I/O bound, threads hide most of its latency on large trees
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            for filename, kind in zip(filenames, executor.map(executable_kind, filenames, chunksize=64)):
+                if kind:
+                    self.output.info(f"chmod on {kind} file: '{filename}'")
+                    self._chmod_plus_x(filename)
 
     def _fix_broken_links(self):
         # https://github.com/android/ndk/issues/1671
@@ -373,34 +386,59 @@ class AndroidNDKConan(ConanFile):
     def _unzip_fix_symlinks(self, url, target_folder, sha256):
         # Python's built-in module 'zipfile' won't handle symlinks (https://bugs.python.org/issue37921)
         # Most of the logic borrowed from this PR https://github.com/conan-io/conan/pull/8100
+        # Members are extracted in a single pass: symlinks are created as such, and regular files get
+        # the executable bit from their unix mode in the archive or from their magic bytes.
 
         filename = "android_sdk.zip"
         download(self, url, filename, sha256=sha256)
-        unzip(self, filename, destination=target_folder, strip_root=True)
 
         def is_symlink_zipinfo(zi):
             return (zi.external_attr >> 28) == 0xA
 
-        full_path = os.path.normpath(target_folder)
-        import zipfile
+        full_path = os.path.normpath(os.path.abspath(target_folder))
+        created_folders = set()
+        deferred_copies = []
         with zipfile.ZipFile(filename, "r") as z:
             zip_info = z.infolist()
 
             names = [n.replace("\\", "/") for n in z.namelist()]
             common_folder = os.path.commonprefix(names).split("/", 1)[0]
-
-            for file_ in zip_info:
-                if is_symlink_zipinfo(file_):
-                    rel_path = os.path.relpath(file_.filename, common_folder)
-                    full_name = os.path.join(full_path, rel_path)
-                    target = load(self, full_name)
+            prefix = common_folder + "/"
+
+            for file_, name in zip(zip_info, names):
+                rel_path = name[len(prefix):] if name.startswith(prefix) else name
+                full_name = os.path.normpath(os.path.join(full_path, rel_path))
+                if full_name != full_path and not full_name.startswith(full_path + os.sep):
+                    raise ConanException(f"Refusing to extract '{file_.filename}' outside of '{target_folder}'")
+                folder = full_name if file_.is_dir() or full_name == full_path else os.path.dirname(full_name)
+                if folder not in created_folders:
+                    os.makedirs(folder, exist_ok=True)
+                    created_folders.add(folder)
+                if folder == full_name:
+                    continue
+                if os.path.lexists(full_name):
                     os.unlink(full_name)
 
+                if is_symlink_zipinfo(file_):
+                    target = z.read(file_).decode("utf-8")
                     try:
                         os.symlink(target, full_name)
                     except OSError:
-                        if not os.path.isabs(target):
-                            target = os.path.normpath(os.path.join(os.path.dirname(full_name), target))
-                        shutil.copy2(target, full_name)
+                        # The target may not be extracted yet, copy it at the end
+                        deferred_copies.append((target, full_name))
+                    continue
+
+                with z.open(file_) as src, open(full_name, "wb") as dst:
+                    head = src.read(64 * 1024)
+                    dst.write(head)
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                unix_mode = file_.external_attr >> 16 if file_.create_system == 3 else 0
+                if unix_mode & 0o111 or self._executable_kind(head[:4]):
+                    self._chmod_plus_x(full_name)
+
+        for target, full_name in deferred_copies:
+            if not os.path.isabs(target):
+                target = os.path.normpath(os.path.join(os.path.dirname(full_name), target))
+            shutil.copy2(target, full_name)
 
         os.unlink(filename)
@@ -444,17 +444,31 @@ class AwsSdkCppConan(ConanFile):
 
     short_paths = True
 
+    # These modules and dependencies come from https://github.com/aws/aws-sdk-cpp/blob/1.11.352/cmake/sdksCommon.cmake#L147 and below
+    _INTERNAL_REQUIREMENTS = {
+        "access-management": ["iam", "cognito-identity"],
+        "identity-management": ["cognito-identity", "sts"],
+        "queues": ["sqs"],
+        "s3-encryption": ["s3", "kms"],
+        "text-to-speech": ["polly"],
+        "transfer": ["s3"],
+    }
+
+    # version: names of the sdks available in that version, filled from _sdks once per process
+    _sdks_by_version = {}
+    _cached_enabled_sdks = None
+
     @property
     def _internal_requirements(self):
-        # These modules and dependencies come from https://github.com/aws/aws-sdk-cpp/blob/1.11.352/cmake/sdksCommon.cmake#L147 and below
-        return {
-            "access-management": ["iam", "cognito-identity"],
-            "identity-management": ["cognito-identity", "sts"],
-            "queues": ["sqs"],
-            "s3-encryption": ["s3", "kms"],
-            "text-to-speech": ["polly"],
-            "transfer": ["s3"],
-        }
+        return self._INTERNAL_REQUIREMENTS
+
+    @property
+    def _version_sdks(self):
+        version = str(self.version)
+        if version not in self._sdks_by_version:
+            self._sdks_by_version[version] = tuple(sdk_name for sdk_name, sdk_versions in self._sdks
+                                                   if version in sdk_versions)
+        return self._sdks_by_version[version]
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -468,8 +482,9 @@ class AwsSdkCppConan(ConanFile):
             setattr(self.options, module, True)
 
         # Remove all sdk options not belonging to the current version
-        for sdk_name, sdk_versions in self._sdks:
-            if self.version not in sdk_versions:
+        version_sdks = set(self._version_sdks)
+        for sdk_name, _ in self._sdks:
+            if sdk_name not in version_sdks:
                 self.options.rm_safe(sdk_name)
 
     def configure(self):
@@ -489,10 +504,10 @@ class AwsSdkCppConan(ConanFile):
         # - Otherwise set it to False
         # This way there are no None options past this method, and we can control default values
         # of the dependencies of the main modules but still give the user control over them
-        for sdk_name, sdk_versions in self._sdks:
+        for sdk_name in self._version_sdks:
             # == None is true for both "was deleted" and "was not set by the user",
             # ensure we only try to set the value to false for the latter
-            if self.version in sdk_versions and self.options.get_safe(sdk_name) == None:
+            if self.options.get_safe(sdk_name) == None:
                 setattr(self.options, sdk_name, False)
 
     def layout(self):
@@ -582,9 +597,13 @@ class AwsSdkCppConan(ConanFile):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
 
     def _enabled_sdks(self):
-        for sdk in self._sdks:
-            if self.options.get_safe(sdk[0]):
-                yield sdk
+        # Options are final once configure() has run, so they are only looked up once,
+        # in a single pass instead of one get_safe() per sdk
+        if self._cached_enabled_sdks is None:
+            enabled_options = {name for name, value in self.options.items() if str(value) == "True"}
+            self._cached_enabled_sdks = tuple(sdk_name for sdk_name in self._version_sdks
+                                              if sdk_name in enabled_options)
+        return self._cached_enabled_sdks
 
     def generate(self):
         tc = CMakeToolchain(self)
@@ -592,8 +611,7 @@ class AwsSdkCppConan(ConanFile):
         # therefore we must use cache_variables
 
         build_only = ["core"]
-        for sdk_name, _ in self._enabled_sdks():
-            build_only.append(sdk_name)
+        build_only.extend(self._enabled_sdks())
         tc.cache_variables["BUILD_ONLY"] = ";".join(build_only)
 
         tc.cache_variables["ENABLE_UNITY_BUILD"] = True
@@ -715,7 +733,7 @@ class AwsSdkCppConan(ConanFile):
                 "aws-c-sdkutils::aws-c-sdkutils",
             ])
 
-        for sdk, _ in self._enabled_sdks():
+        for sdk in self._enabled_sdks():
             # TODO: there is no way to properly emulate COMPONENTS names for
             #       find_package(AWSSDK COMPONENTS <sdk>) in set_property()
             #       right now: see https://github.com/conan-io/conan/issues/10258
@@ -155,6 +155,7 @@ class BoostConan(ConanFile):
     short_paths = True
     no_copy_source = True
     _cached_dependencies = None
+    _cached_dependency_closures = None
 
     def export(self):
         copy(self, f"dependencies/{self._dependency_filename}", src=self.recipe_folder, dst=self.export_folder)
@@ -342,31 +343,36 @@ class BoostConan(ConanFile):
                 self._cached_dependencies = yaml.safe_load(f)
         return self._cached_dependencies
 
+    @property
+    def _dependency_closures(self):
+        """Transitive dependencies and transitive dependents of every module, both including the module itself"""
+        if self._cached_dependency_closures is None:
+            dependencies = self._dependencies["dependencies"]
+            dependent_modules = {}
+            for module in dependencies:
+                closure = {module}
+                stack = [module]
+                while stack:
+                    for dependency in dependencies.get(stack.pop(), []):
+                        if dependency not in closure:
+                            closure.add(dependency)
+                            stack.append(dependency)
+                dependent_modules[module] = closure
+            super_modules = {}
+            for module, closure in dependent_modules.items():
+                for dependency in closure:
+                    super_modules.setdefault(dependency, {dependency}).add(module)
+            self._cached_dependency_closures = (
+                {module: frozenset(closure) for module, closure in dependent_modules.items()},
+                {module: frozenset(closure) for module, closure in super_modules.items()},
+            )
+        return self._cached_dependency_closures
+
     def _all_dependent_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set()
-            for dependency in dependencies:
-                new_dependencies.update(set(self._dependencies["dependencies"][dependency]))
-                new_dependencies.update(dependencies)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        return self._dependency_closures[0].get(name, frozenset([name]))
 
     def _all_super_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set(dependencies)
-            for module in self._dependencies["dependencies"]:
-                if dependencies.intersection(set(self._dependencies["dependencies"][module])):
-                    new_dependencies.add(module)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        return self._dependency_closures[1].get(name, frozenset([name]))
 
     @property
     def _bcp_dir(self):
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
 import dataclasses
+import hashlib
 import json
 import logging
 import pprint
@@ -9,7 +11,7 @@ import re
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 from conan.tools.files import chdir
@@ -106,18 +108,20 @@ class BoostDependencies(object):
 
 
 class BoostDependencyBuilder(object):
-    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool):
+    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool,
+                 boost_path: Optional[Path] = None, boostdep: Optional[Path] = None):
         self.boost_version = boost_version
         self.boostdep_version = boostdep_version
         self.git_url = git_url
         self.tmppath = tmppath
         self.outputdir = outputdir
         self.unsafe = unsafe
-        self._boostdep = None
+        self._boost_path = boost_path
+        self._boostdep = boostdep
 
     @property
     def boost_path(self) -> Path:
-        return self.tmppath / "boost"
+        return self._boost_path or self.tmppath / "boost"
 
     def do_git_update(self) -> None:
         if not self.boost_path.exists():
@@ -389,7 +393,7 @@ class BoostDependencyBuilder(object):
         return boost_dependencies
 
     @property
-    def _outputpath(self) -> Path:
+    def outputpath(self) -> Path:
         return self.outputdir / f"dependencies-{self.boost_version}.yml"
 
     @classmethod
@@ -420,10 +424,156 @@ class BoostDependencyBuilder(object):
         data = self._sort_item(data)
 
         print(f"Creating {self.outputdir}")
-        with self._outputpath.open("w") as fout:
+        with self.outputpath.open("w") as fout:
             yaml.dump(data, fout)
 
 
+class BoostMirror(object):
+    """
+    Bare mirror of the boost super-project and of its submodules, shared by one git worktree per boost version.
+    Used to collect the dependencies of several versions in parallel without cloning boost once per version.
+    """
+
+    def __init__(self, tmppath: Path, git_url: str):
+        self.path = tmppath / "boost-mirror"
+        self.git_url = git_url
+        self._fetched = set()
+
+    @property
+    def superproject(self) -> Path:
+        return self.path / "boost.git"
+
+    @property
+    def _stamps_path(self) -> Path:
+        return self.path / "stamps.json"
+
+    def worktree(self, boost_version: str) -> Path:
+        return self.path / "worktrees" / boost_version
+
+    def _submodule_mirror(self, name: str) -> Path:
+        return self.path / "modules" / f"{name}.git"
+
+    def _mirror(self, url: str, path: Path, update: bool) -> None:
+        if not path.exists():
+            print(f"Mirroring {url}")
+            subprocess.check_call(["git", "clone", "--mirror", "--quiet", "--", url, str(path)])
+        elif update and path not in self._fetched:
+            subprocess.check_call(["git", "--git-dir", str(path), "fetch", "--prune", "--quiet", "origin"])
+        self._fetched.add(path)
+
+    def update(self, update: bool) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._mirror(self.git_url, self.superproject, update)
+
+    def tag_hash(self, boost_version: str) -> str:
+        return subprocess.check_output(["git", "--git-dir", str(self.superproject), "rev-parse", f"boost-{boost_version}^{{commit}}"],
+                                       text=True).strip()
+
+    def checkout(self, boost_version: str, update: bool) -> Path:
+        """Create the worktree of a boost version, with its submodules cloned from the local mirrors"""
+        worktree = self.worktree(boost_version)
+        if worktree.exists():
+            subprocess.check_call(["git", "--git-dir", str(self.superproject), "worktree", "remove", "--force", str(worktree)])
+        subprocess.check_call(["git", "--git-dir", str(self.superproject), "worktree", "prune"])
+        subprocess.check_call(["git", "--git-dir", str(self.superproject), "worktree", "add", "--detach", "--force",
+                               str(worktree), f"boost-{boost_version}"])
+        subprocess.check_call(["git", "submodule", "init"], cwd=worktree)
+        urls = subprocess.check_output(["git", "config", "--get-regexp", r"^submodule\..*\.url$"], cwd=worktree, text=True)
+        for line in urls.splitlines():
+            key, url = line.split(maxsplit=1)
+            mirror = self._submodule_mirror(key[len("submodule."):-len(".url")])
+            if url != mirror.resolve().as_uri():
+                self._mirror(url, mirror, update)
+                subprocess.check_call(["git", "config", key, mirror.resolve().as_uri()], cwd=worktree)
+            elif update:
+                self._mirror(url, mirror, update)
+        subprocess.check_call(["git", "-c", "protocol.file.allow=always", "submodule", "update", "--quiet"], cwd=worktree)
+        return worktree
+
+    def load_stamps(self) -> Dict[str, Dict[str, str]]:
+        if self._stamps_path.is_file():
+            return json.loads(self._stamps_path.read_text())
+        return {}
+
+    def save_stamps(self, stamps: Dict[str, Dict[str, str]]) -> None:
+        self._stamps_path.write_text(json.dumps(stamps, indent=2, sort_keys=True))
+
+
+def _file_hash(path: Path) -> Optional[str]:
+    if not path.is_file():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _create_dependency_file(kwargs) -> str:
+    boost_collector = BoostDependencyBuilder(**kwargs)
+    boost_collector.do_create_dependency_file()
+    return boost_collector.boost_version
+
+
+def main_parallel(ns, boost_versions: List[str]) -> int:
+    """Collect the dependencies of several boost versions concurrently, from worktrees of a shared mirror"""
+    mirror = BoostMirror(tmppath=ns.tmppath, git_url=ns.git_url)
+    if not ns.git_update and not mirror.superproject.exists():
+        log.error("Boost mirror does not exist. Re-execute this script with -U to run 'git update'.")
+        return 1
+    mirror.update(ns.git_update)
+
+    script_hash = _file_hash(Path(__file__))
+    stamps = mirror.load_stamps()
+    tasks = {}
+    for boost_version in boost_versions:
+        stamp = {
+            "tag": mirror.tag_hash(boost_version),
+            "script": script_hash,
+            "boostdep": ns.boostdep_version,
+            "unsafe": str(ns.unsafe),
+        }
+        outputpath = ns.outputdir / f"dependencies-{boost_version}.yml"
+        previous = stamps.get(boost_version, {})
+        if {k: previous.get(k) for k in stamp} == stamp and previous.get("output") == _file_hash(outputpath):
+            print(f"{outputpath} is up to date with tag boost-{boost_version} ({stamp['tag']}), skipping")
+            continue
+        print(f"Preparing worktree of {boost_version}")
+        tasks[boost_version] = (stamp, outputpath, mirror.checkout(boost_version, ns.git_update))
+
+    if not tasks:
+        return 0
+
+    # boostdep does not depend on the version being analyzed: install it once for all of them
+    boostdep_installer = BoostDependencyBuilder(boost_version=None, boostdep_version=ns.boostdep_version, git_url=ns.git_url,
+                                                outputdir=ns.outputdir, tmppath=ns.tmppath, unsafe=ns.unsafe,
+                                                boost_path=next(iter(tasks.values()))[2])
+    boostdep_installer.do_install_boostdep()
+
+    failed = False
+    with concurrent.futures.ProcessPoolExecutor(max_workers=ns.jobs) as executor:
+        futures = {
+            executor.submit(_create_dependency_file, dict(
+                boost_version=boost_version,
+                boostdep_version=ns.boostdep_version,
+                git_url=ns.git_url,
+                outputdir=ns.outputdir,
+                tmppath=ns.tmppath,
+                unsafe=ns.unsafe,
+                boost_path=worktree,
+                boostdep=boostdep_installer._boostdep,
+            )): boost_version for boost_version, (_, _, worktree) in tasks.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            boost_version = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                log.error("Collecting dependencies of %s failed: %s", boost_version, e)
+                failed = True
+                continue
+            stamp, outputpath, _ = tasks[boost_version]
+            stamps[boost_version] = dict(stamp, output=_file_hash(outputpath))
+            mirror.save_stamps(stamps)
+    return 1 if failed else 0
+
+
 def main(args=None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--verbose", dest="verbose", action="store_true", help="verbose output")
@@ -433,9 +583,11 @@ def main(args=None) -> int:
     parser.add_argument("-U", dest="git_update", action="store_true", help="update the git repo")
     parser.add_argument("-o", dest="outputdir", default=None, type=Path, help="output dependency dir")
     parser.add_argument("-x", dest="unsafe", action="store_true", help="unsafe fast(er) operation")
+    parser.add_argument("-j", dest="jobs", type=int, default=None,
+                        help="collect the versions in parallel, using a shared git mirror with a worktree per version")
 
     version_group = parser.add_mutually_exclusive_group(required=True)
-    version_group.add_argument("-v", dest="boost_version", help="boost version")
+    version_group.add_argument("-v", dest="boost_version", nargs="+", help="boost version(s)")
     version_group.add_argument("-A", dest="boost_version", action="store_const", const=None, help="All boost versions")
     ns = parser.parse_args(args)
 
@@ -458,7 +610,10 @@ def main(args=None) -> int:
         conan_data = yaml.safe_load(Path("conandata.yml").open())
         boost_versions = list(conan_data["sources"].keys())
     else:
-        boost_versions = [ns.boost_version]
+        boost_versions = ns.boost_version
+
+    if ns.jobs:
+        return main_parallel(ns, boost_versions)
 
     for boost_version in boost_versions:
         print(f"Starting {boost_version}")
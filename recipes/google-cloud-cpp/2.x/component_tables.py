@@ -0,0 +1,134 @@
+"""Compact storage for the google-cloud-cpp component tables.
+
+`extract_dependencies.py` generates, for each version of `google-cloud-cpp`,
+the list of GA components, the list of `*_protos` components and the
+dependencies of each `*_protos` component. Most of that information is shared
+between versions, and most `*_protos` components have one of a few dependency
+lists. All versions are kept in a single JSON file where:
+
+- `dependency_sets` is the list of distinct dependency lists, components refer
+  to them by index.
+- `versions` stores each version as a delta against its `base` (the previous
+  version), the first version is a delta against empty tables.
+
+The recipe only rebuilds the tables of the version it needs.
+"""
+
+import json
+
+FORMAT = 1
+
+
+def _empty_tables():
+    return {"components": set(), "proto_components": set(), "dependencies": {}}
+
+
+def _version_key(version):
+    return tuple(int(part) if part.isdigit() else part for part in version.split("."))
+
+
+def _decode(data, version):
+    entry = data["versions"][version]
+    tables = _decode(data, entry["base"]) if "base" in entry else _empty_tables()
+    for name in ("components", "proto_components"):
+        delta = entry.get(name, {})
+        tables[name].difference_update(delta.get("remove", []))
+        tables[name].update(delta.get("add", []))
+    dependency_sets = data["dependency_sets"]
+    delta = entry.get("dependencies", {})
+    for component in delta.get("remove", []):
+        del tables["dependencies"][component]
+    for component, index in delta.get("set", {}).items():
+        tables["dependencies"][component] = dependency_sets[index]
+    return tables
+
+
+def _encode(all_tables):
+    dependency_sets = []
+    set_index = {}
+    versions = {}
+    previous_version = None
+    previous = _empty_tables()
+    for version in sorted(all_tables, key=_version_key):
+        tables = all_tables[version]
+        entry = {} if previous_version is None else {"base": previous_version}
+        for name in ("components", "proto_components"):
+            delta = {}
+            added = sorted(set(tables[name]) - previous[name])
+            removed = sorted(previous[name] - set(tables[name]))
+            if added:
+                delta["add"] = added
+            if removed:
+                delta["remove"] = removed
+            if delta:
+                entry[name] = delta
+        changed = {}
+        for component in sorted(tables["dependencies"]):
+            deps = tuple(tables["dependencies"][component])
+            if previous["dependencies"].get(component) != deps:
+                if deps not in set_index:
+                    set_index[deps] = len(dependency_sets)
+                    dependency_sets.append(list(deps))
+                changed[component] = set_index[deps]
+        removed = sorted(set(previous["dependencies"]) - set(tables["dependencies"]))
+        delta = {}
+        if changed:
+            delta["set"] = changed
+        if removed:
+            delta["remove"] = removed
+        if delta:
+            entry["dependencies"] = delta
+        versions[version] = entry
+        previous_version = version
+        previous = {
+            "components": set(tables["components"]),
+            "proto_components": set(tables["proto_components"]),
+            "dependencies": {k: tuple(v) for k, v in tables["dependencies"].items()},
+        }
+    return {"format": FORMAT, "dependency_sets": dependency_sets, "versions": versions}
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT:
+        raise ValueError(f"{path} uses format {data.get('format')}, expected {FORMAT}")
+    return data
+
+
+def versions(path):
+    """Versions with component tables in the file"""
+    return sorted(_read(path)["versions"], key=_version_key)
+
+
+def load(path, version):
+    """Component tables of a single version, None if the version is not in the file.
+
+    Components with the same dependencies share the same list, callers must not modify them.
+    """
+    data = _read(path)
+    if version not in data["versions"]:
+        return None
+    return _decode(data, version)
+
+
+def load_all(path):
+    """Component tables of every version in the file"""
+    data = _read(path)
+    return {version: _decode(data, version) for version in data["versions"]}
+
+
+def save(path, all_tables):
+    """Write the component tables of all versions, one dependency set or version delta per line"""
+    data = _encode(all_tables)
+    lines = ["{", f'  "format": {data["format"]},', '  "dependency_sets": [']
+    lines.append(",\n".join(f"    {json.dumps(deps)}" for deps in data["dependency_sets"]))
+    lines.extend(["  ],", '  "versions": {'])
+    entries = []
+    for version, entry in data["versions"].items():
+        fields = ",\n".join(f"      {json.dumps(key)}: {json.dumps(value)}" for key, value in entry.items())
+        entries.append(f"    {json.dumps(version)}: {{\n{fields}\n    }}")
+    lines.append(",\n".join(entries))
+    lines.extend(["  }", "}"])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
@@ -16,12 +16,10 @@ from conan.errors import ConanInvalidConfiguration
 # information is error prone and fairly tedious. A helper script in this
 # directory reproduces the algorithms used by `google-cloud-cpp` to generate its
 # dependency information. With each new revision of `google-cloud-cpp` the
-# script will be used to generate a new file with the component dependency
-# information. The expectation is that maintaining this script will be easier
-# than writing long lists of dependencies by hand.
-import components_2_15_1
-import components_2_19_0
-import components_2_28_0
+# script will be used to add the component dependency information of that
+# version to `components.json`. The expectation is that maintaining this script
+# will be easier than writing long lists of dependencies by hand.
+import component_tables
 
 required_conan_version = ">=1.56.0"
 
@@ -45,33 +43,27 @@ class GoogleCloudCppConan(ConanFile):
     settings = "os", "arch", "compiler", "build_type"
     options = {"shared": [True, False], "fPIC": [True, False]}
     default_options = {"shared": False, "fPIC": True}
-    exports = ["components_2_15_1.py",
-               "components_2_19_0.py",
-               "components_2_28_0.py",
-               ]
+    exports = ["component_tables.py", "components.json"]
 
     short_paths = True
 
-    _GA_COMPONENTS = {
-        '2.15.1': components_2_15_1.COMPONENTS,
-        '2.19.0': components_2_19_0.COMPONENTS,
-        '2.28.0': components_2_28_0.COMPONENTS,
-    }
-    _PROTO_COMPONENTS = {
-        '2.15.1': components_2_15_1.PROTO_COMPONENTS,
-        '2.19.0': components_2_19_0.PROTO_COMPONENTS,
-        '2.28.0': components_2_28_0.PROTO_COMPONENTS,
-    }
-    _PROTO_COMPONENT_DEPENDENCIES = {
-        "2.15.1": components_2_15_1.DEPENDENCIES,
-        "2.19.0": components_2_19_0.DEPENDENCIES,
-        "2.28.0": components_2_28_0.DEPENDENCIES,
-    }
+    _cached_component_tables = None
     # Some components require custom dependency definitions.
     _REQUIRES_CUSTOM_DEPENDENCIES = {
         "bigquery", "bigtable", "iam", "oauth2", "pubsub", "spanner", "storage",
     }
 
+    @property
+    def _components_file(self):
+        return os.path.join(self.recipe_folder, "components.json")
+
+    @property
+    def _component_tables(self):
+        # Only the tables of this version are loaded, and only when needed
+        if self._cached_component_tables is None:
+            self._cached_component_tables = component_tables.load(self._components_file, str(self.version))
+        return self._cached_component_tables
+
     @property
     def _is_legacy_one_profile(self):
         return not hasattr(self, "settings_build")
@@ -103,20 +95,9 @@ class GoogleCloudCppConan(ConanFile):
                 "Recipe not prepared for cross-building (yet)"
             )
 
-        if str(self.version) not in self._GA_COMPONENTS:
-            print(f"{type(self.version)} {self.version}")
-            raise ConanInvalidConfiguration(
-                f"The components are unknown for version {self.version}. Expected one of {self._GA_COMPONENTS.keys()}"
-            )
-
-        if str(self.version) not in self._PROTO_COMPONENTS:
-            raise ConanInvalidConfiguration(
-                f"The proto components are unknown for version {self.version}. Expected one of {self._PROTO_COMPONENTS.keys()}"
-            )
-
-        if str(self.version) not in self._PROTO_COMPONENT_DEPENDENCIES:
+        if self._component_tables is None:
             raise ConanInvalidConfiguration(
-                f"The inter-component components are unknown for version {self.version}. Expected one of {self._PROTO_COMPONENT_DEPENDENCIES.keys()}"
+                f"The components are unknown for version {self.version}. Expected one of {component_tables.versions(self._components_file)}"
             )
 
         if (
@@ -198,8 +179,7 @@ class GoogleCloudCppConan(ConanFile):
         cmake.build()
 
     def _generate_proto_requires(self, component):
-        deps = self._PROTO_COMPONENT_DEPENDENCIES.get(self.version, dict())
-        return deps.get(component, [])
+        return list(self._component_tables["dependencies"].get(component, []))
 
     _SKIPPED_COMPONENTS = {
         # Some protos do not compile due to inconvenient system macros clashing
@@ -213,7 +193,7 @@ class GoogleCloudCppConan(ConanFile):
     }
 
     def _components(self):
-        result = self._GA_COMPONENTS.get(str(self.version), []).copy()
+        result = self._component_tables["components"].copy()
         for c in self._SKIPPED_COMPONENTS:
             result.remove(c)
         # TODO - these do not build on Android due to conflicts between OS
@@ -226,7 +206,7 @@ class GoogleCloudCppConan(ConanFile):
         return result
 
     def _proto_components(self):
-        result = self._PROTO_COMPONENTS.get(self.version, []).copy()
+        result = self._component_tables["proto_components"].copy()
         for c in self._SKIPPED_COMPONENTS:
             result.remove(c + '_protos')
         # TODO - these do not build on Android due to conflicts between OS
@@ -236,8 +216,8 @@ class GoogleCloudCppConan(ConanFile):
             result.remove('talent_protos')
         if Version(self.version) <= '2.19.0':
             # Handling of these proto libraries was simplified in the 2.28.0
-            # `conanfile.py`. We prefer not to regenerate the old
-            # `components_*.py` files, so we manually skip the protos in here.
+            # `conanfile.py`. We prefer not to regenerate the tables of the old
+            # versions, so we manually skip the protos in here.
             result.remove('logging_type_type_protos')
             result.remove('devtools_source_v1_source_context_protos')
         if self.settings.os == "Windows" and Version(self.version) >= '2.28.0':
@@ -4,6 +4,8 @@ import argparse
 import glob
 import os
 
+import component_tables
+
 """Extract google-cloud-cpp's component dependency info for use in Conan.
 
 google-cloud-cpp builds a number (about 100) of libraries from proto files.
@@ -229,19 +231,10 @@ def _generate_proto_requires(depfile):
     return list(_PROTO_DEPS_COMMON_REQUIRES) + requires
 
 
-def main():
-    """Generate a python file representing the google-cloud-cpp proto deps."""
-    parser = argparse.ArgumentParser(description=(__doc__))
-    parser.add_argument(
-        "-s",
-        "--source-folder",
-        help="a directory where `google-cloud-cpp` source has been extracted",
-    )
-    args = parser.parse_args()
-    source_folder = vars(args)["source_folder"]
+def _tables(source_folder):
+    """Compute the component tables of the `google-cloud-cpp` sources in `source_folder`."""
     deps_folder = os.path.join(source_folder, "external", "googleapis", "protodeps")
-    print("# Automatically generated by %s DO NOT EDIT" % __file__)
-    print("DEPENDENCIES = {")
+    dependencies = dict()
     proto_components = _PROTO_BASE_COMPONENTS.copy()
     files = sorted(glob.glob(os.path.join(deps_folder, "*.deps")))
     experimental = set(_experimental_components(source_folder))
@@ -261,24 +254,47 @@ def main():
         deps = _generate_proto_requires(filename)
         proto_components.add(component)
         proto_components.update(deps)
-        print(f'    "{component}": {sorted(deps)},')
+        dependencies[component] = sorted(deps)
     for component in sorted(_HARD_CODED_DEPENDENCIES.keys()):
         deps = _HARD_CODED_DEPENDENCIES[component]
         proto_components.add(component)
         proto_components.update(deps)
-        print(f'    "{component}": {sorted(deps)},')
-    print(f'    "cloud_extended_operations_protos": ["protobuf::libprotobuf"],')
-    print(f'    "compute_protos": ["cloud_extended_operations_protos", "protobuf::libprotobuf"],')
+        dependencies[component] = sorted(deps)
+    dependencies["cloud_extended_operations_protos"] = ["protobuf::libprotobuf"]
+    dependencies["compute_protos"] = ["cloud_extended_operations_protos", "protobuf::libprotobuf"]
     proto_components.add("cloud_extended_operations_protos")
     proto_components.add("compute_protos")
-    print("}")
-    proto_components = proto_components - _PROTO_DEPS_COMMON_REQUIRES
-    names = ['"%s"' % c for c in proto_components]
-    joined = ",\n    ".join(sorted(names))
-    print(f"\nPROTO_COMPONENTS = {{\n    {joined}\n}}")
-    names = ['"%s"' % c for c in components]
-    joined = ",\n    ".join(sorted(names))
-    print(f"\nCOMPONENTS = {{\n    {joined}\n}}")
+    return {
+        "components": components,
+        "proto_components": proto_components - _PROTO_DEPS_COMMON_REQUIRES,
+        "dependencies": dependencies,
+    }
+
+
+def main():
+    """Add the google-cloud-cpp proto deps of a version to `components.json`."""
+    parser = argparse.ArgumentParser(description=(__doc__))
+    parser.add_argument(
+        "-s",
+        "--source-folder",
+        help="a directory where `google-cloud-cpp` source has been extracted",
+    )
+    parser.add_argument(
+        "-v",
+        "--version",
+        required=True,
+        help="the `google-cloud-cpp` version of the sources, i.e. 2.28.0",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components.json"),
+        help="the file with the component tables of all versions, it is updated in place",
+    )
+    args = parser.parse_args()
+    all_tables = component_tables.load_all(args.output) if os.path.exists(args.output) else dict()
+    all_tables[args.version] = _tables(args.source_folder)
+    component_tables.save(args.output, all_tables)
 
 
 if __name__ == "__main__":
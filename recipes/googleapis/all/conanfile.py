@@ -1,5 +1,4 @@
 import functools
-import glob
 import os
 
 from conan import ConanFile
@@ -11,7 +10,7 @@ from conan.tools.files import apply_conandata_patches, copy, export_conandata_pa
 from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
+from helpers import activate_proto_libraries, load_proto_libraries
 
 required_conan_version = ">=1.60.0 <2 || >=2.0.5"
 
@@ -92,74 +91,59 @@ class GoogleAPIS(ConanFile):
 
     @functools.lru_cache(1)
     def _parse_proto_libraries(self):
-        # Generate the libraries to build dynamically
-        proto_libraries = []
-        for filename in glob.iglob(os.path.join(self.source_folder, 'google', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
-
-        for filename in glob.iglob(os.path.join(self.source_folder, 'grafeas', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
-
-        # Validate that all files exist and all dependencies are found
-        all_deps = [f"{it.qname}:{it.name}" for it in proto_libraries]
-        all_deps += ["protobuf::libprotobuf"]
-        for it in proto_libraries:
-            it.validate(self.source_folder, all_deps)
-
-        # Mark the libraries we need recursively (C++ context)
-        all_dict = {f"{it.qname}:{it.name}": it for it in proto_libraries}
-
-        def activate_library(proto_library):
-            proto_library.is_used = True
-            for it_dep in proto_library.deps:
-                if it_dep == "protobuf::libprotobuf":
-                    continue
-                activate_library(all_dict[it_dep])
-
-        for it in filter(lambda u: u.is_used, proto_libraries):
-            activate_library(it)
-
-        # Tweaks
-        def deactivate_library(key):
-            if key in all_dict:
-                all_dict[key].is_used = False
+        # Generate the libraries to build dynamically. They are parsed and validated once per source tree, and
+        # stored next to the sources so package() and later rebuilds reuse them
+        sources_key = {
+            "sources": self.conan_data["sources"][self.version],
+            "patches": self.conan_data.get("patches", {}).get(self.version, []),
+        }
+        proto_libraries = load_proto_libraries(self.source_folder, ["google", "grafeas"], sources_key,
+                                               self.output.error)
+
+        # Tweaks: libraries that are not built even if they are needed
+        deactivated = set()
         #  - Inconvenient macro names from usr/include/sys/syslimits.h in some macOS SDKs: GID_MAX
         #    Patched here: https://github.com/protocolbuffers/protobuf/commit/f138d5de2535eb7dd7c8d0ad5eb16d128ab221fd
         #    https://github.com/conan-io/conan-center-index/pull/16034/files#r1159042324
         #    This was fixed in the v22 release which starts at 4.22 for the C++ library
         if Version(self.dependencies["protobuf"].ref.version) <= "3.21.9" and self.settings.os == "Macos" or \
             self.settings.os == "Android":
-            deactivate_library("//google/storagetransfer/v1:storagetransfer_proto")
-            deactivate_library("//google/storagetransfer/v1:storagetransfer_cc_proto")
+            deactivated.add("//google/storagetransfer/v1:storagetransfer_proto")
+            deactivated.add("//google/storagetransfer/v1:storagetransfer_cc_proto")
         #  - Inconvenient macro names from /usr/include/math.h : DOMAIN
         if (self.settings.os == "Linux" and self.settings.compiler == "clang" and self.settings.compiler.libcxx == "libc++") or \
             is_msvc(self):
-            deactivate_library("//google/cloud/channel/v1:channel_proto")
-            deactivate_library("//google/cloud/channel/v1:channel_cc_proto")
+            deactivated.add("//google/cloud/channel/v1:channel_proto")
+            deactivated.add("//google/cloud/channel/v1:channel_cc_proto")
         #  - Inconvenient names for android
         if self.settings.os == "Android":
-            deactivate_library("//google/identity/accesscontextmanager/type:type_proto")
-            deactivate_library("//google/identity/accesscontextmanager/type:type_cc_proto")
-            deactivate_library("//google/identity/accesscontextmanager/v1:accesscontextmanager_proto")
-            deactivate_library("//google/identity/accesscontextmanager/v1:accesscontextmanager_cc_proto")
-            deactivate_library("//google/devtools/testing/v1:testing_proto")
-            deactivate_library("//google/devtools/testing/v1:testing_cc_proto")
-            deactivate_library("//google/devtools/resultstore/v2:resultstore_proto")
-            deactivate_library("//google/devtools/resultstore/v2:resultstore_cc_proto")
-            deactivate_library("//google/cloud/talent/v4beta1:talent_proto")
-            deactivate_library("//google/cloud/talent/v4beta1:talent_cc_proto")
-            deactivate_library("//google/cloud/talent/v4:talent_proto")
-            deactivate_library("//google/cloud/talent/v4:talent_cc_proto")
-            deactivate_library("//google/cloud/asset/v1:asset_proto")
-            deactivate_library("//google/cloud/asset/v1:asset_cc_proto")
+            deactivated.add("//google/identity/accesscontextmanager/type:type_proto")
+            deactivated.add("//google/identity/accesscontextmanager/type:type_cc_proto")
+            deactivated.add("//google/identity/accesscontextmanager/v1:accesscontextmanager_proto")
+            deactivated.add("//google/identity/accesscontextmanager/v1:accesscontextmanager_cc_proto")
+            deactivated.add("//google/devtools/testing/v1:testing_proto")
+            deactivated.add("//google/devtools/testing/v1:testing_cc_proto")
+            deactivated.add("//google/devtools/resultstore/v2:resultstore_proto")
+            deactivated.add("//google/devtools/resultstore/v2:resultstore_cc_proto")
+            deactivated.add("//google/cloud/talent/v4beta1:talent_proto")
+            deactivated.add("//google/cloud/talent/v4beta1:talent_cc_proto")
+            deactivated.add("//google/cloud/talent/v4:talent_proto")
+            deactivated.add("//google/cloud/talent/v4:talent_cc_proto")
+            deactivated.add("//google/cloud/asset/v1:asset_proto")
+            deactivated.add("//google/cloud/asset/v1:asset_cc_proto")
         # This fails to build on Windows. It is arguably a missing feature of
         # Protobuf.
         #     https://github.com/protocolbuffers/protobuf/issues/12774
         # Fortunately this library is not used by any downstream packages
         # (grpc-protos, or google-cloud-cpp), and it is only "beta" at the
         # moment. Simply disable it for now.
-        deactivate_library("//google/cloud/lifesciences/v2beta:lifesciences_proto")
-        deactivate_library("//google/cloud/lifesciences/v2beta:lifesciences_cc_proto")
+        deactivated.add("//google/cloud/lifesciences/v2beta:lifesciences_proto")
+        deactivated.add("//google/cloud/lifesciences/v2beta:lifesciences_cc_proto")
+
+        # Mark the libraries we need recursively (C++ context)
+        all_dict = {f"{it.qname}:{it.name}": it for it in proto_libraries}
+        activated, elapsed = activate_proto_libraries(all_dict, external_deps={"protobuf::libprotobuf"}, pruned=deactivated)
+        self.output.info(f"Activated {len(activated)} of {len(proto_libraries)} proto libraries in {elapsed:.3f}s")
 
         return proto_libraries
 
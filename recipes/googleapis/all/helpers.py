@@ -1,6 +1,13 @@
+import json
 import os
 import re
+import tempfile
 import textwrap
+import time
+
+# Bump it whenever the parser changes, so cached indexes are not reused
+PROTO_LIBRARIES_INDEX_VERSION = 1
+PROTO_LIBRARIES_INDEX = "proto_libraries.json"
 
 class _ProtoLibrary:
     name: str = None
@@ -16,23 +23,34 @@ class _ProtoLibrary:
         self.is_cc = is_cc
         self.is_used = self.is_cc
 
-    def validate(self, source_folder, all_deps):
+    def validate(self, existing_files, all_deps):
         # Check all files exists
         for it in self.srcs:
-            assert os.path.exists(os.path.join(source_folder, it)), f"{self.qname}:{self.name} - file '{it}' doesn't exist"
+            assert it in existing_files, f"{self.qname}:{self.name} - file '{it}' doesn't exist"
         # Check all deps exists
         for it in self.deps:
             assert it in all_deps, f"{self.qname}:{self.name} - dep '{it}' not found"
 
-    def dumps(self):
-        import json
-        return json.dumps({
+    def to_dict(self):
+        return {
             "name": self.name,
             "qname": self.qname,
             "srcs": self.srcs,
             "deps": list(self.deps),
             "is_cc": self.is_cc,
-        }, indent=4)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        proto_library = cls(is_cc=data["is_cc"])
+        proto_library.name = data["name"]
+        proto_library.qname = data["qname"]
+        proto_library.srcs = data["srcs"]
+        proto_library.deps = set(data["deps"])
+        return proto_library
+
+    def dumps(self):
+        return json.dumps(self.to_dict(), indent=4)
 
     @property
     def cmake_target(self):
@@ -188,3 +206,92 @@ def parse_proto_libraries(filename, source_folder, error):
                     action(line)
 
     return proto_libraries
+
+
+def parse_proto_libraries_tree(source_folder, subfolders, error):
+    """
+    Parse every BUILD.bazel file found below the subfolders in a single walk, which also collects the existing files
+    used to validate the sources.
+    """
+    proto_libraries = []
+    existing_files = set()
+    for subfolder in subfolders:
+        for root, dirs, files in os.walk(os.path.join(source_folder, subfolder)):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            relative_root = os.path.relpath(root, source_folder).replace('\\', '/')
+            existing_files.update(f"{relative_root}/{it}" for it in files)
+            if "BUILD.bazel" in files:
+                proto_libraries += parse_proto_libraries(os.path.join(root, "BUILD.bazel"), source_folder, error)
+    return proto_libraries, existing_files
+
+
+def load_proto_libraries(source_folder, subfolders, cache_key, error):
+    """
+    Return the validated proto libraries of the source tree. The result is stored as a JSON index in the source folder
+    and reused while cache_key (it should identify the sources and the patches applied to them) doesn't change.
+    """
+    index_path = os.path.join(source_folder, PROTO_LIBRARIES_INDEX)
+    key = {"version": PROTO_LIBRARIES_INDEX_VERSION, "subfolders": list(subfolders), "sources": cache_key}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index["key"] == key:
+            for it in index["errors"]:
+                error(it)
+            return [_ProtoLibrary.from_dict(it) for it in index["proto_libraries"]]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    errors = []
+    proto_libraries, existing_files = parse_proto_libraries_tree(source_folder, subfolders, errors.append)
+    for it in errors:
+        error(it)
+
+    # Validate that all files exist and all dependencies are found
+    all_deps = set(f"{it.qname}:{it.name}" for it in proto_libraries)
+    all_deps.add("protobuf::libprotobuf")
+    for it in proto_libraries:
+        it.validate(existing_files, all_deps)
+
+    # Written aside and renamed, so an interrupted or concurrent build never leaves a truncated index
+    fd, tmp_path = tempfile.mkstemp(prefix=PROTO_LIBRARIES_INDEX, dir=source_folder)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"key": key, "errors": errors, "proto_libraries": [it.to_dict() for it in proto_libraries]}, f)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return proto_libraries
+
+
+def activate_proto_libraries(all_dict, external_deps, pruned=()):
+    """
+    Mark as used every library reachable from the ones already used (C++ context), then mark the pruned ones as unused.
+    Each library is visited once with an iterative depth-first traversal, so shared dependencies are not walked again
+    and deep graphs don't hit the recursion limit. Deps found in external_deps are provided by other packages.
+    Returns the keys of the activated libraries in topological order (dependencies first) and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    order = []
+    visited = set()
+    for root in [key for key, it in all_dict.items() if it.is_used]:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(all_dict[root].deps))]
+        while stack:
+            key, deps = stack[-1]
+            for dep in deps:
+                if dep not in visited and dep not in external_deps:
+                    visited.add(dep)
+                    stack.append((dep, iter(all_dict[dep].deps)))
+                    break
+            else:
+                stack.pop()
+                order.append(key)
+
+    pruned = set(pruned)
+    for key in order:
+        all_dict[key].is_used = key not in pruned
+    return [key for key in order if key not in pruned], time.perf_counter() - start
@@ -9,7 +9,7 @@ from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import get, collect_libs, copy
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
+from helpers import activate_proto_libraries, parse_proto_libraries
 
 required_conan_version = ">=1.60.0 <2.0 || >=2.0.5"
 
@@ -107,15 +107,8 @@ class GRPCProto(ConanFile):
 
         # Mark the libraries we need recursively (C++ context)
         all_dict = {it.cmake_target: it for it in proto_libraries}
-        def activate_library(proto_library):
-            proto_library.is_used = True
-            for it_dep in proto_library.deps:
-                if it_dep in ["googleapis::googleapis", "protobuf::libprotobuf"]:
-                    continue
-                activate_library(all_dict[it_dep])
-
-        for it in filter(lambda u: u.is_used, proto_libraries):
-            activate_library(it)
+        activated, elapsed = activate_proto_libraries(all_dict, external_deps={"googleapis::googleapis", "protobuf::libprotobuf"})
+        self.output.info(f"Activated {len(activated)} of {len(proto_libraries)} proto libraries in {elapsed:.3f}s")
 
         return proto_libraries
 
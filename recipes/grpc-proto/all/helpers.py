@@ -1,6 +1,7 @@
 import os
 import re
 import textwrap
+import time
 
 
 def grpc_target_name(internal_name):
@@ -149,3 +150,35 @@ def parse_proto_libraries(filename, source_folder, error):
                     action(line)
 
     return proto_libraries
+
+
+def activate_proto_libraries(all_dict, external_deps, pruned=()):
+    """
+    Mark as used every library reachable from the ones already used (C++ context), then mark the pruned ones as unused.
+    Each library is visited once with an iterative depth-first traversal, so shared dependencies are not walked again
+    and deep graphs don't hit the recursion limit. Deps found in external_deps are provided by other packages.
+    Returns the keys of the activated libraries in topological order (dependencies first) and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    order = []
+    visited = set()
+    for root in [key for key, it in all_dict.items() if it.is_used]:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(all_dict[root].deps))]
+        while stack:
+            key, deps = stack[-1]
+            for dep in deps:
+                if dep not in visited and dep not in external_deps:
+                    visited.add(dep)
+                    stack.append((dep, iter(all_dict[dep].deps)))
+                    break
+            else:
+                stack.pop()
+                order.append(key)
+
+    pruned = set(pruned)
+    for key in order:
+        all_dict[key].is_used = key not in pruned
+    return [key for key in order if key not in pruned], time.perf_counter() - start
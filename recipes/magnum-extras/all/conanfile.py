@@ -1,6 +1,5 @@
 from conans import ConanFile, CMake, tools
 from conans.errors import ConanInvalidConfiguration
-import functools
 import os
 
 required_conan_version = ">=1.43.0"
@@ -32,6 +31,7 @@ class MagnumExtrasConan(ConanFile):
         "application": "sdl2",
     }
 
+    _cmake = None
     short_paths = True
     generators = "cmake", "cmake_find_package"
 
@@ -81,8 +81,10 @@ class MagnumExtrasConan(ConanFile):
         tools.get(**self.conan_data["sources"][self.version],
                   destination=self._source_subfolder, strip_root=True)
 
-    @functools.lru_cache(1)
     def _configure_cmake(self):
+        if self._cmake:
+            return self._cmake
+
         cmake = CMake(self)
         cmake.definitions["BUILD_STATIC"] = not self.options.shared
         cmake.definitions["BUILD_STATIC_PIC"] = self.options.get_safe("fPIC", False)
@@ -94,6 +96,7 @@ class MagnumExtrasConan(ConanFile):
         cmake.definitions["WITH_UI_GALLERY"] = self.options.ui_gallery
 
         cmake.configure()
+        self._cmake = cmake
         return cmake
 
     def _patch_sources(self):
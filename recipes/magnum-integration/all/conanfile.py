@@ -1,6 +1,5 @@
 from conans import ConanFile, CMake, tools
 from conans.errors import ConanInvalidConfiguration, ConanException
-import functools
 import os
 
 required_conan_version = ">=1.43.0"
@@ -40,6 +39,8 @@ class MagnumIntegrationConan(ConanFile):
     generators = "cmake", "cmake_find_package"
     short_paths = True
 
+    _cmake = None
+
     @property
     def _source_subfolder(self):
         return "source_subfolder"
@@ -75,8 +76,10 @@ class MagnumIntegrationConan(ConanFile):
         tools.get(**self.conan_data["sources"][self.version],
                   destination=self._source_subfolder, strip_root=True)
 
-    @functools.lru_cache(1)
     def _configure_cmake(self):
+        if self._cmake:
+            return self._cmake
+
         cmake = CMake(self)
         cmake.definitions["BUILD_STATIC"] = not self.options.shared
         cmake.definitions["BUILD_STATIC_PIC"] = self.options.get_safe("fPIC", True)
@@ -91,6 +94,7 @@ class MagnumIntegrationConan(ConanFile):
         cmake.definitions["WITH_OVR"] = self.options.with_ovr
 
         cmake.configure()
+        self._cmake = cmake
         return cmake
 
     def _patch_sources(self):
@@ -1,6 +1,5 @@
 from conans import ConanFile, CMake, tools
 from conans.errors import ConanInvalidConfiguration
-import functools
 import os
 import re
 import textwrap
@@ -143,6 +142,7 @@ class MagnumConan(ConanFile):
         "wav_audio_importer": True,
     }
 
+    _cmake = None
     short_paths = True
     generators = "cmake", "cmake_find_package"
     exports_sources = ["CMakeLists.txt", "cmake/*"]
@@ -276,8 +276,10 @@ class MagnumConan(ConanFile):
         tools.get(**self.conan_data["sources"][self.version],
                   destination=self._source_subfolder, strip_root=True)
 
-    @functools.lru_cache(1)
     def _configure_cmake(self):
+        if self._cmake:
+            return self._cmake
+
         cmake = CMake(self)
         cmake.definitions["BUILD_DEPRECATED"] = False
         cmake.definitions["BUILD_STATIC"] = not self.options.shared
@@ -350,6 +352,7 @@ class MagnumConan(ConanFile):
         cmake.definitions["WITH_SCENECONVERTER"] = self.options.scene_converter
 
         cmake.configure()
+        self._cmake = cmake
         return cmake
 
     def _patch_sources(self):
@@ -1,9 +1,10 @@
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration, ConanException
-from conan.tools.files import chdir, get, replace_in_file, copy
+from conan.tools.files import chdir, get, replace_in_file
 from conan.tools.layout import basic_layout
 import fnmatch
 import os
+import re
 import shutil
 import subprocess
 import errno
@@ -160,20 +161,63 @@ class MSYS2Conan(ConanFile):
         replace_in_file(self, os.path.join(self._msys_dir, "etc", "profile"),
                               'PKG_CONFIG_PATH="', 'PKG_CONFIG_PATH="${PKG_CONFIG_PATH:+${PKG_CONFIG_PATH}:}')
 
+    def _exclude_matcher(self):
+        """Match absolute paths against the 'exclude_files' patterns, with the semantics of fnmatch.fnmatch"""
+        patterns = [p for p in str(self.options.exclude_files).split(",") if p] if self.options.exclude_files else []
+        if not patterns:
+            return lambda path: False
+        regex = re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+        return lambda path: regex.match(os.path.normcase(path)) is not None
+
+    def _copy_msys_tree(self, dst, licenses_dst):
+        """Copy the msys64 tree in a single walk, skipping 'exclude_files', and its licenses to licenses_dst.
+
+        Files are hard linked when the filesystem allows it and copied otherwise. As with copy(), symlinks
+        are kept and only the folders containing files are created.
+        """
+        is_excluded = self._exclude_matcher()
+        licenses_src = os.path.join(self._msys_dir, "usr", "share", "licenses")
+        can_link = True
+
+        def link_or_copy(src, dst_file):
+            nonlocal can_link
+            if can_link:
+                try:
+                    os.link(src, dst_file)
+                    return
+                except OSError:
+                    can_link = False  # i.e. another volume, don't retry for every file
+            shutil.copy2(src, dst_file)
+
+        pending = [(self._msys_dir, [dst])]
+        while pending:
+            src_dir, dst_dirs = pending.pop()
+            created = False
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dst_dirs = [os.path.join(d, entry.name) for d in dst_dirs]
+                        if entry.path == licenses_src:
+                            sub_dst_dirs.append(licenses_dst)
+                        pending.append((entry.path, sub_dst_dirs))
+                        continue
+                    if is_excluded(entry.path):
+                        continue
+                    if not created:
+                        for dst_dir in dst_dirs:
+                            os.makedirs(dst_dir, exist_ok=True)
+                        created = True
+                    for dst_dir in dst_dirs:
+                        dst_file = os.path.join(dst_dir, entry.name)
+                        if entry.is_symlink():
+                            os.symlink(os.readlink(entry.path), dst_file)
+                        else:
+                            link_or_copy(entry.path, dst_file)
+
     def package(self):
-        excludes = None
-        if self.options.exclude_files:
-            excludes = tuple(str(self.options.exclude_files).split(","))
-        for exclude in excludes:
-            for root, _, filenames in os.walk(self._msys_dir):
-                for filename in filenames:
-                    fullname = os.path.join(root, filename)
-                    if fnmatch.fnmatch(fullname, exclude):
-                        os.unlink(fullname)
         # See https://github.com/conan-io/conan-center-index/blob/master/docs/error_knowledge_base.md#kb-h013-default-package-layout
-        copy(self, "*", dst=os.path.join(self.package_folder, "bin", "msys64"), src=self._msys_dir, excludes=excludes)
-        shutil.copytree(os.path.join(self._msys_dir, "usr", "share", "licenses"),
-                        os.path.join(self.package_folder, "licenses"))
+        self._copy_msys_tree(os.path.join(self.package_folder, "bin", "msys64"),
+                             os.path.join(self.package_folder, "licenses"))
 
     def package_info(self):
         self.cpp_info.libdirs = []
@@ -219,6 +219,7 @@ class OpenCVConan(ConanFile):
     default_options.update({_name: False for _name in OPENCV_EXTRA_MODULES_OPTIONS})
 
     short_paths = True
+    _cached_opencv_modules_graph = None
 
     @property
     def _is_cl_like(self):
@@ -364,137 +365,83 @@ class OpenCVConan(ConanFile):
 
     @property
     def _opencv_modules(self):
-        def imageformats_deps():
-            components = []
-            if self.options.get_safe("with_avif"):
-                components.append("libavif::libavif")
-            if self.options.get_safe("with_jpeg2000"):
-                components.append("{0}::{0}".format(self.options.with_jpeg2000))
-            if self.options.get_safe("with_png"):
-                components.append("libpng::libpng")
-            if self.options.get_safe("with_jpeg") == "libjpeg":
-                components.append("libjpeg::libjpeg")
-            elif self.options.get_safe("with_jpeg") == "libjpeg-turbo":
-                components.append("libjpeg-turbo::jpeg")
-            elif self.options.get_safe("with_jpeg") == "mozjpeg":
-                components.append("mozjpeg::libjpeg")
-            if self.options.get_safe("with_tiff"):
-                components.append("libtiff::libtiff")
-            if self.options.get_safe("with_openexr"):
-                components.append("openexr::openexr")
-            if self.options.get_safe("with_webp"):
-                components.append("libwebp::libwebp")
-            if self.options.get_safe("with_gdal"):
-                components.append("gdal::gdal")
-            if self.options.get_safe("with_gdcm"):
-                components.append("gdcm::gdcm")
-            return components
-
-        def eigen():
-            return ["eigen::eigen"] if self.options.with_eigen else []
-
-        def ffmpeg():
-            components = []
-            if self.options.get_safe("with_ffmpeg"):
-                components = ["ffmpeg::avcodec", "ffmpeg::avformat", "ffmpeg::avutil", "ffmpeg::swscale"]
-            return components
-
-        def gtk():
-            return ["gtk::gtk"] if self.options.get_safe("with_gtk") else []
-
-        def ipp():
-            if self.options.with_ipp == "intel-ipp":
-                return ["intel-ipp::intel-ipp"]
-            elif self.options.with_ipp == "opencv-icv" and not self.options.shared:
-                return ["ippiw"]
-            return []
-
-        def parallel():
-            return ["onetbb::onetbb"] if self.options.parallel == "tbb" else []
-
-        def protobuf():
-            return ["protobuf::protobuf"] if self.options.get_safe("with_protobuf") else []
-
-        def qt():
-            return ["qt::qt"] if self.options.get_safe("with_qt") else []
-
-        def quirc():
-            return ["quirc::quirc"] if self.options.get_safe("with_quirc") else []
-
-        def tesseract():
-            return ["tesseract::tesseract"] if self.options.get_safe("with_tesseract") else []
-
-        def vulkan():
-            return ["vulkan-headers::vulkan-headers"] if self.options.get_safe("with_vulkan") else []
-
-        def wayland():
-            return ["wayland::wayland-client", "wayland::wayland-cursor"] if self.options.get_safe("with_wayland") else []
-
-        def xkbcommon():
-            return ["xkbcommon::libxkbcommon"] if self.options.get_safe("with_wayland") else []
-
-        def opencv_calib3d():
-            return ["opencv_calib3d"] if self.options.calib3d else []
-
-        def opencv_cudaarithm():
-            return ["opencv_cudaarithm"] if self.options.cudaarithm else []
-
-        def opencv_cudacodec():
-            return ["opencv_cudacodec"] if self.options.cudacodec else []
-
-        def opencv_cudafeatures2d():
-            return ["opencv_cudafeatures2d"] if self.options.cudafeatures2d else []
-
-        def opencv_cudafilters():
-            return ["opencv_cudafilters"] if self.options.cudafilters else []
-
-        def opencv_cudaimgproc():
-            return ["opencv_cudaimgproc"] if self.options.cudaimgproc else []
-
-        def opencv_cudalegacy():
-            return ["opencv_cudalegacy"] if self.options.cudalegacy else []
-
-        def opencv_cudaoptflow():
-            return ["opencv_cudaoptflow"] if self.options.cudaoptflow else []
-
-        def opencv_cudawarping():
-            return ["opencv_cudawarping"] if self.options.cudawarping else []
-
-        def opencv_dnn():
-            return ["opencv_dnn"] if self.options.dnn else []
-
-        def opencv_flann():
-            return ["opencv_flann"] if self.options.flann else []
-
-        def opencv_imgcodecs():
-            return ["opencv_imgcodecs"] if self.options.imgcodecs else []
-
-        def opencv_imgproc():
-            return ["opencv_imgproc"] if self.options.imgproc else []
-
-        def opencv_objdetect():
-            return ["opencv_objdetect"] if self.options.objdetect else []
-
-        def opencv_video():
-            return ["opencv_video"] if self.options.video else []
-
-        def opencv_videoio():
-            return ["opencv_videoio"] if self.options.videoio else []
+        # Dependencies which depend on the options, evaluated once for the whole table
+        imageformats_deps = []
+        if self.options.get_safe("with_avif"):
+            imageformats_deps.append("libavif::libavif")
+        if self.options.get_safe("with_jpeg2000"):
+            imageformats_deps.append("{0}::{0}".format(self.options.with_jpeg2000))
+        if self.options.get_safe("with_png"):
+            imageformats_deps.append("libpng::libpng")
+        if self.options.get_safe("with_jpeg") == "libjpeg":
+            imageformats_deps.append("libjpeg::libjpeg")
+        elif self.options.get_safe("with_jpeg") == "libjpeg-turbo":
+            imageformats_deps.append("libjpeg-turbo::jpeg")
+        elif self.options.get_safe("with_jpeg") == "mozjpeg":
+            imageformats_deps.append("mozjpeg::libjpeg")
+        if self.options.get_safe("with_tiff"):
+            imageformats_deps.append("libtiff::libtiff")
+        if self.options.get_safe("with_openexr"):
+            imageformats_deps.append("openexr::openexr")
+        if self.options.get_safe("with_webp"):
+            imageformats_deps.append("libwebp::libwebp")
+        if self.options.get_safe("with_gdal"):
+            imageformats_deps.append("gdal::gdal")
+        if self.options.get_safe("with_gdcm"):
+            imageformats_deps.append("gdcm::gdcm")
 
-        def opencv_xfeatures2d():
-            return ["opencv_xfeatures2d"] if self.options.xfeatures2d else []
+        eigen = ["eigen::eigen"] if self.options.with_eigen else []
+        ffmpeg = ["ffmpeg::avcodec", "ffmpeg::avformat", "ffmpeg::avutil", "ffmpeg::swscale"] \
+                 if self.options.get_safe("with_ffmpeg") else []
+        gtk = ["gtk::gtk"] if self.options.get_safe("with_gtk") else []
+        if self.options.with_ipp == "intel-ipp":
+            ipp = ["intel-ipp::intel-ipp"]
+        elif self.options.with_ipp == "opencv-icv" and not self.options.shared:
+            ipp = ["ippiw"]
+        else:
+            ipp = []
+        parallel = ["onetbb::onetbb"] if self.options.parallel == "tbb" else []
+        protobuf = ["protobuf::protobuf"] if self.options.get_safe("with_protobuf") else []
+        qt = ["qt::qt"] if self.options.get_safe("with_qt") else []
+        quirc = ["quirc::quirc"] if self.options.get_safe("with_quirc") else []
+        tesseract = ["tesseract::tesseract"] if self.options.get_safe("with_tesseract") else []
+        vulkan = ["vulkan-headers::vulkan-headers"] if self.options.get_safe("with_vulkan") else []
+        wayland = ["wayland::wayland-client", "wayland::wayland-cursor"] if self.options.get_safe("with_wayland") else []
+        xkbcommon = ["xkbcommon::libxkbcommon"] if self.options.get_safe("with_wayland") else []
+
+        # Optional internal dependencies: opencv_<module> if the module is enabled
+        def opencv(module):
+            return [f"opencv_{module}"] if self.options.get_safe(module) else []
+
+        opencv_calib3d = opencv("calib3d")
+        opencv_cudaarithm = opencv("cudaarithm")
+        opencv_cudacodec = opencv("cudacodec")
+        opencv_cudafeatures2d = opencv("cudafeatures2d")
+        opencv_cudafilters = opencv("cudafilters")
+        opencv_cudaimgproc = opencv("cudaimgproc")
+        opencv_cudalegacy = opencv("cudalegacy")
+        opencv_cudaoptflow = opencv("cudaoptflow")
+        opencv_cudawarping = opencv("cudawarping")
+        opencv_dnn = opencv("dnn")
+        opencv_flann = opencv("flann")
+        opencv_imgcodecs = opencv("imgcodecs")
+        opencv_imgproc = opencv("imgproc")
+        opencv_objdetect = opencv("objdetect")
+        opencv_video = opencv("video")
+        opencv_videoio = opencv("videoio")
+        opencv_xfeatures2d = opencv("xfeatures2d")
 
         opencv_modules = {
             # Main modules
             "calib3d": {
                 "is_built": self.options.calib3d,
                 "mandatory_options": ["features2d", "flann", "imgproc"],
-                "requires": ["opencv_core", "opencv_features2d", "opencv_flann", "opencv_imgproc"] + eigen() + ipp(),
+                "requires": ["opencv_core", "opencv_features2d", "opencv_flann", "opencv_imgproc"] + eigen + ipp,
             },
             "core": {
                 "is_built": True,
                 "no_option": True,
-                "requires": ["zlib::zlib"] + parallel() + eigen() + ipp(),
+                "requires": ["zlib::zlib"] + parallel + eigen + ipp,
                 "system_libs": [
                     (self.settings.os == "Android", ["dl", "m", "log"]),
                     (self.settings.os == "FreeBSD", ["m", "pthread"]),
@@ -507,16 +454,16 @@ class OpenCVConan(ConanFile):
             "dnn": {
                 "is_built": self.options.dnn,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + protobuf() + vulkan() + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + protobuf + vulkan + ipp,
             },
             "features2d": {
                 "is_built": self.options.features2d,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + opencv_flann() + eigen() + ipp(),
+                "requires": ["opencv_imgproc"] + opencv_flann + eigen + ipp,
             },
             "flann": {
                 "is_built": self.options.flann,
-                "requires": ["opencv_core"] + ipp(),
+                "requires": ["opencv_core"] + ipp,
             },
             "gapi": {
                 "is_built": self.options.gapi,
@@ -529,8 +476,8 @@ class OpenCVConan(ConanFile):
             "highgui": {
                 "is_built": self.options.highgui,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + opencv_imgcodecs() +
-                            opencv_videoio() + gtk() + qt() + xkbcommon() + wayland() + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + opencv_imgcodecs +
+                            opencv_videoio + gtk + qt + xkbcommon + wayland + ipp,
                 "system_libs": [
                     (self.settings.os == "Windows", ["comctl32", "gdi32", "ole32", "setupapi", "ws2_32", "vfw32"]),
                 ],
@@ -541,7 +488,7 @@ class OpenCVConan(ConanFile):
             "imgcodecs": {
                 "is_built": self.options.imgcodecs,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc", "zlib::zlib"] + imageformats_deps() + ipp(),
+                "requires": ["opencv_imgproc", "zlib::zlib"] + imageformats_deps + ipp,
                 "frameworks": [
                     (is_apple_os(self), ["CoreFoundation", "CoreGraphics"]),
                     (self.settings.os == "iOS", ["UIKit"]),
@@ -550,38 +497,38 @@ class OpenCVConan(ConanFile):
             },
             "imgproc": {
                 "is_built": self.options.imgproc,
-                "requires": ["opencv_core"] + ipp(),
+                "requires": ["opencv_core"] + ipp,
             },
             "ml": {
                 "is_built": self.options.ml,
-                "requires": ["opencv_core"] + ipp(),
+                "requires": ["opencv_core"] + ipp,
             },
             "objdetect": {
                 "is_built": self.options.objdetect,
                 "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + quirc() + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + quirc + ipp,
             },
             "photo": {
                 "is_built": self.options.photo,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + opencv_cudaarithm() + opencv_cudaimgproc() + ipp(),
+                "requires": ["opencv_imgproc"] + opencv_cudaarithm + opencv_cudaimgproc + ipp,
             },
             "stitching": {
                 "is_built": self.options.stitching,
                 "mandatory_options": ["calib3d", "features2d", "flann", "imgproc"],
                 "requires": ["opencv_calib3d", "opencv_features2d", "opencv_flann", "opencv_imgproc"] +
-                            opencv_xfeatures2d() + opencv_cudaarithm() + opencv_cudawarping() +
-                            opencv_cudafeatures2d() + opencv_cudalegacy() + opencv_cudaimgproc() + eigen() + ipp(),
+                            opencv_xfeatures2d + opencv_cudaarithm + opencv_cudawarping +
+                            opencv_cudafeatures2d + opencv_cudalegacy + opencv_cudaimgproc + eigen + ipp,
             },
             "video": {
                 "is_built": self.options.video,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + opencv_calib3d() + ipp(),
+                "requires": ["opencv_imgproc"] + opencv_calib3d + ipp,
             },
             "videoio": {
                 "is_built": self.options.videoio,
                 "mandatory_options": ["imgcodecs", "imgproc"],
-                "requires": ["opencv_imgcodecs", "opencv_imgproc"] + ffmpeg() + ipp(),
+                "requires": ["opencv_imgcodecs", "opencv_imgproc"] + ffmpeg + ipp,
                 "system_libs": [
                     (self.settings.os == "Android" and int(str(self.settings.os.api_level)) > 20, ["mediandk"]),
                 ],
@@ -595,289 +542,289 @@ class OpenCVConan(ConanFile):
             "alphamat": {
                 "is_built": self.options.get_safe("alphamat"),
                 "mandatory_options": ["with_eigen", "imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "aruco": {
                 "is_built": self.options.aruco,
                 "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp,
             },
             "barcode": {
                 "is_built": self.options.get_safe("barcode"),
                 "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp,
             },
             "bgsegm": {
                 "is_built": self.options.bgsegm,
                 "mandatory_options": ["calib3d", "imgproc", "video"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_video"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_video"] + ipp,
             },
             "bioinspired": {
                 "is_built": self.options.bioinspired,
-                "requires": ["opencv_core"] + ipp(),
+                "requires": ["opencv_core"] + ipp,
             },
             "ccalib": {
                 "is_built": self.options.ccalib,
                 "mandatory_options": ["calib3d", "features2d", "highgui", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_highgui", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_highgui", "opencv_imgproc"] + ipp,
             },
             "cudaarithm": {
                 "is_built": self.options.cudaarithm,
                 "mandatory_options": ["with_cuda"],
-                "requires": ["opencv_core", "opencv_cudev"] + ipp(),
+                "requires": ["opencv_core", "opencv_cudev"] + ipp,
             },
             "cudabgsegm": {
                 "is_built": self.options.cudabgsegm,
                 "mandatory_options": ["with_cuda", "video"],
-                "requires": ["opencv_video"] + ipp(),
+                "requires": ["opencv_video"] + ipp,
             },
             "cudacodec": {
                 "is_built": self.options.cudacodec,
                 "mandatory_options": ["with_cuda", "videoio"],
-                "requires": ["opencv_core", "opencv_videoio"] + ipp(),
+                "requires": ["opencv_core", "opencv_videoio"] + ipp,
             },
             "cudafeatures2d": {
                 "is_built": self.options.cudafeatures2d,
                 "mandatory_options": ["with_cuda", "features2d", "cudafilters", "cudawarping"],
-                "requires": ["opencv_features2d", "opencv_cudafilters", "opencv_cudawarping"] + ipp(),
+                "requires": ["opencv_features2d", "opencv_cudafilters", "opencv_cudawarping"] + ipp,
             },
             "cudafilters": {
                 "is_built": self.options.cudafilters,
                 "mandatory_options": ["with_cuda", "imgproc", "cudaarithm"],
-                "requires": ["opencv_imgproc", "opencv_cudaarithm"] + ipp(),
+                "requires": ["opencv_imgproc", "opencv_cudaarithm"] + ipp,
             },
             "cudaimgproc": {
                 "is_built": self.options.cudaimgproc,
                 "mandatory_options": ["with_cuda", "imgproc"],
-                "requires": ["opencv_imgproc", "opencv_cudev"] + opencv_cudaarithm() + opencv_cudafilters() + ipp(),
+                "requires": ["opencv_imgproc", "opencv_cudev"] + opencv_cudaarithm + opencv_cudafilters + ipp,
             },
             "cudalegacy": {
                 "is_built": self.options.cudalegacy,
                 "mandatory_options": ["with_cuda", "video"],
-                "requires": ["opencv_core", "opencv_video"] + opencv_calib3d() + opencv_imgproc() + opencv_objdetect() +
-                            opencv_cudaarithm() + opencv_cudafilters() + opencv_cudaimgproc() + ipp(),
+                "requires": ["opencv_core", "opencv_video"] + opencv_calib3d + opencv_imgproc + opencv_objdetect +
+                            opencv_cudaarithm + opencv_cudafilters + opencv_cudaimgproc + ipp,
             },
             "cudaobjdetect": {
                 "is_built": self.options.cudaobjdetect,
                 "mandatory_options": ["with_cuda", "objdetect", "cudaarithm", "cudawarping"],
-                "requires": ["opencv_objdetect", "opencv_cudaarithm", "opencv_cudawarping"] + opencv_cudalegacy() + ipp(),
+                "requires": ["opencv_objdetect", "opencv_cudaarithm", "opencv_cudawarping"] + opencv_cudalegacy + ipp,
             },
             "cudaoptflow": {
                 "is_built": self.options.cudaoptflow,
                 "mandatory_options": ["with_cuda", "video", "cudaarithm", "cudaimgproc", "cudawarping", "optflow"],
                 "requires": ["opencv_video", "opencv_cudaarithm", "cudaimgproc", "opencv_cudawarping",
-                             "opencv_optflow"] + opencv_cudalegacy() + ipp(),
+                             "opencv_optflow"] + opencv_cudalegacy + ipp,
             },
             "cudastereo": {
                 "is_built": self.options.cudastereo,
                 "mandatory_options": ["with_cuda", "calib3d"],
-                "requires": ["opencv_calib3d", "opencv_cudev"] + ipp(),
+                "requires": ["opencv_calib3d", "opencv_cudev"] + ipp,
             },
             "cudawarping": {
                 "is_built": self.options.cudawarping,
                 "mandatory_options": ["with_cuda", "imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_cudev"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc", "opencv_cudev"] + ipp,
             },
             "cudev": {
                 "is_built": self.options.with_cuda,
                 "no_option": True,
-                "requires": ipp(),
+                "requires": list(ipp),
             },
             "cvv": {
                 "is_built": self.options.cvv,
                 "mandatory_options": ["with_qt", "features2d", "imgproc"],
-                "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "qt::qt"] + ipp(),
+                "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "qt::qt"] + ipp,
             },
             "datasets": {
                 "is_built": self.options.datasets,
                 "mandatory_options": ["flann", "imgcodecs", "ml"],
-                "requires": ["opencv_core", "opencv_flann", "opencv_imgcodecs", "opencv_ml"] + ipp(),
+                "requires": ["opencv_core", "opencv_flann", "opencv_imgcodecs", "opencv_ml"] + ipp,
             },
             "dnn_objdetect": {
                 "is_built": self.options.dnn_objdetect,
                 "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp,
             },
             "dnn_superres": {
                 "is_built": self.options.dnn_superres,
                 "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp,
             },
             "dpm": {
                 "is_built": self.options.dpm,
                 "mandatory_options": ["imgproc", "objdetect"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_objdetect"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc", "opencv_objdetect"] + ipp,
             },
             "face": {
                 "is_built": self.options.face,
                 "mandatory_options": ["calib3d", "imgproc", "objdetect", "photo"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_objdetect", "opencv_photo"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_objdetect", "opencv_photo"] + ipp,
             },
             "freetype": {
                 "is_built": self.options.freetype,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc", "freetype::freetype", "harfbuzz::harfbuzz"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc", "freetype::freetype", "harfbuzz::harfbuzz"] + ipp,
             },
             "fuzzy": {
                 "is_built": self.options.fuzzy,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "hdf": {
                 "is_built": self.options.hdf,
-                "requires": ["opencv_core", "hdf5::hdf5"] + ipp(),
+                "requires": ["opencv_core", "hdf5::hdf5"] + ipp,
             },
             "hfs": {
                 "is_built": self.options.hfs,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "img_hash": {
                 "is_built": self.options.img_hash,
                 "is_part_of_world": False,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "intensity_transform": {
                 "is_built": self.options.get_safe("intensity_transform"),
-                "requires": ["opencv_core"] + ipp(),
+                "requires": ["opencv_core"] + ipp,
             },
             "line_descriptor": {
                 "is_built": self.options.line_descriptor,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + ipp(),
+                "requires": ["opencv_imgproc"] + ipp,
             },
             "mcc": {
                 "is_built": self.options.get_safe("mcc"),
                 "mandatory_options": ["calib3d", "dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_dnn", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_dnn", "opencv_imgproc"] + ipp,
             },
             "optflow": {
                 "is_built": self.options.optflow,
                 "mandatory_options": ["calib3d", "flann", "imgcodecs", "imgproc", "video", "ximgproc"],
                 "requires": ["opencv_core", "opencv_calib3d", "opencv_flann", "opencv_imgcodecs", "opencv_imgproc",
-                             "opencv_video", "opencv_ximgproc"] + ipp(),
+                             "opencv_video", "opencv_ximgproc"] + ipp,
             },
             "ovis": {
                 "is_built": self.options.ovis,
                 "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "ogre::ogre"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "ogre::ogre"] + ipp,
             },
             "phase_unwrapping": {
                 "is_built": self.options.phase_unwrapping,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "plot": {
                 "is_built": self.options.plot,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "quality": {
                 "is_built": self.options.quality,
                 "mandatory_options": ["imgproc", "ml"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_ml"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc", "opencv_ml"] + ipp,
             },
             "rapid": {
                 "is_built": self.options.get_safe("rapid"),
                 "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp,
             },
             "reg": {
                 "is_built": self.options.reg,
                 "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc"] + ipp,
             },
             "rgbd": {
                 "is_built": self.options.rgbd,
                 "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + eigen() + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + eigen + ipp,
             },
             "saliency": {
                 "is_built": self.options.saliency,
                 "mandatory_options": ["features2d", "imgproc"],
-                "requires": ["opencv_features2d", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_features2d", "opencv_imgproc"] + ipp,
             },
             "sfm": {
                 "is_built": self.options.sfm,
                 "is_part_of_world": False,
                 "mandatory_options": ["with_eigen", "calib3d", "features2d", "imgcodecs", "xfeatures2d"],
                 "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgcodecs", "opencv_xfeatures2d",
-                             "correspondence", "multiview", "numeric", "glog::glog", "gflags::gflags"] + eigen() + ipp(),
+                             "correspondence", "multiview", "numeric", "glog::glog", "gflags::gflags"] + eigen + ipp,
             },
             "shape": {
                 "is_built": self.options.shape,
                 "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp,
             },
             "stereo": {
                 "is_built": self.options.stereo,
                 "mandatory_options": ["features2d", "imgproc", "tracking"],
-                "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "opencv_tracking"] + ipp(),
+                "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "opencv_tracking"] + ipp,
             },
             "structured_light": {
                 "is_built": self.options.structured_light,
                 "mandatory_options": ["calib3d", "imgproc", "phase_unwrapping"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_phase_unwrapping"] + ipp(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_phase_unwrapping"] + ipp,
             },
             "superres": {
                 "is_built": self.options.get_safe("superres"),
                 "mandatory_options": ["imgproc", "video", "optflow"],
-                "requires": ["opencv_imgproc", "opencv_video", "opencv_optflow"] + opencv_videoio() + ipp() +
-                            opencv_cudaarithm() + opencv_cudafilters() + opencv_cudawarping() + opencv_cudaimgproc() +
-                            opencv_cudaoptflow() + opencv_cudacodec(),
+                "requires": ["opencv_imgproc", "opencv_video", "opencv_optflow"] + opencv_videoio + ipp +
+                            opencv_cudaarithm + opencv_cudafilters + opencv_cudawarping + opencv_cudaimgproc +
+                            opencv_cudaoptflow + opencv_cudacodec,
             },
             "surface_matching": {
                 "is_built": self.options.surface_matching,
                 "mandatory_options": ["flann"],
-                "requires": ["opencv_core", "opencv_flann"] + ipp(),
+                "requires": ["opencv_core", "opencv_flann"] + ipp,
             },
             "text": {
                 "is_built": self.options.text,
                 "mandatory_options": ["dnn", "features2d", "imgproc", "ml"],
                 "requires": ["opencv_core", "opencv_dnn", "opencv_features2d", "opencv_imgproc", "opencv_ml"] +
-                            tesseract() + ipp(),
+                            tesseract + ipp,
             },
             "tracking": {
                 "is_built": self.options.tracking,
                 "mandatory_options": ["imgproc", "video"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_video"] + opencv_dnn() + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc", "opencv_video"] + opencv_dnn + ipp,
             },
             "videostab": {
                 "is_built": self.options.videostab,
                 "mandatory_options": ["calib3d", "features2d", "imgproc", "photo", "video"],
                 "requires": ["opencv_calib3d", "opencv_features2d", "opencv_imgproc", "opencv_photo", "opencv_video"] +
-                            opencv_videoio() + ipp() + opencv_cudawarping() + opencv_cudaoptflow(),
+                            opencv_videoio + ipp + opencv_cudawarping + opencv_cudaoptflow,
             },
             "viz": {
                 "is_built": self.options.viz,
-                "requires": ["opencv_core", "vtk::vtk"] + ipp(),
+                "requires": ["opencv_core", "vtk::vtk"] + ipp,
             },
             "wechat_qrcode": {
                 "is_built": self.options.get_safe("wechat_qrcode"),
                 "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
+                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp,
             },
             "xfeatures2d": {
                 "is_built": self.options.xfeatures2d,
                 "mandatory_options": ["calib3d", "features2d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgproc"] + ipp() + opencv_cudaarithm(),
+                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgproc"] + ipp + opencv_cudaarithm,
             },
             "ximgproc": {
                 "is_built": self.options.ximgproc,
                 "mandatory_options": ["calib3d", "imgcodecs", "imgproc", "video"],
                 "requires": ["opencv_core", "opencv_calib3d", "opencv_imgcodecs", "opencv_imgproc", "opencv_video"] +
-                            eigen() + ipp(),
+                            eigen + ipp,
             },
             "xobjdetect": {
                 "is_built": self.options.xobjdetect,
                 "mandatory_options": ["imgcodecs", "imgproc", "objdetect"],
-                "requires": ["opencv_core", "opencv_imgcodecs", "opencv_imgproc", "opencv_objdetect"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgcodecs", "opencv_imgproc", "opencv_objdetect"] + ipp,
             },
             "xphoto": {
                 "is_built": self.options.xphoto,
                 "mandatory_options": ["imgproc", "photo"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_photo"] + ipp(),
+                "requires": ["opencv_core", "opencv_imgproc", "opencv_photo"] + ipp,
             },
             # Extra targets (without prefix in their target & lib name)
             "ippiw": {
@@ -889,37 +836,38 @@ class OpenCVConan(ConanFile):
                 "is_built": self.options.sfm,
                 "is_part_of_world": False,
                 "no_option": True,
-                "requires": eigen() + ipp(),
+                "requires": eigen + ipp,
             },
             "correspondence": {
                 "is_built": self.options.sfm,
                 "is_part_of_world": False,
                 "no_option": True,
-                "requires": ["opencv_imgcodecs", "multiview", "glog::glog"] + eigen() + ipp(),
+                "requires": ["opencv_imgcodecs", "multiview", "glog::glog"] + eigen + ipp,
             },
             "multiview": {
                 "is_built": self.options.sfm,
                 "is_part_of_world": False,
                 "no_option": True,
-                "requires": ["numeric", "glog::glog"] + eigen() + ipp(),
+                "requires": ["numeric", "glog::glog"] + eigen + ipp,
             },
         }
 
-        if Version(self.version) >= "4.3.0":
-            opencv_modules["gapi"].setdefault("requires", []).extend(opencv_video())
-        if Version(self.version) >= "4.5.2":
-            opencv_modules["gapi"].setdefault("requires", []).extend(opencv_calib3d())
-        if Version(self.version) >= "4.5.4":
-            opencv_modules["objdetect"].setdefault("requires", []).extend(opencv_dnn())
-        if Version(self.version) >= "4.5.1":
-            opencv_modules["video"].setdefault("requires", []).extend(opencv_dnn())
-        if Version(self.version) >= "4.4.0":
+        version = Version(self.version)
+        if version >= "4.3.0":
+            opencv_modules["gapi"].setdefault("requires", []).extend(opencv_video)
+        if version >= "4.5.2":
+            opencv_modules["gapi"].setdefault("requires", []).extend(opencv_calib3d)
+        if version >= "4.5.4":
+            opencv_modules["objdetect"].setdefault("requires", []).extend(opencv_dnn)
+        if version >= "4.5.1":
+            opencv_modules["video"].setdefault("requires", []).extend(opencv_dnn)
+        if version >= "4.4.0":
             opencv_modules["intensity_transform"].setdefault("mandatory_options", []).append("imgproc")
             opencv_modules["intensity_transform"].setdefault("requires", []).append("opencv_imgproc")
-        if Version(self.version) < "4.3.0":
+        if version < "4.3.0":
             opencv_modules["stereo"].setdefault("mandatory_options", []).extend(["calib3d", "video"])
             opencv_modules["stereo"].setdefault("requires", []).extend(["opencv_calib3d", "opencv_video"])
-        if Version(self.version) >= "4.7.0":
+        if version >= "4.7.0":
             opencv_modules["aruco"].setdefault("mandatory_options", []).append("objdetect")
             opencv_modules["aruco"].setdefault("requires", []).append("opencv_objdetect")
             opencv_modules["cudacodec"].setdefault("mandatory_options", []).extend(["cudaarithm", "cudawarping"])
@@ -928,43 +876,62 @@ class OpenCVConan(ConanFile):
             opencv_modules["wechat_qrcode"].setdefault("requires", []).append("opencv_objdetect")
         else:
             opencv_modules["cudacodec"].setdefault("requires", []).append("opencv_cudev")
-        if Version(self.version) < "4.8.0":
+        if version < "4.8.0":
             opencv_modules["dnn"].setdefault("mandatory_options", []).append("with_protobuf")
 
         return opencv_modules
 
-    def _get_mandatory_disabled_options(self, opencv_modules):
+    @property
+    def _opencv_modules_graph(self):
+        """Modules and their mandatory options, direct and transitive, which do not depend on the value of options"""
+        if self._cached_opencv_modules_graph is None:
+            graph = {
+                module: {
+                    "no_option": values.get("no_option", False),
+                    "mandatory_options": frozenset(values.get("mandatory_options", [])),
+                }
+                for module, values in self._opencv_modules.items()
+            }
+            for values in graph.values():
+                closure = set()
+                stack = list(values["mandatory_options"])
+                while stack:
+                    option = stack.pop()
+                    if option not in closure:
+                        closure.add(option)
+                        stack.extend(graph.get(option, {}).get("mandatory_options", []))
+                values["transitive_mandatory_options"] = frozenset(closure)
+            self._cached_opencv_modules_graph = graph
+        return self._cached_opencv_modules_graph
+
+    def _get_mandatory_disabled_options(self, opencv_modules_graph):
         direct_options_to_enable = {}
         transitive_options_to_enable = {}
 
-        # Check which direct options have to be enabled
-        base_options = [option for option, values in opencv_modules.items()
-                        if not values.get("no_option") and self.options.get_safe(option)]
-        for base_option in base_options:
-            for mandatory_option in opencv_modules.get(base_option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
-                    direct_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
-
-        # Now traverse the graph to check which transitive options have to be enabled
-        def collect_transitive_options(base_option, option):
-            for mandatory_option in opencv_modules.get(option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
-                    if mandatory_option not in transitive_options_to_enable:
-                        transitive_options_to_enable[mandatory_option] = set()
-                        collect_transitive_options(base_option, mandatory_option)
-                    if base_option not in direct_options_to_enable.get(mandatory_option, set()):
-                        transitive_options_to_enable[mandatory_option].add(base_option)
-
-        for base_option in base_options:
-            collect_transitive_options(base_option, base_option)
+        enabled = {}
+        def is_enabled(option):
+            if option not in enabled:
+                enabled[option] = bool(self.options.get_safe(option))
+            return enabled[option]
+
+        # Disabled options required by enabled modules, directly or through other modules
+        for base_option, values in opencv_modules_graph.items():
+            if values["no_option"] or not is_enabled(base_option):
+                continue
+            for mandatory_option in values["transitive_mandatory_options"]:
+                if not is_enabled(mandatory_option):
+                    if mandatory_option in values["mandatory_options"]:
+                        direct_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
+                    else:
+                        transitive_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
 
         return {
             "direct": direct_options_to_enable,
             "transitive": transitive_options_to_enable,
         }
 
-    def _solve_internal_dependency_graph(self, opencv_modules):
-        disabled_options = self._get_mandatory_disabled_options(opencv_modules)
+    def _solve_internal_dependency_graph(self, opencv_modules_graph):
+        disabled_options = self._get_mandatory_disabled_options(opencv_modules_graph)
         direct_options_to_enable = disabled_options["direct"]
         transitive_options_to_enable = disabled_options["transitive"]
 
@@ -1015,8 +982,8 @@ class OpenCVConan(ConanFile):
                         "cudaarithm", "cudabgsegm", "cudacodec", "cudafeatures2d", "cudafilters", "cudaimgproc",
                         "cudalegacy", "cudaobjdetect", "cudaoptflow", "cudastereo", "cudawarping",
                     ])
-                for option, values in self._opencv_modules.items():
-                    if option not in filtered_options and not values.get("no_option"):
+                for option, values in self._opencv_modules_graph.items():
+                    if option not in filtered_options and not values["no_option"]:
                         try:
                             if hasattr(self.options, option):
                                 setattr(self.options, option, True)
@@ -1039,7 +1006,7 @@ class OpenCVConan(ConanFile):
             self.options.gapi = self.options.with_ade
 
         # Call this first before any further manipulation of options based on other options
-        self._solve_internal_dependency_graph(self._opencv_modules)
+        self._solve_internal_dependency_graph(self._opencv_modules_graph)
 
         if not self.options.dnn:
             self.options.rm_safe("dnn_cuda")
@@ -1173,8 +1140,8 @@ class OpenCVConan(ConanFile):
         del self.info.options.contrib_sfm
         del self.info.options.with_ade
 
-    def _check_mandatory_options(self, opencv_modules):
-        disabled_options = self._get_mandatory_disabled_options(opencv_modules)
+    def _check_mandatory_options(self, opencv_modules_graph):
+        disabled_options = self._get_mandatory_disabled_options(opencv_modules_graph)
         direct_disabled_mandatory_options = disabled_options["direct"]
         transitive_disabled_mandatory_options = disabled_options["transitive"]
 
@@ -1198,7 +1165,7 @@ class OpenCVConan(ConanFile):
             raise ConanInvalidConfiguration(message)
 
     def validate(self):
-        self._check_mandatory_options(self._opencv_modules)
+        self._check_mandatory_options(self._opencv_modules_graph)
         if self.settings.compiler.get_safe("cppstd"):
             check_min_cppstd(self, 11)
         if self.options.shared and self._is_cl_like and self._is_cl_like_static_runtime:
@@ -1593,7 +1560,7 @@ class OpenCVConan(ConanFile):
         self._create_cmake_module_variables(os.path.join(self.package_folder, self._module_vars_rel_path))
 
         # TODO: to remove in conan v2 once cmake_find_package* generators removed
-        targets_mapping = {self._cmake_target(k): f"opencv::{self._cmake_target(k)}" for k in self._opencv_modules.keys()}
+        targets_mapping = {self._cmake_target(k): f"opencv::{self._cmake_target(k)}" for k in self._opencv_modules_graph}
         if self.options.world:
             targets_mapping.update({"opencv_world": "opencv::opencv_world"})
         self._create_cmake_module_alias_targets(
@@ -1693,17 +1660,20 @@ class OpenCVConan(ConanFile):
                 world_system_libs = set()
                 world_frameworks = set()
 
+            opencv4_includedir = os.path.join("include", "opencv4") if self.settings.os != "Windows" else None
+            build_modules = [self._module_vars_rel_path, self._module_target_rel_path]
             for module, values in modules.items():
                 if not values.get("is_built"):
                     continue
                 cmake_target = self._cmake_target(module)
                 conan_component = cmake_target
+                component = self.cpp_info.components[conan_component]
                 # TODO: we should also define COMPONENTS names of each target for find_package() but
                 # not possible yet in CMakeDeps. See https://github.com/conan-io/conan/issues/10258
-                self.cpp_info.components[conan_component].set_property("cmake_target_name", cmake_target)
-                self.cpp_info.components[conan_component].resdirs = ["res"]
-                if self.settings.os != "Windows":
-                    self.cpp_info.components[conan_component].includedirs.append(os.path.join("include", "opencv4"))
+                component.set_property("cmake_target_name", cmake_target)
+                component.resdirs = ["res"]
+                if opencv4_includedir:
+                    component.includedirs.append(opencv4_includedir)
 
                 module_requires = values.get("requires", [])
                 module_system_libs = []
@@ -1716,30 +1686,30 @@ class OpenCVConan(ConanFile):
                         module_frameworks.extend(_frameworks)
 
                 if self.options.world and values.get("is_part_of_world", True):
-                    self.cpp_info.components[conan_component].requires = ["opencv_world"]
+                    component.requires = ["opencv_world"]
                     world_requires.update(module_requires)
                     world_requires_exclude.add(conan_component)
                     world_system_libs.update(module_system_libs)
                     world_frameworks.update(module_frameworks)
                 else:
-                    self.cpp_info.components[conan_component].libs = get_libs(module)
-                    self.cpp_info.components[conan_component].requires = module_requires
-                    self.cpp_info.components[conan_component].system_libs = module_system_libs
-                    self.cpp_info.components[conan_component].frameworks = module_frameworks
+                    component.libs = get_libs(module)
+                    component.requires = module_requires
+                    component.system_libs = module_system_libs
+                    component.frameworks = module_frameworks
 
                 # TODO: to remove in conan v2 once cmake_find_package* generators removed
-                self.cpp_info.components[conan_component].names["cmake_find_package"] = cmake_target
-                self.cpp_info.components[conan_component].names["cmake_find_package_multi"] = cmake_target
-                self.cpp_info.components[conan_component].build_modules["cmake_find_package"] = [self._module_vars_rel_path, self._module_target_rel_path]
-                self.cpp_info.components[conan_component].build_modules["cmake_find_package_multi"] = [self._module_vars_rel_path, self._module_target_rel_path]
+                component.names["cmake_find_package"] = cmake_target
+                component.names["cmake_find_package_multi"] = cmake_target
+                component.build_modules["cmake_find_package"] = list(build_modules)
+                component.build_modules["cmake_find_package_multi"] = list(build_modules)
                 if module != cmake_target:
-                    conan_component_alias = conan_component + "_alias"
-                    self.cpp_info.components[conan_component_alias].names["cmake_find_package"] = module
-                    self.cpp_info.components[conan_component_alias].names["cmake_find_package_multi"] = module
-                    self.cpp_info.components[conan_component_alias].requires = [conan_component]
-                    self.cpp_info.components[conan_component_alias].bindirs = []
-                    self.cpp_info.components[conan_component_alias].includedirs = []
-                    self.cpp_info.components[conan_component_alias].libdirs = []
+                    alias = self.cpp_info.components[conan_component + "_alias"]
+                    alias.names["cmake_find_package"] = module
+                    alias.names["cmake_find_package_multi"] = module
+                    alias.requires = [conan_component]
+                    alias.bindirs = []
+                    alias.includedirs = []
+                    alias.libdirs = []
 
             if self.options.world:
                 self.cpp_info.components["opencv_world"].requires = list(world_requires - world_requires_exclude)
@@ -12,6 +12,8 @@ import fnmatch
 import os
 import textwrap
 
+from cmake_modules import write_cmake_module
+
 required_conan_version = ">=1.57.0"
 
 
@@ -95,6 +97,7 @@ class OpenSSLConan(ConanFile):
     default_options["no_md2"] = True
     default_options["openssldir"] = None
     default_options["tls_security_level"] = None
+    exports = "cmake_modules.py"
 
     @property
     def _is_clang_cl(self):
@@ -573,12 +576,15 @@ class OpenSSLConan(ConanFile):
         rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
         rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
 
-        self._create_cmake_module_variables(
-            os.path.join(self.package_folder, self._module_file_rel_path)
+        write_cmake_module(
+            self,
+            os.path.join(self.package_folder, self._module_file_rel_path),
+            variables=self._cmake_module_variables,
         )
 
-    def _create_cmake_module_variables(self, module_file):
-        content = textwrap.dedent("""\
+    @property
+    def _cmake_module_variables(self):
+        return textwrap.dedent("""\
             set(OPENSSL_FOUND TRUE)
             if(DEFINED OpenSSL_INCLUDE_DIR)
                 set(OPENSSL_INCLUDE_DIR ${OpenSSL_INCLUDE_DIR})
@@ -616,7 +622,6 @@ class OpenSSLConan(ConanFile):
                 set(OPENSSL_VERSION ${OpenSSL_VERSION})
             endif()
         """% {"config":str(self.settings.build_type).upper()})
-        save(self, module_file, content)
 
     @property
     def _module_subfolder(self):
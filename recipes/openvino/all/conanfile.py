@@ -5,7 +5,6 @@ from conan.tools.scm import Version
 from conan.tools.cmake import CMake, CMakeToolchain, CMakeDeps, cmake_layout
 from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rmdir
-import functools
 import os
 import yaml
 
@@ -64,19 +63,21 @@ class OpenvinoConan(ConanFile):
         "enable_paddle_frontend": True,
         "enable_pytorch_frontend": True
     }
+    _cached_dependencies = None
 
     @property
     def _dependencies_filename(self):
         return f"dependencies-{self.version}.yml"
 
     @property
-    @functools.lru_cache(1)
     def _dependencies_versions(self):
-        dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
-        if not os.path.isfile(dependencies_filepath):
-            raise ConanException(f"Cannot find {dependencies_filepath}")
-        cached_dependencies = yaml.safe_load(open(dependencies_filepath, encoding='UTF-8'))
-        return cached_dependencies
+        if self._cached_dependencies is None:
+            dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
+            if not os.path.isfile(dependencies_filepath):
+                raise ConanException(f"Cannot find {dependencies_filepath}")
+            with open(dependencies_filepath, encoding="utf-8") as f:
+                self._cached_dependencies = yaml.safe_load(f)
+        return self._cached_dependencies
 
     def _require(self, dependency):
         if dependency not in self._dependencies_versions:
@@ -1,7 +1,6 @@
 from conan.tools.microsoft import msvc_runtime_flag
 from conans import ConanFile, tools, CMake
 from conans.errors import ConanInvalidConfiguration
-import functools
 import os
 import textwrap
 
@@ -41,6 +40,7 @@ class PdalConan(ConanFile):
     }
 
     generators = "cmake", "cmake_find_package"
+    _cmake = None
 
     @property
     def _source_subfolder(self):
@@ -111,8 +111,10 @@ class PdalConan(ConanFile):
         tools.get(**self.conan_data["sources"][self.version],
                   destination=self._source_subfolder, strip_root=True)
 
-    @functools.lru_cache(1)
     def _configure_cmake(self):
+        if self._cmake:
+            return self._cmake
+
         cmake = CMake(self)
         cmake.definitions["PDAL_BUILD_STATIC"] = not self.options.shared
         cmake.definitions["WITH_TESTS"] = False
@@ -125,6 +127,7 @@ class PdalConan(ConanFile):
         # disable plugin that requires postgresql
         cmake.definitions["BUILD_PLUGIN_PGPOINTCLOUD"] = False
         cmake.configure()
+        self._cmake = cmake
         return cmake
 
     def _patch_sources(self):
@@ -1,5 +1,6 @@
 import configparser
 import glob
+import json
 import os
 import platform
 import textwrap
@@ -9,7 +10,7 @@ from conan.tools.apple import is_apple_os
 from conan.tools.build import cross_building, check_min_cppstd, default_cppstd
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.env import VirtualBuildEnv, VirtualRunEnv, Environment
-from conan.tools.files import copy, get, replace_in_file, apply_conandata_patches, save, rm, rmdir, export_conandata_patches
+from conan.tools.files import copy, get, load, replace_in_file, apply_conandata_patches, save, rm, rmdir, export_conandata_patches
 from conan.tools.gnu import PkgConfigDeps
 from conan.tools.microsoft import msvc_runtime_flag, is_msvc
 from conan.tools.scm import Version
@@ -136,12 +137,13 @@ class QtConan(ConanFile):
         return getattr(self, "settings_build", self.settings)
 
     @property
-    def _get_module_tree(self):
-        if self._submodules_tree:
-            return self._submodules_tree
+    def _module_index_file(self):
+        return f"qtmodules{self.version}.json"
+
+    def _parse_module_tree(self):
         config = configparser.ConfigParser()
         config.read(os.path.join(self.recipe_folder, f"qtmodules{self.version}.conf"))
-        self._submodules_tree = {}
+        tree = {}
         assert config.sections(), f"no qtmodules.conf file for version {self.version}"
         for s in config.sections():
             section = str(s)
@@ -155,18 +157,39 @@ class QtConan(ConanFile):
                 if status not in self._module_statuses:
                     raise ConanException(f"module {modulename} has status {status} which is not in self._module_statuses {self._module_statuses}")
                 assert modulename in self._submodules, f"module {modulename} not in self._submodules"
-                self._submodules_tree[modulename] = {"status": status,
+                tree[modulename] = {"status": status,
                                 "path": str(config.get(section, "path")), "depends": []}
                 if config.has_option(section, "depends"):
-                    self._submodules_tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
+                    tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
+
+        for modulename, module in tree.items():
+            transitive_depends = set()
+            pending = list(module["depends"])
+            while pending:
+                dep = pending.pop()
+                if dep not in transitive_depends:
+                    transitive_depends.add(dep)
+                    pending.extend(tree[dep]["depends"] if dep in tree else [])
+            module["transitive_depends"] = sorted(transitive_depends)
+        return tree
 
+    @property
+    def _get_module_tree(self):
+        # Exported recipes come with the module tree already parsed, see export()
+        if self._submodules_tree is None:
+            index_file = os.path.join(self.recipe_folder, self._module_index_file)
+            if os.path.isfile(index_file):
+                self._submodules_tree = json.loads(load(self, index_file))
+            else:
+                self._submodules_tree = self._parse_module_tree()
         return self._submodules_tree
 
     def export_sources(self):
         export_conandata_patches(self)
 
     def export(self):
-        copy(self, f"qtmodules{self.version}.conf", self.recipe_folder, self.export_folder)
+        save(self, os.path.join(self.export_folder, self._module_index_file),
+             json.dumps(self._parse_module_tree(), indent=2, sort_keys=True))
 
     def config_options(self):
         if self.settings.os not in ["Linux", "FreeBSD"]:
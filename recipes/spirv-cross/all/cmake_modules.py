@@ -0,0 +1,45 @@
+"""
+CMake modules added to packages as build modules, for the legacy alias targets and variables the
+upstream config files provide but the Conan generators do not.
+
+A module is rendered in a single join, alias targets and variables can go in one module, and the
+file is only written if the hash of its content changed.
+
+This file is copied in the recipes using it (spirv-cross, openssl/3.x.x), keep the copies identical.
+"""
+
+import hashlib
+import os
+
+from conan.tools.files import save
+
+_ALIAS_TARGET = """\
+if(TARGET {aliased} AND NOT TARGET {alias})
+    add_library({alias} INTERFACE IMPORTED)
+    set_property(TARGET {alias} PROPERTY INTERFACE_LINK_LIBRARIES {aliased})
+endif()
+"""
+
+
+def cmake_module_content(alias_targets=None, variables=""):
+    """Content of a module defining the alias targets ({alias: aliased}), followed by the variables block"""
+    blocks = [_ALIAS_TARGET.format(alias=alias, aliased=aliased) for alias, aliased in (alias_targets or {}).items()]
+    blocks.append(variables)
+    return "".join(blocks)
+
+
+def _file_hash(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def write_cmake_module(conanfile, module_file, alias_targets=None, variables=""):
+    """Write the module unless it already has this content, returns True if it was written"""
+    content = cmake_module_content(alias_targets, variables)
+    if _file_hash(module_file) == hashlib.sha256(content.encode("utf-8")).hexdigest():
+        return False
+    save(conanfile, module_file, content)
+    return True
@@ -2,9 +2,10 @@ from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.build import stdcpp_library
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
-from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rm, rmdir, save
+from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rm, rmdir
 import os
-import textwrap
+
+from cmake_modules import write_cmake_module
 
 required_conan_version = ">=1.54.0"
 
@@ -48,6 +49,7 @@ class SpirvCrossConan(ConanFile):
         "util": True,
         "namespace": "spirv_cross",
     }
+    exports = "cmake_modules.py"
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -120,22 +122,12 @@ class SpirvCrossConan(ConanFile):
                 rm(self, f"*{static_lib}.*", os.path.join(self.package_folder, "lib"))
 
         # TODO: to remove in conan v2 once legacy generators removed
-        self._create_cmake_module_alias_targets(
+        write_cmake_module(
+            self,
             os.path.join(self.package_folder, self._module_file_rel_path),
-            {target: f"spirv-cross::{target}" for target in self._spirv_cross_components.keys()},
+            alias_targets={target: f"spirv-cross::{target}" for target in self._spirv_cross_components.keys()},
         )
 
-    def _create_cmake_module_alias_targets(self, module_file, targets):
-        content = ""
-        for alias, aliased in targets.items():
-            content += textwrap.dedent(f"""\
-                if(TARGET {aliased} AND NOT TARGET {alias})
-                    add_library({alias} INTERFACE IMPORTED)
-                    set_property(TARGET {alias} PROPERTY INTERFACE_LINK_LIBRARIES {aliased})
-                endif()
-            """)
-        save(self, module_file, content)
-
     @property
     def _module_file_rel_path(self):
         return os.path.join("lib", "cmake", f"conan-official-{self.name}-targets.cmake")
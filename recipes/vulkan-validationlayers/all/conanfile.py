@@ -7,7 +7,6 @@ from conan.tools.env import VirtualBuildEnv
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, mkdir, rename, replace_in_file, rm
 from conan.tools.gnu import PkgConfigDeps
 from conan.tools.scm import Version
-import functools
 import glob
 import os
 import shutil
@@ -39,19 +38,21 @@ class VulkanValidationLayersConan(ConanFile):
     }
 
     short_paths = True
+    _cached_dependencies = None
 
     @property
     def _dependencies_filename(self):
         return f"dependencies-{self.version}.yml"
 
     @property
-    @functools.lru_cache(1)
     def _dependencies_versions(self):
-        dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
-        if not os.path.isfile(dependencies_filepath):
-            raise ConanException(f"Cannot find {dependencies_filepath}")
-        cached_dependencies = yaml.safe_load(open(dependencies_filepath))
-        return cached_dependencies
+        if self._cached_dependencies is None:
+            dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
+            if not os.path.isfile(dependencies_filepath):
+                raise ConanException(f"Cannot find {dependencies_filepath}")
+            with open(dependencies_filepath, encoding="utf-8") as f:
+                self._cached_dependencies = yaml.safe_load(f)
+        return self._cached_dependencies
 
     @property
     def _needs_wayland_for_build(self):
@@ -0,0 +1,61 @@
+"""
+The cmake_modules.py helper, writing the alias targets and variables CMake modules of some recipes, is copied in
+each recipe using it: the copies must stay identical, render what the recipes used to write, and leave an
+unchanged module untouched.
+
+    python -m pytest tests
+"""
+
+import filecmp
+import glob
+import importlib.util
+import os
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPIES = sorted(glob.glob(os.path.join(ROOT, "recipes", "*", "*", "cmake_modules.py")))
+
+
+def _load_helper():
+    spec = importlib.util.spec_from_file_location("cmake_modules", COPIES[0])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_copies_are_identical():
+    assert len(COPIES) > 1
+    different = [path for path in COPIES[1:] if not filecmp.cmp(COPIES[0], path, shallow=False)]
+    assert not different, f"{', '.join(different)} differ from {COPIES[0]}"
+
+
+def test_content():
+    helper = _load_helper()
+    targets = {"spirv-cross-core": "spirv-cross::spirv-cross-core", "spirv-cross-c": "spirv-cross::spirv-cross-c"}
+    expected = ""
+    for alias, aliased in targets.items():
+        expected += textwrap.dedent(f"""\
+            if(TARGET {aliased} AND NOT TARGET {alias})
+                add_library({alias} INTERFACE IMPORTED)
+                set_property(TARGET {alias} PROPERTY INTERFACE_LINK_LIBRARIES {aliased})
+            endif()
+        """)
+    variables = "set(OPENSSL_FOUND TRUE)\n"
+    assert helper.cmake_module_content(alias_targets=targets) == expected
+    assert helper.cmake_module_content(variables=variables) == variables
+    assert helper.cmake_module_content(targets, variables) == expected + variables
+
+
+def test_write_if_changed(tmp_path):
+    helper = _load_helper()
+    module_file = str(tmp_path / "lib" / "cmake" / "module.cmake")
+    variables = "set(FOO_FOUND TRUE)\n"
+
+    assert helper.write_cmake_module(None, module_file, {"foo": "foo::foo"}, variables)
+    written = os.stat(module_file).st_mtime_ns
+    os.utime(module_file, ns=(written - 10**9, written - 10**9))
+    assert not helper.write_cmake_module(None, module_file, {"foo": "foo::foo"}, variables)
+    assert os.stat(module_file).st_mtime_ns == written - 10**9
+    assert helper.write_cmake_module(None, module_file, {"foo": "foo::foo"}, "set(FOO_FOUND FALSE)\n")
+    with open(module_file) as f:
+        assert f.read().endswith("set(FOO_FOUND FALSE)\n")
@@ -0,0 +1,108 @@
+"""
+Recipes caching values on their instances (the `_cmake = None` or `_cached_xxx = None` class attributes) must keep
+them per instance: two instances of a recipe in the same graph don't share or evict each other's values, and a
+released instance is not kept alive by its cache.
+
+    python -m pytest tests
+"""
+
+import gc
+import importlib.util
+import io
+import os
+import sys
+import weakref
+from unittest import mock
+
+import pytest
+from conan import ConanFile
+from conans import __version__ as conan_version
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _recipe_path(recipe):
+    return os.path.join(ROOT, "recipes", recipe, "all", "conanfile.py")
+
+
+def _load_recipe(recipe):
+    """Module and ConanFile class of a recipe, loaded with its folder in sys.path for its local modules"""
+    path = _recipe_path(recipe)
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        spec = importlib.util.spec_from_file_location(f"conanfile_{recipe.replace('-', '_')}", path)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except ImportError as error:  # i.e. Conan 1 only recipes with Conan 2
+            pytest.skip(f"{recipe} cannot be loaded with Conan {conan_version}: {error}")
+    finally:
+        sys.path.remove(os.path.dirname(path))
+    conanfile_class = next(value for value in vars(module).values() if isinstance(value, type)
+                           and issubclass(value, ConanFile) and value.__module__ == module.__name__)
+    return module, conanfile_class
+
+
+def _instance(recipe, conanfile_class, version=None):
+    if conan_version.startswith("1."):
+        from conans.client.output import ConanOutput
+        conanfile = conanfile_class(ConanOutput(io.StringIO()), None, recipe)
+    else:
+        conanfile = conanfile_class(display_name=recipe)
+    conanfile.recipe_folder = os.path.dirname(_recipe_path(recipe))
+    if version:
+        conanfile.version = version
+    return conanfile
+
+
+@pytest.mark.parametrize("recipe, versions", [
+    ("openvino", ("2024.3.0", "2024.4.0")),
+    ("vulkan-validationlayers", ("1.3.236.0", "1.3.239.0")),
+])
+def test_dependencies_versions(recipe, versions):
+    _, conanfile_class = _load_recipe(recipe)
+    first, second = (_instance(recipe, conanfile_class, version) for version in versions)
+
+    first_dependencies = first._dependencies_versions
+    second_dependencies = second._dependencies_versions
+    assert first_dependencies != second_dependencies
+    assert first._dependencies_versions is first_dependencies
+    assert second._dependencies_versions is second_dependencies
+    assert conanfile_class._cached_dependencies is None
+
+    released = weakref.ref(first)
+    del first
+    gc.collect()
+    assert released() is None
+    assert second._dependencies_versions is second_dependencies
+
+
+@pytest.mark.parametrize("recipe", ["magnum", "magnum-extras", "magnum-integration", "pdal"])
+def test_configure_cmake(recipe):
+    module, conanfile_class = _load_recipe(recipe)
+    first, second = (_instance(recipe, conanfile_class, "1.0") for _ in range(2))
+    for conanfile in (first, second):
+        conanfile.options = mock.MagicMock()
+        conanfile.settings = mock.MagicMock()
+        conanfile.deps_cpp_info = mock.MagicMock()
+
+    created = []
+
+    def cmake_helper(conanfile):  # Does not keep a reference to the conanfile
+        created.append(mock.MagicMock())
+        return created[-1]
+
+    with mock.patch.object(module, "CMake", cmake_helper):
+        first_cmake = first._configure_cmake()
+        second_cmake = second._configure_cmake()
+        assert first._configure_cmake() is first_cmake
+        assert second._configure_cmake() is second_cmake
+    assert created == [first_cmake, second_cmake]
+    first_cmake.configure.assert_called_once()
+    assert conanfile_class._cmake is None
+
+    released = weakref.ref(first)
+    del first
+    gc.collect()
+    assert released() is None
@@ -0,0 +1,53 @@
+"""
+The ConanFile stub of the transform_conanfile pylint plugin is cached on disk per Conan version and version of the
+plugin, and built only once per process.
+
+    python -m pytest tests
+"""
+
+import os
+from unittest import mock
+
+import pytest
+
+astroid = pytest.importorskip("astroid")
+conans = pytest.importorskip("conans")
+if not conans.__version__.startswith("1."):
+    pytest.skip("The ConanFile stub is built from Conan 1 sources", allow_module_level=True)
+
+from linter import transform_conanfile  # noqa: E402
+
+
+@pytest.fixture
+def cache_folder(tmp_path):
+    transform_conanfile._conanfile_stub.cache_clear()
+    with mock.patch.dict(os.environ, {"CCI_LINTER_CACHE": str(tmp_path)}):
+        yield tmp_path
+    transform_conanfile._conanfile_stub.cache_clear()
+
+
+def _transformed_conanfile():
+    node = astroid.extract_node("class ConanFile: pass")
+    transform_conanfile.transform_conanfile(node)
+    return node
+
+
+def test_stub_built_once(cache_folder):
+    with mock.patch.object(transform_conanfile, "_generate_stub", wraps=transform_conanfile._generate_stub) as generate:
+        first, second = _transformed_conanfile(), _transformed_conanfile()
+    generate.assert_called_once()
+    for field in transform_conanfile._DYNAMIC_FIELDS:
+        assert first.locals[field] is second.locals[field]
+    assert os.listdir(cache_folder) == [
+        f"conanfile_stub_{transform_conanfile._plugin_hash()[:16]}_{conans.__version__}.py"
+    ]
+
+
+def test_stub_cache_keyed_on_plugin_source(cache_folder):
+    _transformed_conanfile()
+    transform_conanfile._conanfile_stub.cache_clear()
+    with mock.patch.object(transform_conanfile, "_plugin_hash", return_value="0" * 64), \
+            mock.patch.object(transform_conanfile, "_generate_stub", wraps=transform_conanfile._generate_stub) as generate:
+        _transformed_conanfile()
+    generate.assert_called_once()
+    assert len(os.listdir(cache_folder)) == 2
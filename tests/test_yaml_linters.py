@@ -0,0 +1,54 @@
+"""
+The recipe YAML linter reports the config.yml and conandata.yml files it cannot parse as GitHub annotations of
+those files, and keeps linting the other recipes.
+
+    python -m pytest tests
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("strictyaml")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINTER = os.path.join(ROOT, "linter")
+sys.path.insert(0, LINTER)
+
+import recipe_yaml_linter  # noqa: E402
+
+
+def _recipe(folder, config, conandata='sources:\n  "1.0":\n    url: "https://example.com/foo-1.0.tar.gz"\n'
+                                     '    sha256: "0000000000000000000000000000000000000000000000000000000000000000"\n'):
+    os.makedirs(os.path.join(folder, "all"))
+    with open(os.path.join(folder, "config.yml"), "w") as f:
+        f.write(config)
+    with open(os.path.join(folder, "all", "conandata.yml"), "w") as f:
+        f.write(conandata)
+    return str(folder)
+
+
+@pytest.mark.parametrize("config, line", [
+    ('versions: {"1.0": {folder: all}}\n', 1),  # Flow style, disallowed by strictyaml
+    ('versions:\n  "1.0": folder: all\n', 2),  # Syntax error
+])
+def test_unparsable_config_yml(tmp_path, config, line):
+    recipe = _recipe(tmp_path / "foo", config)
+    config_path = os.path.join(recipe, "config.yml")
+
+    messages = recipe_yaml_linter.lint_recipe(recipe)
+    assert len(messages) == 1
+    assert messages[0].startswith(f"::error file={config_path},line={line},endline={line},title=config.yml parse error::")
+
+
+def test_unparsable_config_yml_does_not_stop_the_run(tmp_path):
+    _recipe(tmp_path / "bar", 'versions: {"1.0": {folder: all}}\n')
+    _recipe(tmp_path / "foo", 'versions:\n  "1.0":\n    folder: other\n')
+
+    result = subprocess.run([sys.executable, os.path.join(LINTER, "recipe_yaml_linter.py"), "-j", "1", str(tmp_path)],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert f"file={tmp_path / 'bar' / 'config.yml'},line=1" in result.stdout
+    assert "title=config.yml inconsistency::Folder `other`" in result.stdout